@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.presence import seed_from_last_login
+
+
+class Command(BaseCommand):
+    help = "Count users who signed in during the active window as active (run once when deploying presence)"
+
+    def handle(self, *args, **options):
+        seeded = seed_from_last_login()
+        self.stdout.write(self.style.SUCCESS(f"Seeded {seeded} recently active users."))
@@ -1,6 +1,7 @@
 # accounts/models.py
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -41,6 +42,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     profile_picture = models.CharField(max_length=250, blank=True, null=True)
     location = models.CharField(blank=True, max_length=255, null=True)
     bio = models.CharField(blank=True, max_length=255, null=True)
+    date_joined = models.DateTimeField(default=timezone.now)
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
@@ -0,0 +1,170 @@
+# accounts/presence.py
+"""
+User presence: who is online now and who was active recently.
+
+Every authenticated request records a heartbeat (PresenceMiddleware) into
+time-bucketed HyperLogLogs, one per minute and one per day:
+
+    presence:minute:<epoch minute>   expires after the online window
+    presence:day:<YYYY-MM-DD>        expires after the active window
+
+``online_count()`` is a PFCOUNT over the last ONLINE_MINUTES minute keys
+and ``active_count()`` over the last ACTIVE_DAYS day keys. Both reads are
+constant-time, whatever the number of users or sessions, and count the JWT
+API users that Django sessions never see. HyperLogLog counts are
+approximate (about 0.8% standard error) and use at most 12 KB per key.
+
+Heartbeats only start counting once this is deployed; ``seed_from_last_login``
+(the ``seed_presence`` command, run once on deploy) adds the users who
+signed in during the window to their last login's day key, so
+``active_count()`` is not an undercount until the window fills.
+
+``settings.PRESENCE_BACKEND`` picks the store: RedisPresence when the
+cache is Redis (settings/cache.py), else LocMemPresence, an exact
+stand-in on the Django cache for development and tests.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+ONLINE_MINUTES = 5
+ACTIVE_DAYS = 30
+MINUTE_KEY = "presence:minute:{bucket}"
+DAY_KEY = "presence:day:{day}"
+
+
+def _minute_bucket(at):
+    return int(at.timestamp()) // 60
+
+
+def minute_keys(at, minutes=ONLINE_MINUTES):
+    """Keys of the ``minutes`` minute buckets up to and including ``at``'s."""
+    current = _minute_bucket(at)
+    return [MINUTE_KEY.format(bucket=bucket) for bucket in range(current - minutes + 1, current + 1)]
+
+
+def day_keys(at, days=ACTIVE_DAYS):
+    """Keys of the ``days`` UTC days up to and including ``at``'s."""
+    today = at.astimezone(dt_timezone.utc).date()
+    return [DAY_KEY.format(day=(today - timedelta(days=offset)).isoformat()) for offset in range(days)]
+
+
+def heartbeat_keys(at):
+    """``(key, ttl seconds)`` a heartbeat at ``at`` is recorded under."""
+    return [
+        (minute_keys(at, 1)[0], (ONLINE_MINUTES + 1) * 60),
+        (day_keys(at, 1)[0], (ACTIVE_DAYS + 1) * 24 * 60 * 60),
+    ]
+
+
+class RedisPresence:
+    """HyperLogLogs on the Redis server behind the default cache (django-redis)."""
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+
+    def record(self, user_id, at):
+        self.add([(key, ttl, [user_id]) for key, ttl in heartbeat_keys(at)])
+
+    def add(self, entries):
+        """``entries``: ``(key, ttl seconds, user ids)``."""
+        pipe = self.redis.pipeline(transaction=False)
+        for key, ttl, user_ids in entries:
+            pipe.pfadd(key, *user_ids)
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def count(self, keys):
+        return self.redis.pfcount(*keys)
+
+
+class LocMemPresence:
+    """Exact sets in the Django cache; not atomic across processes."""
+
+    def record(self, user_id, at):
+        self.add([(key, ttl, [user_id]) for key, ttl in heartbeat_keys(at)])
+
+    def add(self, entries):
+        for key, ttl, user_ids in entries:
+            members = cache.get(key) or set()
+            if not members.issuperset(user_ids):
+                cache.set(key, members | set(user_ids), ttl)
+
+    def count(self, keys):
+        return len(set().union(*cache.get_many(keys).values()))
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.PRESENCE_BACKEND)()
+    return _backend
+
+
+def record_heartbeat(user_id, at=None):
+    # Presence is best effort: never fail the request over it
+    try:
+        get_backend().record(user_id, at or timezone.now())
+    except Exception:
+        logger.warning("Could not record presence heartbeat", exc_info=True)
+
+
+def online_count(at=None):
+    """Users seen in the last ONLINE_MINUTES minutes."""
+    return get_backend().count(minute_keys(at or timezone.now()))
+
+
+def active_count(at=None):
+    """Users seen in the last ACTIVE_DAYS days."""
+    return get_backend().count(day_keys(at or timezone.now()))
+
+
+def seed_from_last_login(at=None, batch_size=1000):
+    """
+    Add each user whose last login falls in the ACTIVE_DAYS window to that
+    day's key (idempotent); returns the number of users added.
+    """
+    from .models import User
+
+    at = at or timezone.now()
+    oldest_day = at.astimezone(dt_timezone.utc).date() - timedelta(days=ACTIVE_DAYS - 1)
+    since = datetime.combine(oldest_day, time.min, tzinfo=dt_timezone.utc)
+    day_ttl = heartbeat_keys(at)[1][1]
+    backend, seeded, batch = get_backend(), 0, defaultdict(list)
+    users = User.objects.filter(last_login__gte=since, last_login__lte=at).values_list("pk", "last_login")
+    for user_id, last_login in users.iterator(chunk_size=batch_size):
+        batch[day_keys(last_login, 1)[0]].append(user_id)
+        seeded += 1
+        if seeded % batch_size == 0:
+            backend.add([(key, day_ttl, user_ids) for key, user_ids in batch.items()])
+            batch.clear()
+    if batch:
+        backend.add([(key, day_ttl, user_ids) for key, user_ids in batch.items()])
+    return seeded
+
+
+class PresenceMiddleware:
+    """Record a heartbeat for each request that authenticated a user."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF's token/JWT authentication sets request.user on the underlying request
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            record_heartbeat(user.pk)
+        return response
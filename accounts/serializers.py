@@ -4,6 +4,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from tours.models import Tour
+from tours.querysets import with_tour_prefetches
 from tours.serializers import GuideSerializer, TourSerializer
 from .models import User
 from .tasks import send_welcome_email
@@ -65,9 +66,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     # ------------------------------
     def get_organized_tours(self, obj):
         if obj.role == 'organizer':
-            tours = obj.organized_tours.prefetch_related(
-                'guides', 'offers', 'tour_participants__user'
-            )
+            tours = with_tour_prefetches(obj.organized_tours.all(), user=obj)
             return TourSerializer(
                 tours,
                 many=True,
@@ -80,11 +79,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
     # ------------------------------
     def get_joined_tours(self, obj):
         if obj.role == 'tourist':
-            tours = Tour.objects.filter(
-                tour_participants__user=obj
-            ).prefetch_related(
-                'guides', 'offers', 'tour_participants__user'
-            ).distinct()
+            tours = with_tour_prefetches(
+                Tour.objects.filter(tour_participants__user=obj).distinct(), user=obj
+            )
             return TourSerializer(
                 tours,
                 many=True,
@@ -97,9 +94,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     # ------------------------------
     def get_guided_tours(self, obj):
         if obj.role == 'guide' and hasattr(obj, 'guide'):
-            tours = obj.guide.tours.prefetch_related(
-                'guides', 'offers', 'tour_participants__user'
-            )
+            tours = with_tour_prefetches(obj.guide.tours.all())
             return TourSerializer(tours, many=True).data
         return []
 
@@ -0,0 +1,63 @@
+# accounts/tests_presence.py
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from accounts.presence import (
+    ACTIVE_DAYS, ONLINE_MINUTES, active_count, online_count, record_heartbeat, seed_from_last_login,
+)
+
+
+class PresenceTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(email="admin@example.com", role="admin", is_staff=True)
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+        ]
+
+    def test_authenticated_requests_record_heartbeats(self):
+        self.client.get(reverse("tour-list"))
+        self.assertEqual(online_count(), 0)
+        for tourist in self.tourists[:2]:
+            self.client.force_authenticate(tourist)
+            self.client.get(reverse("tour-list"))
+            self.client.get(reverse("tour-list"))
+        self.assertEqual(online_count(), 2)
+        self.assertEqual(active_count(), 2)
+
+    def test_windows_expire(self):
+        now = timezone.now()
+        record_heartbeat(self.tourists[0].pk, at=now - timedelta(minutes=ONLINE_MINUTES))
+        record_heartbeat(self.tourists[1].pk, at=now - timedelta(days=ACTIVE_DAYS))
+        record_heartbeat(self.tourists[2].pk, at=now - timedelta(minutes=1))
+        self.assertEqual(online_count(now), 1)
+        self.assertEqual(active_count(now), 2)
+
+    def test_dashboard_reads_presence_counts(self):
+        record_heartbeat(self.tourists[0].pk, at=timezone.now() - timedelta(days=3))
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("dashboard-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The admin's own request is recorded after the response
+        self.assertEqual(response.data["stats"]["active_users"], 1)
+        self.assertEqual(response.data["stats"]["currently_logged_in"], 0)
+        self.assertEqual(online_count(), 1)
+
+    def test_seeding_from_last_login_fills_the_window(self):
+        now = timezone.now()
+        User.objects.filter(pk=self.tourists[0].pk).update(last_login=now - timedelta(days=10))
+        User.objects.filter(pk=self.tourists[1].pk).update(last_login=now - timedelta(days=ACTIVE_DAYS + 1))
+        record_heartbeat(self.tourists[2].pk, at=now)
+        User.objects.filter(pk=self.tourists[2].pk).update(last_login=now)
+
+        self.assertEqual(seed_from_last_login(now), 2)
+        self.assertEqual(seed_from_last_login(now), 2)
+        self.assertEqual(active_count(now), 2)
+        self.assertEqual(online_count(now), 1)
@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from django.utils import timezone
 
 from tours.models import Guide
+from tour_management.pagination import KeysetOrPageNumberPagination, KeysetPagination
 from .models import User
 from .permissions import IsAdmin
 from .tasks import send_welcome_email
@@ -99,12 +100,24 @@ class CustomUserPagination(PageNumberPagination):
     max_page_size = 50
 
 
+class UserCursorPagination(KeysetPagination):
+    ordering = ("-id",)
+    page_size = 10
+    max_page_size = 50
+
+
+class AdminUserPagination(KeysetOrPageNumberPagination):
+    # ?pagination=cursor (or ?cursor=...) opts into keyset pagination
+    page_pagination_class = CustomUserPagination
+    cursor_pagination_class = UserCursorPagination
+
+
 class AdminUserListView(generics.ListAPIView):
     authentication_classes = [JWTAuthentication]
     queryset = User.objects.all().order_by('-id')
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
-    pagination_class = CustomUserPagination
+    pagination_class = AdminUserPagination
 
     @method_decorator(cache_page(60 * 5))  # 5 minutes
     def get_object(self):
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from analytics.rollups import reconcile_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dashboard statistics rollups from the source tables (normally run by celery beat)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=None,
+            help="Only rebuild the buckets of the last N days (default: everything)",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        since = timezone.now() - timedelta(days=days) if days is not None else None
+        written = reconcile_rollups(since)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup buckets."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day'), ('total', 'Total')], max_length=5)),
+                ('bucket', models.DateTimeField()),
+                ('users', models.IntegerField(default=0)),
+                ('tours', models.IntegerField(default=0)),
+                ('join_requests', models.IntegerField(default=0)),
+                ('approvals', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('bookings', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('organizer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stats_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'organizer', 'bucket'), name='unique_stats_rollup', nulls_distinct=False)],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# A frozen copy of analytics.rollups' reconciliation SQL as of this
+# migration: every source row's contributions, rolled up into hour and day
+# buckets per organizer and for the platform (organizer NULL), then the
+# totals from the day rows.
+BACKFILL_BUCKETS_SQL = """
+INSERT INTO analytics_statsrollup (granularity, bucket, organizer_id, users, tours, join_requests, approvals, pending, bookings, revenue)
+SELECT granularity, bucket, organizer_id,
+       SUM(users), SUM(tours), SUM(join_requests), SUM(approvals), SUM(pending), SUM(bookings), SUM(revenue)
+FROM (
+    SELECT g.granularity, date_trunc(g.granularity, f.at, 'UTC') AS bucket, f.*
+    FROM (
+        SELECT NULL::bigint AS organizer_id, date_joined AS at,
+               1 AS users, 0 AS tours, 0 AS join_requests, 0 AS approvals, 0 AS pending, 0 AS bookings,
+               0::numeric AS revenue
+        FROM accounts_user
+        UNION ALL
+        SELECT organizer_id, created_at, 0, 1, 0, 0, 0, 0, 0 FROM tours_tour
+        UNION ALL
+        SELECT t.organizer_id, p.requested_at, 0, 0, 1, 0, (p.status = 'pending')::int, 0, 0
+        FROM tours_tourparticipant p JOIN tours_tour t ON t.id = p.tour_id
+        UNION ALL
+        SELECT t.organizer_id, COALESCE(p.approved_at, p.requested_at), 0, 0, 0, 1, 0, 0, 0
+        FROM tours_tourparticipant p JOIN tours_tour t ON t.id = p.tour_id
+        WHERE p.status IN ('approved', 'completed')
+        UNION ALL
+        SELECT t.organizer_id, b.created_at, 0, 0, 0, 0, 0, 1, 0
+        FROM bookings_booking b JOIN tours_tourparticipant p ON p.id = b.participant_id
+        JOIN tours_tour t ON t.id = p.tour_id
+        UNION ALL
+        SELECT t.organizer_id, COALESCE(pay.verified_at, pay.created_at), 0, 0, 0, 0, 0, 0, pay.amount
+        FROM payments_payment pay JOIN bookings_booking b ON b.id = pay.booking_id
+        JOIN tours_tourparticipant p ON p.id = b.participant_id JOIN tours_tour t ON t.id = p.tour_id
+        WHERE pay.status = 'success'
+    ) f CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+) facts
+GROUP BY GROUPING SETS ((granularity, bucket, organizer_id), (granularity, bucket))
+HAVING organizer_id IS NOT NULL OR GROUPING(organizer_id) = 1
+"""
+
+BACKFILL_TOTALS_SQL = """
+INSERT INTO analytics_statsrollup (granularity, bucket, organizer_id, users, tours, join_requests, approvals, pending, bookings, revenue)
+SELECT 'total', TIMESTAMPTZ '1970-01-01 00:00:00+00', organizer_id,
+       SUM(users), SUM(tours), SUM(join_requests), SUM(approvals), SUM(pending), SUM(bookings), SUM(revenue)
+FROM analytics_statsrollup WHERE granularity = 'day'
+GROUP BY organizer_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('accounts', '0010_user_date_joined'),
+        ('bookings', '0001_initial'),
+        ('payments', '0002_alter_payment_booking'),
+        ('tours', '0022_tour_created_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_BUCKETS_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL_TOTALS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+# Every participant already has hour/day rows at its requested_at (its join
+# request), so the new column is filled in place; totals from the day rows.
+BACKFILL_APPROVED_SQL = """
+UPDATE analytics_statsrollup r SET approved = a.approved
+FROM (
+    SELECT granularity, bucket, organizer_id, COUNT(*) AS approved
+    FROM (
+        SELECT g.granularity, date_trunc(g.granularity, p.requested_at, 'UTC') AS bucket, t.organizer_id
+        FROM tours_tourparticipant p JOIN tours_tour t ON t.id = p.tour_id
+        CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+        WHERE p.status = 'approved'
+    ) facts
+    GROUP BY GROUPING SETS ((granularity, bucket, organizer_id), (granularity, bucket))
+    HAVING organizer_id IS NOT NULL OR GROUPING(organizer_id) = 1
+) a
+WHERE r.granularity = a.granularity AND r.bucket = a.bucket AND r.organizer_id IS NOT DISTINCT FROM a.organizer_id;
+
+UPDATE analytics_statsrollup r SET approved = d.approved
+FROM (
+    SELECT organizer_id, SUM(approved) AS approved FROM analytics_statsrollup WHERE granularity = 'day' GROUP BY organizer_id
+) d
+WHERE r.granularity = 'total' AND r.organizer_id IS NOT DISTINCT FROM d.organizer_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_backfill_stats_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statsrollup',
+            name='approved',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_APPROVED_SQL, migrations.RunSQL.noop),
+    ]
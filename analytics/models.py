@@ -0,0 +1,46 @@
+# analytics/models.py
+from django.conf import settings
+from django.db import models
+
+
+class StatsRollup(models.Model):
+    """
+    Pre-aggregated dashboard facts (see analytics/rollups.py).
+
+    One row per granularity, bucket start and organizer; ``organizer`` NULL
+    is the platform-wide row. Metrics count the rows that exist now, by the
+    time they happened: ``tours`` created in the bucket, ``approvals``
+    approved in it, ``pending`` / ``approved`` requests made in it that are
+    still pending / approved now, and so on. The single "total" row of each organizer is the sum of
+    their day rows.
+    """
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+        ('total', 'Total'),
+    ]
+
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField()
+    organizer = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='stats_rollups'
+    )
+    users = models.IntegerField(default=0)  # platform rows only
+    tours = models.IntegerField(default=0)
+    join_requests = models.IntegerField(default=0)
+    approvals = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    approved = models.IntegerField(default=0)
+    bookings = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            # NULLS NOT DISTINCT: one platform row per bucket, and a target for ON CONFLICT
+            models.UniqueConstraint(
+                fields=['granularity', 'organizer', 'bucket'], name='unique_stats_rollup', nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket:%Y-%m-%d %H:%M} ({self.organizer_id or 'platform'})"
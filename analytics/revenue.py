@@ -0,0 +1,92 @@
+# analytics/revenue.py
+"""
+Revenue and receivables per tour and per month, for one organizer or the
+platform.
+
+One statement: successful payments are summed per booking and method
+first (so a booking's amount is never multiplied by its payments), joined
+to the bookings, and grouped with GROUPING SETS into per-tour rows,
+per-month rows (the month the booking was made, UTC) and a grand total.
+Results are cached for REVENUE_CACHE_TTL seconds; payments settle
+asynchronously anyway, so the report is allowed to lag by that much.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+
+from bookings.models import Booking
+from payments.models import Payment
+from tours.models import Tour, TourParticipant
+
+REVENUE_CACHE_TTL = 60
+REVENUE_METRICS = ("bookings", "amount_due", "amount_paid", "outstanding", "cash", "sslcommerz")
+
+REVENUE_SQL = """
+SELECT GROUPING(t.id) AS by_month, GROUPING(month) AS by_tour, t.id AS tour_id, MAX(t.title) AS title, month,
+       COUNT(*) AS bookings,
+       -- the grand-total row exists even with no bookings: COALESCE its SUMs to 0
+       COALESCE(SUM(b.amount), 0.00) AS amount_due,
+       COALESCE(SUM(COALESCE(pay.cash, 0) + COALESCE(pay.sslcommerz, 0)), 0.00) AS amount_paid,
+       -- overpaid bookings do not offset other bookings' debts
+       COALESCE(SUM(GREATEST(b.amount - COALESCE(pay.cash, 0) - COALESCE(pay.sslcommerz, 0), 0)), 0.00) AS outstanding,
+       COALESCE(SUM(pay.cash), 0.00) AS cash,
+       COALESCE(SUM(pay.sslcommerz), 0.00) AS sslcommerz
+FROM (
+    SELECT b.id, b.participant_id, b.amount, date_trunc('month', b.created_at, 'UTC')::date AS month
+    FROM {booking} b
+) b
+JOIN {participant} p ON p.id = b.participant_id
+JOIN {tour} t ON t.id = p.tour_id
+LEFT JOIN (
+    SELECT booking_id,
+           SUM(amount) FILTER (WHERE method = 'cash') AS cash,
+           SUM(amount) FILTER (WHERE method = 'sslcommerz') AS sslcommerz
+    FROM {payment}
+    WHERE status = 'success'
+    GROUP BY booking_id
+) pay ON pay.booking_id = b.id
+WHERE %(organizer_id)s::bigint IS NULL OR t.organizer_id = %(organizer_id)s
+GROUP BY GROUPING SETS ((t.id), (month), ())
+ORDER BY by_month, by_tour, t.id, month
+"""
+
+
+def revenue_cache_key(organizer_id=None):
+    return f"analytics:revenue:{organizer_id or 'all'}"
+
+
+def _empty_totals():
+    return {"bookings": 0, **dict.fromkeys(REVENUE_METRICS[1:], Decimal("0.00"))}
+
+
+def revenue_report(organizer_id=None):
+    """
+    ``{"totals": {...}, "tours": [...], "months": [...]}`` with the
+    REVENUE_METRICS for an organizer's tours (None = every tour).
+    """
+    key = revenue_cache_key(organizer_id)
+    report = cache.get(key)
+    if report is not None:
+        return report
+
+    sql = REVENUE_SQL.format(
+        booking=Booking._meta.db_table, participant=TourParticipant._meta.db_table,
+        tour=Tour._meta.db_table, payment=Payment._meta.db_table,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"organizer_id": organizer_id})
+        columns = [column.name for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    report = {"totals": _empty_totals(), "tours": [], "months": []}
+    for row in rows:
+        metrics = {metric: row[metric] for metric in REVENUE_METRICS}
+        if row["by_month"] and row["by_tour"]:
+            report["totals"] = metrics
+        elif row["by_month"]:
+            report["months"].append({"month": row["month"].strftime("%Y-%m"), **metrics})
+        else:
+            report["tours"].append({"tour_id": row["tour_id"], "title": row["title"], **metrics})
+    cache.set(key, report, REVENUE_CACHE_TTL)
+    return report
@@ -0,0 +1,268 @@
+# analytics/rollups.py
+"""
+Dashboard statistics rollups (StatsRollup).
+
+Every row of the source tables contributes to the rollups at the time it
+happened (``contributions``): a user at date_joined, a tour at created_at,
+a participation at requested_at (one join request, plus one pending or
+approved while it is in that status) and, once approved, one approval at
+approved_at, a booking
+at created_at, a successful payment's amount as revenue at verified_at.
+Each contribution lands in the hour, day and total buckets of its
+organizer and of the platform (organizer NULL).
+
+Incremental: analytics.signals diffs a row's contributions before and
+after each save or delete and adds the difference with one
+``INSERT ... ON CONFLICT DO UPDATE SET x = x + EXCLUDED.x`` after the
+transaction commits, so rolled-back writes never count and the hot
+platform rows are only locked for that one statement.
+
+Reconciliation: ``reconcile_rollups`` rebuilds the hour and day buckets
+from the source tables in one set-based statement (all of them, or those
+since a given time) into a staging table, swaps them in, and rebuilds the
+totals from the day rows. It catches writes that bypass the signals
+(``QuerySet.update``, raw SQL) and events that raced an earlier
+reconciliation.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import connection, transaction
+
+from .models import StatsRollup
+
+METRICS = ("users", "tours", "join_requests", "approvals", "pending", "approved", "bookings", "revenue")
+TOTAL_BUCKET = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+# Participant states that earned an approval (the ``approvals`` metric)
+APPROVAL_STATUSES = ("approved", "completed")
+SERIES_STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+def bucket_starts(at):
+    """``{granularity: bucket start}`` of ``at`` (UTC)."""
+    hour = at.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return {"hour": hour, "day": hour.replace(hour=0), "total": TOTAL_BUCKET}
+
+
+# -------------------------
+# Incremental updates
+# -------------------------
+def contributions(instance):
+    """
+    ``[(at, {metric: value})]`` that ``instance`` adds to the rollups in its
+    current state; the Python twin of FACTS_SQL. None when a field it
+    needs is deferred (or, before the first save, not set yet).
+    """
+    state = instance.__dict__
+    label = instance._meta.label
+    if label == "accounts.User":
+        facts = [(state.get("date_joined"), {"users": 1})]
+    elif label == "tours.Tour":
+        facts = [(state.get("created_at"), {"tours": 1})]
+    elif label == "tours.TourParticipant":
+        status = state.get("status")
+        if status is None:
+            return None
+        requested_at = state.get("requested_at")
+        facts = [(requested_at, {
+            "join_requests": 1, "pending": int(status == "pending"), "approved": int(status == "approved"),
+        })]
+        if status in APPROVAL_STATUSES:
+            facts.append((state.get("approved_at") or requested_at, {"approvals": 1}))
+    elif label == "bookings.Booking":
+        facts = [(state.get("created_at"), {"bookings": 1})]
+    elif label == "payments.Payment":
+        if state.get("status") != "success":
+            return []
+        amount = state.get("amount")  # a str until the row is reloaded, when assigned from one
+        facts = [(state.get("verified_at") or state.get("created_at"),
+                  {"revenue": None if amount is None else Decimal(amount)})]
+    else:
+        raise ValueError(f"{label} is not rolled up")
+    if any(at is None or None in values.values() for at, values in facts):
+        return None
+    return facts
+
+
+def diff_contributions(new, old=()):
+    """``{at: {metric: delta}}`` turning ``old`` contributions into ``new`` (zero deltas dropped)."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for sign, facts in ((1, new), (-1, old)):
+        for at, values in facts:
+            for metric, value in values.items():
+                deltas[at][metric] += sign * value
+    return {
+        at: {metric: value for metric, value in values.items() if value}
+        for at, values in deltas.items()
+        if any(values.values())
+    }
+
+
+def _upsert_sql(row_count):
+    table = StatsRollup._meta.db_table
+    columns = ("granularity", "bucket", "organizer_id") + METRICS
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    increments = ", ".join(f"{metric} = {table}.{metric} + EXCLUDED.{metric}" for metric in METRICS)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * row_count)} "
+        f"ON CONFLICT (granularity, organizer_id, bucket) DO UPDATE SET {increments}"
+    )
+
+
+def apply_deltas(at, organizer_id=None, **deltas):
+    """Add ``deltas`` to every bucket of ``at``, for the organizer and the platform, in one statement."""
+    scopes = [None] if organizer_id is None else [organizer_id, None]
+    params = []
+    for granularity, bucket in bucket_starts(at).items():
+        for scope in scopes:
+            params += [granularity, bucket, scope, *(deltas.get(metric, 0) for metric in METRICS)]
+    with connection.cursor() as cursor:
+        cursor.execute(_upsert_sql(len(params) // (3 + len(METRICS))), params)
+
+
+def record(changes, organizer_id=None):
+    """Apply ``diff_contributions`` output once the current transaction commits."""
+    for at, deltas in changes.items():
+        # robust: a failed rollup update (e.g. the organizer was deleted
+        # meanwhile) is logged and left to the reconciliation
+        transaction.on_commit(
+            lambda at=at, deltas=deltas: apply_deltas(at, organizer_id, **deltas), robust=True,
+        )
+
+
+# -------------------------
+# Reconciliation
+# -------------------------
+FACTS_SQL = """
+SELECT NULL::bigint AS organizer_id, date_joined AS at,
+       1 AS users, 0 AS tours, 0 AS join_requests, 0 AS approvals, 0 AS pending, 0 AS approved, 0 AS bookings,
+       0::numeric AS revenue
+FROM {user}
+UNION ALL
+SELECT organizer_id, created_at, 0, 1, 0, 0, 0, 0, 0, 0 FROM {tour}
+UNION ALL
+SELECT t.organizer_id, p.requested_at, 0, 0, 1, 0, (p.status = 'pending')::int, (p.status = 'approved')::int, 0, 0
+FROM {participant} p JOIN {tour} t ON t.id = p.tour_id
+UNION ALL
+SELECT t.organizer_id, COALESCE(p.approved_at, p.requested_at), 0, 0, 0, 1, 0, 0, 0, 0
+FROM {participant} p JOIN {tour} t ON t.id = p.tour_id
+WHERE p.status = ANY(%(approval_statuses)s)
+UNION ALL
+SELECT t.organizer_id, b.created_at, 0, 0, 0, 0, 0, 0, 1, 0
+FROM {booking} b JOIN {participant} p ON p.id = b.participant_id JOIN {tour} t ON t.id = p.tour_id
+UNION ALL
+SELECT t.organizer_id, COALESCE(pay.verified_at, pay.created_at), 0, 0, 0, 0, 0, 0, 0, pay.amount
+FROM {payment} pay JOIN {booking} b ON b.id = pay.booking_id
+JOIN {participant} p ON p.id = b.participant_id JOIN {tour} t ON t.id = p.tour_id
+WHERE pay.status = 'success'
+"""
+
+REBUILD_BUCKETS_SQL = """
+INSERT INTO {staging} (granularity, bucket, organizer_id, {metrics})
+SELECT granularity, bucket, organizer_id, {sums}
+FROM (
+    SELECT g.granularity, date_trunc(g.granularity, f.at, 'UTC') AS bucket, f.*
+    FROM ({facts}) f CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+    WHERE %(since)s::timestamptz IS NULL OR f.at >= %(since)s
+) facts
+-- per organizer, plus the platform row (organizer_id rolled up to NULL)
+GROUP BY GROUPING SETS ((granularity, bucket, organizer_id), (granularity, bucket))
+HAVING organizer_id IS NOT NULL OR GROUPING(organizer_id) = 1
+"""
+
+REBUILD_TOTALS_SQL = """
+INSERT INTO {rollup} (granularity, bucket, organizer_id, {metrics})
+SELECT 'total', %(total_bucket)s, organizer_id, {sums}
+FROM {rollup} WHERE granularity = 'day'
+GROUP BY organizer_id
+"""
+
+
+STAGING_TABLE = "stats_rollup_staging"
+
+
+def reconcile_rollups(since=None):
+    """
+    Rebuild the hour/day buckets from ``since`` (rounded down to its day;
+    None = everything) and all totals. Returns the number of bucket rows
+    written.
+
+    The buckets are aggregated into a temporary staging table first,
+    without locking the rollups; the lock that holds off incremental
+    updates is only taken to swap the staged rows in, so it lasts as long
+    as copying rollup rows, not scanning the source tables. An event that
+    commits while the staging query runs is missing from the swapped-in
+    rows until the next reconciliation covering its bucket (the hourly
+    run covers the last two days).
+    """
+    tables = {
+        name: apps.get_model(label)._meta.db_table
+        for name, label in [
+            ("rollup", "analytics.StatsRollup"), ("user", "accounts.User"), ("tour", "tours.Tour"),
+            ("participant", "tours.TourParticipant"), ("booking", "bookings.Booking"),
+            ("payment", "payments.Payment"),
+        ]
+    }
+    since = bucket_starts(since)["day"] if since is not None else None
+    columns = {"metrics": ", ".join(METRICS), "sums": ", ".join(f"SUM({metric})" for metric in METRICS)}
+    params = {"since": since, "approval_statuses": list(APPROVAL_STATUSES), "total_bucket": TOTAL_BUCKET}
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT granularity, bucket, organizer_id, {columns['metrics']} FROM {tables['rollup']} WITH NO DATA"
+            )
+            cursor.execute(
+                REBUILD_BUCKETS_SQL.format(
+                    facts=FACTS_SQL.format(**tables), staging=STAGING_TABLE, **tables, **columns,
+                ),
+                params,
+            )
+            written = cursor.rowcount
+
+            # Hold off incremental updates so none lands between the delete and the swap
+            cursor.execute(f"LOCK TABLE {tables['rollup']} IN SHARE ROW EXCLUSIVE MODE")
+            stale = StatsRollup.objects.exclude(granularity="total")
+            if since is not None:
+                stale = stale.filter(bucket__gte=since)
+            stale.delete()
+            StatsRollup.objects.filter(granularity="total").delete()
+            cursor.execute(
+                f"INSERT INTO {tables['rollup']} (granularity, bucket, organizer_id, {columns['metrics']}) "
+                f"SELECT granularity, bucket, organizer_id, {columns['metrics']} FROM {STAGING_TABLE}"
+            )
+            cursor.execute(REBUILD_TOTALS_SQL.format(**tables, **columns), params)
+            # ON COMMIT DROP alone would keep it for the rest of an enclosing transaction
+            cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+    return written
+
+
+# -------------------------
+# Reads
+# -------------------------
+def rollup_totals(organizer_id=None):
+    """``{metric: value}`` over all time for an organizer (None = the platform)."""
+    row = (
+        StatsRollup.objects.filter(granularity="total", organizer_id=organizer_id, bucket=TOTAL_BUCKET)
+        .values(*METRICS).first()
+    )
+    return row or dict.fromkeys(METRICS, 0)
+
+
+def rollup_series(metric, granularity, since, until=None, organizer_id=None):
+    """``[(bucket start, value)]`` of ``metric`` from ``since`` to ``until``, with empty buckets as 0."""
+    start = bucket_starts(since)[granularity]
+    end = bucket_starts(until or datetime.now(dt_timezone.utc))[granularity]
+    values = dict(
+        StatsRollup.objects
+        .filter(granularity=granularity, organizer_id=organizer_id, bucket__gte=start, bucket__lte=end)
+        .values_list("bucket", metric)
+    )
+    points, bucket = [], start
+    while bucket <= end:
+        points.append((bucket, values.get(bucket, 0)))
+        bucket += SERIES_STEPS[granularity]
+    return points
@@ -0,0 +1,54 @@
+# analytics/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from payments.models import Payment
+from tours.models import Tour, TourParticipant
+
+from .rollups import contributions, diff_contributions, record
+
+User = get_user_model()
+ROLLED_UP_MODELS = (User, Tour, TourParticipant, Booking, Payment)
+
+
+def _organizer_id(instance):
+    if isinstance(instance, User):
+        return None
+    if isinstance(instance, Tour):
+        return instance.organizer_id
+    tours = Tour.objects.all()
+    if isinstance(instance, TourParticipant):
+        tours = tours.filter(pk=instance.tour_id)
+    elif isinstance(instance, Booking):
+        tours = tours.filter(tour_participants__pk=instance.participant_id)
+    else:
+        tours = tours.filter(tour_participants__booking__pk=instance.booking_id)
+    return tours.values_list("organizer_id", flat=True).first()
+
+
+def remember_contributions(sender, instance, **kwargs):
+    # What the rollups currently hold for this row, so a save can add the difference
+    instance._rolled_up = contributions(instance)
+
+
+def update_rollups(sender, instance, created, **kwargs):
+    old = [] if created else instance._rolled_up
+    new = instance._rolled_up = contributions(instance)
+    if old is None or new is None:
+        return  # loaded with deferred fields: left to the reconciliation
+    changes = diff_contributions(new, old)
+    if changes:
+        record(changes, _organizer_id(instance))
+
+
+def release_rollups(sender, instance, **kwargs):
+    if instance._rolled_up:
+        record(diff_contributions([], instance._rolled_up), _organizer_id(instance))
+
+
+for model in ROLLED_UP_MODELS:
+    post_init.connect(remember_contributions, sender=model, dispatch_uid=f"rollups_init_{model._meta.label}")
+    post_save.connect(update_rollups, sender=model, dispatch_uid=f"rollups_save_{model._meta.label}")
+    post_delete.connect(release_rollups, sender=model, dispatch_uid=f"rollups_delete_{model._meta.label}")
@@ -0,0 +1,14 @@
+# analytics/tasks.py
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+
+@shared_task
+def reconcile_stats_rollups(days=None):
+    """Rebuild the dashboard rollups (analytics/rollups.py) for the last ``days`` days, or all of them."""
+    from .rollups import reconcile_rollups
+
+    since = timezone.now() - timedelta(days=days) if days is not None else None
+    return reconcile_rollups(since)
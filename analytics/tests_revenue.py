@@ -0,0 +1,109 @@
+# analytics/tests_revenue.py
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from analytics.revenue import revenue_report
+from bookings.models import Booking
+from payments.models import Payment
+from tours.models import Tour, TourParticipant
+
+
+class RevenueReportTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(email="admin@example.com", role="admin", is_staff=True)
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.other = User.objects.create_user(email="other@example.com", role="organizer")
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+        ]
+        self.bandarban = self._create_tour(self.organizer, "Bandarban")
+        self.sylhet = self._create_tour(self.organizer, "Sylhet")
+        other_tour = self._create_tour(self.other, "Cox's Bazar")
+
+        # Bandarban: one paid by cash + card in September, one unpaid in October
+        paid = self._book(self.bandarban, self.tourists[0], datetime(2026, 9, 10, tzinfo=dt_timezone.utc))
+        self._pay(paid, "60.00", "cash")
+        self._pay(paid, "40.00", "sslcommerz")
+        self._pay(paid, "100.00", "sslcommerz", status="failed")
+        self._book(self.bandarban, self.tourists[1], datetime(2026, 10, 2, tzinfo=dt_timezone.utc))
+        # Sylhet: overpaid in October
+        overpaid = self._book(self.sylhet, self.tourists[2], datetime(2026, 10, 5, tzinfo=dt_timezone.utc))
+        self._pay(overpaid, "120.00", "cash")
+        self._pay(self._book(other_tour, self.tourists[0], datetime(2026, 10, 5, tzinfo=dt_timezone.utc)),
+                  "100.00", "cash")
+
+    def _create_tour(self, organizer, title):
+        return Tour.objects.create(
+            organizer=organizer,
+            title=title,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 4),
+            start_location="Dhaka",
+            end_location=title,
+            cost_per_person="100.00",
+        )
+
+    def _book(self, tour, user, created_at):
+        participant = TourParticipant.objects.create(tour=tour, user=user, status="approved")
+        booking = Booking.objects.create(participant=participant, amount=Decimal("100.00"))
+        Booking.objects.filter(pk=booking.pk).update(created_at=created_at)
+        return booking
+
+    def _pay(self, booking, amount, method, status="success"):
+        Payment.objects.create(booking=booking, amount=Decimal(amount), method=method, status=status)
+
+    def test_report_per_tour_and_month(self):
+        with self.assertNumQueries(1):
+            report = revenue_report(self.organizer.pk)
+        self.assertEqual(report["totals"], {
+            "bookings": 3, "amount_due": Decimal("300.00"), "amount_paid": Decimal("220.00"),
+            "outstanding": Decimal("100.00"), "cash": Decimal("180.00"), "sslcommerz": Decimal("40.00"),
+        })
+        self.assertEqual(
+            [(row["title"], row["amount_due"], row["amount_paid"], row["outstanding"]) for row in report["tours"]],
+            [("Bandarban", Decimal("200.00"), Decimal("100.00"), Decimal("100.00")),
+             ("Sylhet", Decimal("100.00"), Decimal("120.00"), Decimal("0.00"))],
+        )
+        self.assertEqual(
+            [(row["month"], row["bookings"], row["cash"], row["sslcommerz"]) for row in report["months"]],
+            [("2026-09", 1, Decimal("60.00"), Decimal("40.00")), ("2026-10", 2, Decimal("120.00"), Decimal("0"))],
+        )
+        self.assertEqual(revenue_report()["totals"]["bookings"], 4)
+
+    def test_organizer_without_bookings_gets_zero_totals(self):
+        newcomer = User.objects.create_user(email="newcomer@example.com", role="organizer")
+        report = revenue_report(newcomer.pk)
+        self.assertEqual(report["totals"], {
+            "bookings": 0, "amount_due": Decimal("0.00"), "amount_paid": Decimal("0.00"),
+            "outstanding": Decimal("0.00"), "cash": Decimal("0.00"), "sslcommerz": Decimal("0.00"),
+        })
+        self.assertTrue(all(str(value) == "0.00" for key, value in report["totals"].items() if key != "bookings"))
+        self.assertEqual((report["tours"], report["months"]), ([], []))
+
+    def test_report_is_cached_briefly(self):
+        revenue_report(self.organizer.pk)
+        with self.assertNumQueries(0):
+            revenue_report(self.organizer.pk)
+
+    def test_endpoint_scoping(self):
+        url = reverse("revenue-report")
+        self.client.force_authenticate(self.organizer)
+        response = self.client.get(url, {"organizer": self.other.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["organizer"], self.organizer.pk)
+        self.assertEqual(len(response.data["tours"]), 2)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(url, {"organizer": self.other.pk})
+        self.assertEqual(response.data["totals"]["amount_paid"], Decimal("100.00"))
+
+        self.client.force_authenticate(self.tourists[0])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
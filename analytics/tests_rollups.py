@@ -0,0 +1,147 @@
+# analytics/tests_rollups.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from analytics.models import StatsRollup
+from analytics.rollups import reconcile_rollups, rollup_totals
+from bookings.models import Booking
+from payments.models import Payment
+from tours.models import Tour, TourParticipant
+from tours.seats import set_participant_status
+
+
+class StatsRollupTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin = User.objects.create_user(email="admin@example.com", role="admin", is_staff=True)
+            self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+            self.other = User.objects.create_user(email="other@example.com", role="organizer")
+            self.tourists = [
+                User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+            ]
+            self.tour = self._create_tour(self.organizer)
+            self.other_tour = self._create_tour(self.other)
+            self.participants = [
+                TourParticipant.objects.create(tour=self.tour, user=tourist) for tourist in self.tourists
+            ]
+            TourParticipant.objects.create(tour=self.other_tour, user=self.tourists[0])
+
+    def _create_tour(self, organizer):
+        return Tour.objects.create(
+            organizer=organizer,
+            title="Sundarbans",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 4),
+            start_location="Khulna",
+            end_location="Sundarbans",
+            cost_per_person="90.00",
+        )
+
+    def _approve_and_pay(self, participant, amount=Decimal("90.00")):
+        with self.captureOnCommitCallbacks(execute=True):
+            set_participant_status(participant, "approved")
+            booking = Booking.objects.create(participant=participant, amount=amount)
+            payment = Payment.objects.create(booking=booking, amount=amount, method="cash")
+            payment.mark_success(transaction_id="cash-1")
+
+    def _snapshot(self):
+        return list(
+            StatsRollup.objects.order_by("granularity", "bucket", "organizer_id").values_list("granularity", "bucket", "organizer_id", "users", "tours",
+                                            "join_requests", "approvals", "pending", "approved", "bookings",
+                                            "revenue")
+        )
+
+    def test_events_update_totals_incrementally(self):
+        self._approve_and_pay(self.participants[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            set_participant_status(self.participants[1], "rejected")
+
+        organizer = rollup_totals(self.organizer.pk)
+        self.assertEqual(
+            {key: organizer[key] for key in ("tours", "join_requests", "approvals", "pending", "bookings")},
+            {"tours": 1, "join_requests": 3, "approvals": 1, "pending": 1, "bookings": 1},
+        )
+        self.assertEqual(organizer["revenue"], Decimal("90.00"))
+        platform = rollup_totals()
+        self.assertEqual((platform["users"], platform["tours"], platform["pending"]), (6, 2, 2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.participants[2].delete()
+        self.assertEqual(rollup_totals(self.organizer.pk)["pending"], 0)
+
+    def test_rolled_back_writes_do_not_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._create_tour(self.organizer)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(rollup_totals(self.organizer.pk)["tours"], 1)
+
+    def test_reconciliation_matches_incremental_updates(self):
+        self._approve_and_pay(self.participants[0])
+        incremental = self._snapshot()
+        reconcile_rollups()
+        self.assertEqual(self._snapshot(), incremental)
+
+        # Writes that bypass the signals are picked up by the next reconciliation
+        TourParticipant.objects.filter(pk=self.participants[1].pk).update(status="approved")
+        reconcile_rollups(since=timezone.now() - timedelta(days=2))
+        self.assertEqual(rollup_totals(self.organizer.pk)["approvals"], 2)
+        self.assertEqual(rollup_totals(self.organizer.pk)["pending"], 1)
+
+    def test_dashboard_reads_the_rollups(self):
+        self._approve_and_pay(self.participants[0])
+        self.client.force_authenticate(self.organizer)
+        with self.assertNumQueries(2):  # totals row, recent tours
+            response = self.client.get(reverse("dashboard-stats"))
+        stats = response.data["stats"]
+        self.assertEqual((stats["total_tours"], stats["approved_bookings"], stats["pending_requests"]), (1, 1, 2))
+        self.assertEqual(stats["revenue"], Decimal("90.00"))
+
+    def test_approved_bookings_counts_approved_participants_only(self):
+        self._approve_and_pay(self.participants[0])
+        self._approve_and_pay(self.participants[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            set_participant_status(self.participants[1], "completed")
+        self.client.force_authenticate(self.organizer)
+        stats = self.client.get(reverse("dashboard-stats")).data["stats"]
+        self.assertEqual(stats["approved_bookings"], 1)
+        self.assertEqual(rollup_totals(self.organizer.pk)["approvals"], 2)
+
+        reconcile_rollups()
+        self.assertEqual(rollup_totals(self.organizer.pk)["approved"], 1)
+
+    def test_timeseries_of_approvals_per_day(self):
+        self._approve_and_pay(self.participants[0])
+        self.client.force_authenticate(self.organizer)
+        response = self.client.get(reverse("stats-timeseries"), {"metric": "approvals", "days": 90})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        points = response.data["points"]
+        self.assertEqual(len(points), 91)
+        self.assertEqual([point["value"] for point in points[-1:]], [1])
+        self.assertEqual(sum(point["value"] for point in points), 1)
+
+        # Organizers only see their own tours; admins can pick one
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("stats-timeseries"), {"metric": "join_requests", "organizer": self.other.pk})
+        self.assertEqual(sum(point["value"] for point in response.data["points"]), 1)
+
+    def test_timeseries_rejects_bad_params(self):
+        self.client.force_authenticate(self.organizer)
+        url = reverse("stats-timeseries")
+        for params in ({"metric": "nope"}, {"granularity": "week"}, {"days": "400"}, {"granularity": "hour", "days": "40"}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(self.tourists[0])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,9 @@
+# analytics/urls.py
+from django.urls import path
+
+from .views import RevenueReportView, StatsTimeSeriesView
+
+urlpatterns = [
+    path('timeseries/', StatsTimeSeriesView.as_view(), name='stats-timeseries'),
+    path('revenue/', RevenueReportView.as_view(), name='revenue-report'),
+]
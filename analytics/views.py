@@ -0,0 +1,84 @@
+# analytics/views.py
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from tour_management.db_router import ReplicaReadMixin
+from tours.permissions import IsOrganizerOrAdmin
+
+from .revenue import revenue_report
+from .rollups import METRICS, rollup_series
+
+# granularity -> (default days, max days)
+SERIES_RANGES = {"day": (90, 366), "hour": (2, 31)}
+
+
+def _int_param(request, name, default, maximum):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError({name: "Expected an integer."})
+    if not 1 <= value <= maximum:
+        raise ValidationError({name: f"Expected 1 to {maximum}."})
+    return value
+
+
+def _organizer_scope(request):
+    """Organizers get their own id; admins the platform (None) or ``?organizer=<id>``."""
+    if request.user.role != "admin":
+        return request.user.pk
+    if not request.query_params.get("organizer"):
+        return None
+    return _int_param(request, "organizer", None, 2 ** 63 - 1)
+
+
+class StatsTimeSeriesView(ReplicaReadMixin, APIView):
+    """
+    ``?metric=approvals&granularity=day&days=90`` -> one point per bucket
+    from the rollups (analytics/rollups.py), empty buckets included.
+    Organizers see their own tours; admins the platform, or one organizer
+    with ``?organizer=<id>``.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrganizerOrAdmin]
+
+    def get(self, request):
+        metric = request.query_params.get("metric", "approvals")
+        if metric not in METRICS:
+            raise ValidationError({"metric": f"Expected one of: {', '.join(METRICS)}."})
+        granularity = request.query_params.get("granularity", "day")
+        if granularity not in SERIES_RANGES:
+            raise ValidationError({"granularity": f"Expected one of: {', '.join(SERIES_RANGES)}."})
+        days = _int_param(request, "days", *SERIES_RANGES[granularity])
+
+        organizer_id = _organizer_scope(request)
+        now = timezone.now()
+        points = rollup_series(metric, granularity, now - timedelta(days=days), now, organizer_id=organizer_id)
+        return Response({
+            "metric": metric,
+            "granularity": granularity,
+            "organizer": organizer_id,
+            "points": [{"bucket": bucket, "value": value} for bucket, value in points],
+        })
+
+
+class RevenueReportView(ReplicaReadMixin, APIView):
+    """
+    Amount due, paid and outstanding, and the cash / SSLCommerz split, per
+    tour and per booking month (analytics/revenue.py). Same scoping as the
+    time series.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrganizerOrAdmin]
+
+    def get(self, request):
+        organizer_id = _organizer_scope(request)
+        return Response({"organizer": organizer_id, **revenue_report(organizer_id)})
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+        ('tours', '0022_tour_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['participant', 'created_at'], include=('amount', 'id'), name='booking_participant_due'),
+        ),
+    ]
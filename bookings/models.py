@@ -23,6 +23,13 @@ class Booking(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Amounts due per participant and month (analytics/revenue.py), index-only
+            models.Index(fields=["participant", "created_at"], include=["amount", "id"],
+                         name="booking_participant_due"),
+        ]
+
     def update_status(self):
         if self.amount_paid == 0:
             self.payment_status = "pending"
@@ -1,10 +1,11 @@
 # bookings/serializers.py
 from rest_framework import serializers
 from payments.models import Payment
+from tour_management.serializers import DynamicFieldsMixin
 from tours.serializers import TourSerializer, ParticipantSerializer
 from .models import Booking
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     tour = TourSerializer(source='participant.tour', read_only=True)
     participant_user = ParticipantSerializer(source='participant', read_only=True)
     payments = serializers.SerializerMethodField()
@@ -15,5 +16,9 @@ class BookingSerializer(serializers.ModelSerializer):
 
     def get_payments(self, obj):
         from payments.serializers import PaymentSerializer
-        payments_qs = obj.payments.all().order_by('-created_at')
-        return PaymentSerializer(payments_qs, many=True).data
\ No newline at end of file
+        if 'payments' in getattr(obj, '_prefetched_objects_cache', {}):
+            # Already ordered by the view's prefetch
+            payments_qs = obj.payments.all()
+        else:
+            payments_qs = obj.payments.all().order_by('-created_at')
+        return PaymentSerializer(payments_qs, many=True, **self.nested_shape('payments')).data
\ No newline at end of file
@@ -0,0 +1,92 @@
+# bookings/tests_bookings.py
+import csv
+import io
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from bookings.models import Booking
+from payments.models import Payment
+from tours.models import Tour, TourParticipant
+
+
+class BookingSparseFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        tour = Tour.objects.create(
+            organizer=organizer,
+            title="Srimangal",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 3),
+            start_location="Dhaka",
+            end_location="Srimangal",
+            cost_per_person="45.00",
+        )
+        participant = TourParticipant.objects.create(tour=tour, user=self.tourist, status="approved")
+        self.booking = Booking.objects.create(participant=participant, amount="45.00")
+        self.payment = Payment.objects.create(
+            booking=self.booking, created_by=self.tourist, amount="20.00", method="cash"
+        )
+        self.client.force_authenticate(self.tourist)
+
+    def test_nested_tour_fields(self):
+        response = self.client.get(reverse("booking-list"), {"fields": "id,tour.title,payments.amount"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{
+            "id": self.booking.id,
+            "tour": {"title": "Srimangal"},
+            "payments": [{"amount": "20.00"}],
+        }])
+
+    def test_payment_expands_booking(self):
+        response = self.client.get(
+            reverse("payment-detail", args=[self.payment.pk]),
+            {"fields": "id,booking", "expand": "booking", "omit": "booking.tour,booking.payments"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["booking"]["id"], self.booking.id)
+        self.assertEqual(response.data["booking"]["participant_user"]["email"], "tourist@example.com")
+        self.assertNotIn("tour", response.data["booking"])
+
+    def test_booking_id_without_expand(self):
+        response = self.client.get(reverse("payment-detail", args=[self.payment.pk]), {"fields": "id,booking"})
+        self.assertEqual(response.data, {"id": self.payment.id, "booking": self.booking.id})
+
+
+class BookingExportTestCase(APITestCase):
+
+    def setUp(self):
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(2)
+        ]
+        tour = Tour.objects.create(
+            organizer=organizer,
+            title="Paharpur",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 2),
+            start_location="Dhaka",
+            end_location="Paharpur",
+            cost_per_person="35.00",
+        )
+        for tourist in self.tourists:
+            participant = TourParticipant.objects.create(tour=tour, user=tourist, status="approved")
+            booking = Booking.objects.create(participant=participant, amount="35.00")
+            Payment.objects.create(booking=booking, created_by=tourist, amount="35.00", method="cash")
+
+    def _rows(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+
+    def test_tourist_exports_only_own_bookings_and_payments(self):
+        self.client.force_authenticate(self.tourists[0])
+        [booking] = self._rows(reverse("booking-export"))
+        self.assertEqual((booking["tourist"], booking["tour"]), ("tourist0@example.com", "Paharpur"))
+        [payment] = self._rows(reverse("payment-export"))
+        self.assertEqual((payment["created_by"], payment["amount"]), ("tourist0@example.com", "35.00"))
@@ -3,29 +3,53 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from django.db.models import Prefetch
 from django.utils import timezone
 from tours.models import TourParticipant
+from tours.querysets import tour_prefetches
+from payments.models import Payment
 from .models import Booking
 from .serializers import BookingSerializer
 from django.shortcuts import get_object_or_404
 from decimal import Decimal
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from tour_management.exports import ExportContentNegotiation, export_format, stream_export
+from tour_management.pagination import KeysetOrPageNumberPagination, KeysetPagination
+from tour_management.serializers import is_shaped
 
 
 # Create your views here.
 
+class BookingCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class BookingPagination(KeysetOrPageNumberPagination):
+    # Unpaginated by default; ?pagination=cursor opts into keyset pages
+    cursor_pagination_class = BookingCursorPagination
+
+
+BOOKING_EXPORT_COLUMNS = [
+    ("id", "id"), ("participant_id", "participant_id"), ("tour_id", "participant__tour_id"),
+    ("tour", "participant__tour__title"), ("tourist", "participant__user__email"),
+    ("amount", "amount"), ("amount_paid", "amount_paid"), ("payment_status", "payment_status"),
+    ("created_at", "created_at"),
+]
+
+
 class BookingViewSet(viewsets.ModelViewSet):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = BookingPagination
 
     # ---------------------------
     # ✅ Queryset with correct filtering
     # ---------------------------
     def get_queryset(self):
-        qs = Booking.objects.all()
+        qs = self._with_related(Booking.objects.all())
         user = self.request.user
 
         # Optional frontend filters
@@ -51,6 +75,48 @@ class BookingViewSet(viewsets.ModelViewSet):
 
         return qs
 
+    def _with_related(self, qs):
+        """
+        Nested TourSerializer/ParticipantSerializer/PaymentSerializer data in one
+        round of prefetches. On list/retrieve only the fields left by
+        ?fields= / ?omit= are fetched.
+        """
+        fields = tour_fields = None
+        if self.action in ("list", "retrieve"):
+            serializer = self.get_serializer()
+            fields = serializer.fields
+            if "tour" in fields:
+                tour_fields = set(fields["tour"].fields)
+            if is_shaped(self.request):
+                qs = qs.only(*serializer.get_only_fields())
+
+        def wanted(name):
+            return fields is None or name in fields
+
+        related, prefetches = [], []
+        if wanted("participant_user"):
+            related.append("participant__user")
+        if wanted("tour"):
+            related.append("participant__tour")
+            if tour_fields is None or {"organizer", "organizer_email"} & tour_fields:
+                related.append("participant__tour__organizer")
+            prefetches += tour_prefetches(prefix="participant__tour__", fields=tour_fields)
+        if wanted("payments"):
+            prefetches.append(Prefetch(
+                "payments",
+                queryset=Payment.objects.select_related("created_by", "verified_by").order_by("-created_at"),
+            ))
+        return qs.select_related(*related).prefetch_related(*prefetches)
+
+    # ---------------------------
+    # ✅ Streaming export (same scoping and filters as the list)
+    # ---------------------------
+    @action(detail=False, methods=["get"], url_path="export", content_negotiation_class=ExportContentNegotiation)
+    def export(self, request):
+        return stream_export(
+            self.get_queryset().order_by("id"), BOOKING_EXPORT_COLUMNS, "bookings", export_format(request),
+        )
+
     # ---------------------------
     # ✅ Tourist creates booking
     # ---------------------------
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_revenue_indexes'),
+        ('payments', '0002_alter_payment_booking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'success')), fields=['booking', 'method'], include=('amount',), name='payment_success_booking'),
+        ),
+    ]
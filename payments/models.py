@@ -38,6 +38,11 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Paid amounts per booking and method (analytics/revenue.py), index-only
+            models.Index(fields=["booking", "method"], include=["amount"],
+                         condition=models.Q(status="success"), name="payment_success_booking"),
+        ]
 
     def mark_success(self, transaction_id=None, payload=None):
 
@@ -2,6 +2,7 @@
 from rest_framework import serializers
 from .models import Payment
 from bookings.models import Booking
+from tour_management.serializers import DynamicFieldsMixin
 from tours.serializers import ParticipantSerializer
 from decimal import Decimal
 
@@ -39,7 +40,7 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     booking = serializers.PrimaryKeyRelatedField(read_only=True)
     booking_detail = serializers.SerializerMethodField()
     created_by_email = serializers.EmailField(source="created_by.email", read_only=True)
@@ -58,6 +59,10 @@ class PaymentSerializer(serializers.ModelSerializer):
             "verified_at",
         ]
 
+    # ?expand=booking swaps the id for the full booking (with its tour)
+    expandable_fields = {"booking": ("bookings.serializers.BookingSerializer", {})}
+    only_dependencies = {"booking_detail": ["booking"]}
+
     def get_booking_detail(self, obj):
         # return a minimal booking summary
         return {
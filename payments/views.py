@@ -4,6 +4,7 @@ from decimal import Decimal
 from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Prefetch
 
 from rest_framework import viewsets, mixins
 from rest_framework.decorators import action, api_view, authentication_classes, permission_classes
@@ -16,7 +17,12 @@ from django.views.decorators.csrf import csrf_exempt
 from .models import Payment
 from .serializers import PaymentCreateSerializer, PaymentSerializer
 from bookings.models import Booking
+from bookings.serializers import BookingSerializer
+from tours.querysets import tour_prefetches
 from django.shortcuts import get_object_or_404, redirect
+from tour_management.exports import ExportContentNegotiation, export_format, stream_export
+from tour_management.pagination import KeysetOrPageNumberPagination, KeysetPagination
+from tour_management.serializers import is_shaped
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +37,23 @@ SSL_CANCEL_URL = settings.SSL_CANCEL_URL
 SSLCOMMERZ_BASE_URL = "https://sandbox.sslcommerz.com" if settings.DEBUG else "https://securepay.sslcommerz.com"
 
 
+class PaymentCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class PaymentPagination(KeysetOrPageNumberPagination):
+    # Unpaginated by default; ?pagination=cursor opts into keyset pages
+    cursor_pagination_class = PaymentCursorPagination
+
+
+PAYMENT_EXPORT_COLUMNS = [
+    ("id", "id"), ("booking_id", "booking_id"), ("tour_id", "booking__participant__tour_id"),
+    ("amount", "amount"), ("method", "method"), ("status", "status"),
+    ("transaction_id", "transaction_id"), ("created_by", "created_by__email"),
+    ("verified_by", "verified_by__email"), ("created_at", "created_at"), ("verified_at", "verified_at"),
+]
+
+
 class PaymentViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin):
     """
     List / Retrieve payments (role-based).
@@ -43,10 +66,11 @@ class PaymentViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retr
     serializer_class = PaymentSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = PaymentPagination
 
     def get_queryset(self):
         user = self.request.user
-        qs = Payment.objects.all()
+        qs = self._with_related(Payment.objects.all())
         if user.role == "admin":
             return qs
         if user.role == "organizer":
@@ -54,6 +78,44 @@ class PaymentViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retr
         # tourist -> only payments they created or payments for their bookings
         return qs.filter(booking__participant__user=user)
 
+    def _with_related(self, qs):
+        """
+        Join/prefetch what PaymentSerializer reads. On list/retrieve this
+        follows ?fields= / ?omit= / ?expand=booking.
+        """
+        fields = None
+        if self.action in ("list", "retrieve"):
+            serializer = self.get_serializer()
+            fields = serializer.fields
+            if is_shaped(self.request):
+                qs = qs.only(*serializer.get_only_fields())
+
+        def wanted(name):
+            return fields is None or name in fields
+
+        related, prefetches = [], []
+        if wanted("created_by_email"):
+            related.append("created_by")
+        if wanted("verified_by_email"):
+            related.append("verified_by")
+        if wanted("booking_detail"):
+            related.append("booking__participant")
+        if fields is not None and isinstance(fields.get("booking"), BookingSerializer):
+            related += ["booking__participant__user", "booking__participant__tour__organizer"]
+            prefetches += tour_prefetches(prefix="booking__participant__tour__")
+            prefetches.append(Prefetch(
+                "booking__payments",
+                queryset=Payment.objects.select_related("created_by", "verified_by").order_by("-created_at"),
+            ))
+        return qs.select_related(*related).prefetch_related(*prefetches)
+
+    @action(detail=False, methods=["get"], url_path="export", content_negotiation_class=ExportContentNegotiation)
+    def export(self, request):
+        """Stream the payments visible to the user as CSV/NDJSON (?export_format=)."""
+        return stream_export(
+            self.get_queryset().order_by("id"), PAYMENT_EXPORT_COLUMNS, "payments", export_format(request),
+        )
+
     @action(detail=False, methods=["post"], url_path="initiate")
     def initiate(self, request):
         """
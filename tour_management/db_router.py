@@ -0,0 +1,136 @@
+# tour_management/db_router.py
+"""
+Read-replica routing.
+
+Everything goes to ``default`` (the primary) unless a view opts in with
+ReplicaReadMixin: its safe requests then read from one of
+``settings.DATABASE_REPLICAS`` for the duration of the request, except
+while a transaction is open on the primary. Writes always go to the
+primary.
+
+Read-after-write: RecentWriteMiddleware remembers, for
+``DB_REPLICA_STICKY_SECONDS``, that a user has just written (any
+successful unsafe request). Their reads stay on the primary for that
+window, so they never see a replica that has not caught up with their
+own change yet.
+
+Version-keyed caches (the catalog list and facets, the my-tours
+dashboard) are filled inside ``read_from_primary()``: a miss right after
+a version bump would otherwise store what a lagging replica returns
+under the new version, stale but valid until its TTL.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY = "default"
+STICKY_KEY = "db:recent-write:{user_id}"
+
+# Alias the current request reads from; None = primary
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def choose_replica():
+    """A random replica alias, or None when none are configured."""
+    aliases = replica_aliases()
+    return random.choice(aliases) if aliases else None
+
+
+def mark_recent_write(user_id):
+    cache.set(STICKY_KEY.format(user_id=user_id), True, settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def wrote_recently(user_id):
+    return cache.get(STICKY_KEY.format(user_id=user_id)) is not None
+
+
+@contextmanager
+def read_from_primary():
+    """Route the block's reads to the primary, even inside a replica view."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        # Inside a transaction on the primary, reads must see its writes
+        if alias is None or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        databases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        return db == PRIMARY
+
+
+class ReplicaReadMixin:
+    """
+    APIView / ViewSet mixin: serve safe requests from a replica.
+    ``replica_actions`` limits it to those viewset actions (None = all).
+    """
+    replica_actions = None
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        if self.replica_actions is not None and getattr(self, "action", None) not in self.replica_actions:
+            return False
+        user = request.user
+        return not (user and user.is_authenticated and wrote_recently(user.pk))
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication (the user lookup) still reads from the primary
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            _read_alias.set(choose_replica())
+
+
+class RecentWriteMiddleware:
+    """Start a user's primary-only window after each successful write."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF's token/JWT authentication sets request.user on the underlying request
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None and user.is_authenticated
+            and replica_aliases()
+        ):
+            mark_recent_write(user.pk)
+        return response
@@ -0,0 +1,213 @@
+# tour_management/pagination.py
+"""
+Shared pagination classes.
+
+KeysetPagination walks a queryset with a ``WHERE (ordering) > (last row)``
+predicate instead of OFFSET, so page N costs the same as page 1 and no
+COUNT(*) is issued. Clients opt into it per request via
+KeysetOrPageNumberPagination (``?pagination=cursor`` or any ``?cursor=``),
+which keeps the existing page-number behaviour as the default.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _cursor_value(value):
+    # Full-precision ISO strings: DjangoJSONEncoder would truncate datetimes
+    # to milliseconds and make the keyset skip rows.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(position, reverse=False):
+    payload = json.dumps({"p": position, "r": int(reverse)}, default=_cursor_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(value):
+    """Return ``(position, reverse)`` or raise NotFound for a malformed cursor."""
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return list(payload["p"]), bool(payload.get("r"))
+    except (TypeError, ValueError, KeyError, UnicodeError):
+        raise NotFound("Invalid cursor.")
+
+
+def keyset_filter(ordering, position, reverse=False):
+    """
+    Build the row-comparison predicate for "rows after ``position``" under
+    ``ordering`` (mixed directions allowed), e.g. for ("-start_date", "id"):
+        start_date < d OR (start_date = d AND id > i)
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        if reverse:
+            descending = not descending
+        condition |= Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": value})
+        equal[name] = value
+    return condition
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for ``queryset`` (EXPLAIN, no execution).
+    Returns None on backends without a JSON EXPLAIN.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    # A one-element array or the bare plan object, depending on the driver
+    plan = plan[0] if isinstance(plan, list) else plan
+    return int(plan["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite, unique ``ordering``.
+
+    Response: {"next", "previous", "results"} plus "count" (planner estimate)
+    when the client passes ``?count=approx``.
+    """
+    ordering = ("-id",)
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(self.page_queryset(queryset, request, view=view))
+
+    def page_queryset(self, queryset, request, view=None):
+        """
+        The requested page as an unevaluated queryset, with one extra row
+        that tells whether more follow; hand its rows to ``set_page``.
+        Lets a view send several pages as a single query.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.active_ordering = tuple(self.get_ordering(request, queryset, view))
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        position, reverse = decode_cursor(encoded) if encoded else (None, False)
+
+        self.approximate_count = None
+        if request.query_params.get(self.count_query_param) == "approx":
+            self.approximate_count = estimate_count(queryset)
+
+        ordering = self.active_ordering
+        if reverse:
+            ordering = tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+        qs = queryset.order_by(*ordering)
+        if position is not None:
+            qs = qs.filter(keyset_filter(self.active_ordering, position, reverse))
+
+        self.position, self.reverse = position, reverse
+        return qs[:self.page_size + 1]
+
+    def set_page(self, rows):
+        rows = list(rows)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = rows
+        return rows
+
+    def _position(self, row):
+        # Model instances or values() dicts
+        if isinstance(row, dict):
+            return [row[field.lstrip("-")] for field in self.active_ordering]
+        return [getattr(row, field.lstrip("-")) for field in self.active_ordering]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = encode_cursor(self._position(self.page[-1]))
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = encode_cursor(self._position(self.page[0]), reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+        ])
+        if self.approximate_count is not None:
+            payload["count"] = self.approximate_count
+        payload["results"] = data
+        return Response(payload)
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    """
+    Dispatch to keyset pagination when the client asks for it and to the
+    regular page-number paginator otherwise. ``page_pagination_class = None``
+    keeps an endpoint unpaginated unless a cursor is requested.
+    """
+    page_pagination_class = None
+    cursor_pagination_class = KeysetPagination
+    mode_query_param = "pagination"
+
+    def uses_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.uses_cursor(request):
+            self.delegate = self.cursor_pagination_class()
+        elif self.page_pagination_class is not None:
+            self.delegate = self.page_pagination_class()
+        else:
+            self.delegate = None
+            return None
+        page = self.delegate.paginate_queryset(queryset, request, view=view)
+        self.display_page_controls = getattr(self.delegate, "display_page_controls", False)
+        return page
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def to_html(self):
+        return self.delegate.to_html()
@@ -0,0 +1,71 @@
+# tour_management/renderers.py
+"""
+orjson-backed drop-in replacements for DRF's JSONRenderer / JSONParser.
+
+Output is byte-for-byte what rest_framework.renderers.JSONRenderer produces
+with the default settings (compact separators, UTF-8, U+2028/U+2029
+escaped): date, time and datetime values are handed back to DRF's own
+JSONEncoder, which also covers Decimal, UUID, lazy strings, etc. Floats use
+the shortest round-trip digits like ``repr()``; only exponent spelling can
+differ (``1e-5`` vs ``1e-05``). Anything orjson cannot encode (e.g. integers wider than 64 bits), indented output
+for ``Accept: application/json; indent=4``, and a missing orjson install
+all fall back to the stdlib implementation.
+
+Compare the two with ``python manage.py benchmark_renderers``.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+
+    def _uses_stdlib(self, accepted_media_type, renderer_context):
+        return (
+            orjson is None
+            or self.encoder_class is not JSONEncoder
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self._uses_stdlib(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safe escaping as DRF's JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8' or not api_settings.STRICT_JSON:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,137 @@
+# tour_management/serializers.py
+"""
+Shared serializer helpers.
+
+DynamicFieldsMixin lets clients shape a response with query parameters:
+
+  ?fields=id,title,tour.title    keep only these fields; dotted paths reach
+                                 into nested serializers
+  ?omit=participants,tour.offers drop these fields
+  ?expand=booking                replace a primary-key field with the nested
+                                 representation declared in ``expandable_fields``
+
+The root serializer reads the parameters from ``context["request"]`` and
+hands each nested serializer its share of the paths. Views call
+``get_only_fields()`` and inspect ``serializer.fields`` to trim their
+querysets (columns and prefetches) to the same shape.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+EXPAND_PARAM = "expand"
+SHAPE_PARAMS = (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM)
+
+
+def parse_paths(value):
+    """``"id, tour.title"`` -> ``{"id", "tour.title"}``; None when absent."""
+    if value is None:
+        return None
+    return {path.strip() for path in value.split(",") if path.strip()}
+
+
+def split_paths(paths):
+    """``{"a", "b.c", "b.d"}`` -> ``({"a", "b"}, {"b": {"c", "d"}})``"""
+    top, nested = set(), {}
+    for path in paths:
+        head, _, rest = path.partition(".")
+        top.add(head)
+        if rest:
+            nested.setdefault(head, set()).add(rest)
+    return top, nested
+
+
+def is_shaped(request):
+    """True when the client restricted the response with ?fields= or ?omit=."""
+    return any(request.query_params.get(param) for param in (FIELDS_PARAM, OMIT_PARAM))
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and expansion for ModelSerializers (see module docstring).
+
+    The shape can also be passed explicitly, e.g.
+    ``PaymentSerializer(qs, many=True, fields={"id", "amount"})``.
+    """
+    # field name -> (serializer class or dotted import path, extra kwargs)
+    expandable_fields = {}
+    # non-model field name -> model fields it reads (for get_only_fields)
+    only_dependencies = {}
+
+    def __init__(self, *args, **kwargs):
+        shape = {param: kwargs.pop(param, None) for param in SHAPE_PARAMS}
+        super().__init__(*args, **kwargs)
+        self._requested_shape = shape if any(value is not None for value in shape.values()) else None
+        self._nested_shapes = {}
+
+    def get_requested_shape(self):
+        if self._requested_shape is not None:
+            return self._requested_shape
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get("request")
+        if parent is not None or request is None:
+            return None
+        return {param: parse_paths(request.query_params.get(param)) for param in SHAPE_PARAMS}
+
+    def build_expanded_field(self, name):
+        serializer_class, kwargs = self.expandable_fields[name]
+        if isinstance(serializer_class, str):
+            serializer_class = import_string(serializer_class)
+        return serializer_class(read_only=True, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        shape = self.get_requested_shape()
+        if not shape:
+            return fields
+
+        include, include_nested = (None, {}) if shape[FIELDS_PARAM] is None else split_paths(shape[FIELDS_PARAM])
+        omit_paths = shape[OMIT_PARAM] or set()
+        _, omit_nested = split_paths(path for path in omit_paths if "." in path)
+        expand, expand_nested = split_paths(shape[EXPAND_PARAM] or set())
+
+        for name in expand & set(self.expandable_fields):
+            fields[name] = self.build_expanded_field(name)
+        if include is not None:
+            fields = {name: field for name, field in fields.items() if name in include}
+        for name in omit_paths:
+            fields.pop(name, None)
+
+        for name, field in fields.items():
+            nested_shape = {
+                FIELDS_PARAM: include_nested.get(name),
+                OMIT_PARAM: omit_nested.get(name, set()),
+                EXPAND_PARAM: expand_nested.get(name, set()),
+            }
+            self._nested_shapes[name] = nested_shape
+            child = getattr(field, "child", field)
+            if isinstance(child, DynamicFieldsMixin):
+                child._requested_shape = nested_shape
+        return fields
+
+    def nested_shape(self, name):
+        """Shape kwargs for a serializer built by hand inside a SerializerMethodField."""
+        self.fields  # noqa: B018 -- computes the nested shapes
+        return dict(self._nested_shapes.get(name, {}))
+
+    def get_only_fields(self):
+        """Model field names the current shape reads, for ``QuerySet.only()``."""
+        opts = self.Meta.model._meta
+        names = {opts.pk.name}
+        for name, field in self.fields.items():
+            if name in self.only_dependencies:
+                names.update(self.only_dependencies[name])
+                continue
+            if field.source == "*":
+                continue
+            try:
+                model_field = opts.get_field(field.source.split(".")[0])
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete:
+                names.add(model_field.name)
+        return sorted(names)
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     # Django core
     'django.contrib.admin', 'django.contrib.auth', 'django.contrib.contenttypes',
     'django.contrib.sessions', 'django.contrib.messages', 'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party
     'rest_framework', 'rest_framework.authtoken', 'djoser', 'social_django',
@@ -34,7 +35,7 @@ INSTALLED_APPS = [
 
     # Local apps
     'accounts', 'tours', 'media_gallery', 'costs', 'locations',
-    'bookings', 'payments'
+    'bookings', 'payments', 'analytics'
 ]
 
 AUTH_USER_MODEL = "accounts.User"
@@ -50,7 +51,9 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'social_django.middleware.SocialAuthExceptionMiddleware',
-    'django.middleware.common.BrokenLinkEmailsMiddleware'
+    'django.middleware.common.BrokenLinkEmailsMiddleware',
+    'tour_management.db_router.RecentWriteMiddleware',
+    'accounts.presence.PresenceMiddleware',
 ]
 
 # 🔹 CORS & CSRF
@@ -61,6 +64,8 @@ CORS_ALLOWED_ORIGINS = config(
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = list(default_headers) + ["Authorization"]
+# Let browser clients read the catalog validators (conditional GETs)
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
 
 # 🔹 Templates
 TEMPLATES = [
@@ -110,6 +115,23 @@ else:
         }
     }
 
+# 🔹 Read replicas: DB_REPLICA_HOSTS="replica1.internal,replica2.internal:6432"
+# Same credentials as the primary; see tour_management/db_router.py
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, config("DB_REPLICA_HOSTS", default="").split(",")), start=1):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": int(port) if port else DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["tour_management.db_router.ReplicaRouter"]
+# Seconds a user's reads stay on the primary after they write
+DB_REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=5, cast=int)
+
 # 🔹 Cloudinary
 CLOUDINARY = {
     'cloud_name': config("CLOUDINARY_CLOUD_NAME"),
@@ -148,6 +170,8 @@ from .jwt import *
 from .cache import *
 # 🔹 Logging
 from .logging import *
+# 🔹 Django REST framework
+from .drf import *
 
 # 🔹 Static & Media (Cloudinary)
 STATIC_URL = 'static/'
@@ -160,6 +184,26 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_RESULT_BACKEND = "redis://redis:6379/0"
+# Periodic jobs (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    "rebuild-similar-tours": {
+        "task": "tours.tasks.rebuild_similar_tours",
+        "schedule": 60 * 60 * 6,  # every 6 hours
+    },
+    "recompute-trending-scores": {
+        "task": "tours.tasks.recompute_trending_scores",
+        "schedule": 60 * 60 * 24,  # daily
+    },
+    "reconcile-recent-stats-rollups": {
+        "task": "analytics.tasks.reconcile_stats_rollups",
+        "schedule": 60 * 60,  # hourly
+        "kwargs": {"days": 2},
+    },
+    "reconcile-all-stats-rollups": {
+        "task": "analytics.tasks.reconcile_stats_rollups",
+        "schedule": 60 * 60 * 24,  # daily
+    },
+}
 
 SSLCOMMERZ_STORE_ID = config("SSLCOMMERZ_STORE_ID")
 SSLCOMMERZ_STORE_PASSWORD = config("SSLCOMMERZ_STORE_PASSWORD")
@@ -15,6 +15,7 @@ if REDIS_URL:
             },
         }
     }
+    PRESENCE_BACKEND = "accounts.presence.RedisPresence"
 
     # Celery config
     CELERY_BROKER_URL = REDIS_URL
@@ -31,6 +32,7 @@ else:
             "LOCATION": "tourmate-cache",
         }
     }
+    PRESENCE_BACKEND = "accounts.presence.LocMemPresence"
     CELERY_BROKER_URL = "memory://"
     CELERY_RESULT_BACKEND = "cache+memory://"
     CELERY_ACCEPT_CONTENT = ["json"]
@@ -0,0 +1,12 @@
+REST_FRAMEWORK = {
+    # orjson-backed, byte-compatible with DRF's JSONRenderer/JSONParser (tour_management/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "tour_management.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "tour_management.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
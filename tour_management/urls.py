@@ -23,6 +23,7 @@ urlpatterns = [
     path("robots.txt", robots_txt),
     path('api/', include('bookings.urls')),  # Bookings app
     path('api/', include('payments.urls')),  # Payments app
+    path('api/analytics/', include('analytics.urls')),  # Dashboard statistics
 
 
 ]
\ No newline at end of file
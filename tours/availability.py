@@ -0,0 +1,74 @@
+# tours/availability.py
+"""
+Guide availability.
+
+Each assignment stores its tour's dates as a daterange (period). Periods
+are half-open, [start_date, end_date): a guide whose tour ends on a day
+can start another that day, as before, and a day trip occupies its one
+day. The exclusion constraint guide_assignment_no_overlap rejects a
+second accepted assignment with an overlapping period for the same
+guide, and its GiST index (partial, on accepted assignments) answers
+"who is busy between X and Y" as an index search instead of a scan over
+every assignment:
+
+    /api/tours/guides/available/?start=2030-01-01&end=2030-01-05
+"""
+from datetime import date, timedelta
+
+from django.db.backends.postgresql.psycopg_any import DateRange
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+PERIOD_BOUNDS = "[)"
+NO_OVERLAP_CONSTRAINT = "guide_assignment_no_overlap"
+
+
+class GuideDoubleBooked(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The guide is already assigned to a tour with overlapping dates."
+    default_code = "guide_double_booked"
+
+
+def is_double_booking(exc):
+    """Whether an IntegrityError is NO_OVERLAP_CONSTRAINT rejecting the write (not some other constraint)."""
+    return getattr(getattr(exc.__cause__, "diag", None), "constraint_name", None) == NO_OVERLAP_CONSTRAINT
+
+
+def tour_period(start_date, end_date):
+    # A day trip (start == end) still occupies its day; an empty range would overlap nothing
+    return DateRange(start_date, max(end_date, start_date + timedelta(days=1)), PERIOD_BOUNDS)
+
+
+def parse_period(start, end):
+    """``?start=&end=`` ISO dates -> a period; ValidationError (400) when missing or invalid."""
+    errors, dates = {}, {}
+    for name, value in (("start", start), ("end", end)):
+        try:
+            dates[name] = date.fromisoformat(value or "")
+        except ValueError:
+            errors[name] = "Expected a date as YYYY-MM-DD."
+    if not errors and dates["end"] < dates["start"]:
+        errors["end"] = "Must not be before start."
+    if errors:
+        raise ValidationError(errors)
+    return tour_period(dates["start"], dates["end"])
+
+
+def busy_guide_user_ids(period):
+    """Users with an accepted assignment overlapping ``period`` (an index search, see module docstring)."""
+    from .models import TourGuideAssignment
+
+    return TourGuideAssignment.objects.filter(status="accepted", period__overlap=period).values("guide_id")
+
+
+def available_guides(queryset, period):
+    """Guides of ``queryset`` free for all of ``period``."""
+    return queryset.exclude(user_id__in=busy_guide_user_ids(period))
+
+
+def sync_assignment_periods(tour):
+    """After a tour's dates change; raises IntegrityError if that double-books a guide."""
+    from .models import TourGuideAssignment
+
+    period = tour_period(tour.start_date, tour.end_date)
+    TourGuideAssignment.objects.filter(tour=tour).exclude(period=period).update(period=period)
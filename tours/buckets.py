@@ -0,0 +1,62 @@
+# tours/buckets.py
+"""
+Buckets of the tourist dashboard (TouristToursView, "my tours").
+
+Every tour the user sees falls in one bucket:
+
+    available   not joined, starts today or later
+    pending     joined, waiting for approval
+    active      approved and not finished
+    past        approved or completed, finished
+
+``participation_buckets`` classifies all of a user's participations with
+one CASE expression. ``bucket_queryset`` turns a bucket into id/sort-key
+rows that a KeysetPagination page can be cut from, so the view can send
+the first page of every bucket as one UNION ALL query and then load just
+those tours once, with the usual prefetches.
+"""
+from django.db.models import Case, CharField, F, Value, When
+
+from .models import Tour, TourParticipant
+
+BUCKETS = ("available", "pending", "active", "past")
+# Buckets that depend on the user's own participations
+PERSONAL_BUCKETS = ("pending", "active", "past")
+# Keyset per bucket: upcoming tours soonest first, past tours latest first
+BUCKET_ORDERING = {
+    "available": ("sort_date", "tour_ref"),
+    "pending": ("sort_date", "tour_ref"),
+    "active": ("sort_date", "tour_ref"),
+    "past": ("-sort_date", "-tour_ref"),
+}
+ROW_FIELDS = ("bucket", "tour_ref", "sort_date")
+
+
+def participation_buckets(user, today):
+    """``user``'s participations annotated with their ``bucket`` (None = not shown)."""
+    return TourParticipant.objects.filter(user=user).annotate(
+        bucket=Case(
+            When(status="pending", then=Value("pending")),
+            When(status="approved", tour__end_date__gte=today, then=Value("active")),
+            When(status__in=("approved", "completed"), tour__end_date__lt=today, then=Value("past")),
+            default=None,
+            output_field=CharField(),
+        )
+    )
+
+
+def bucket_queryset(bucket, user, today):
+    """``ROW_FIELDS`` rows of ``bucket``, unordered; both branches select the same columns."""
+    if bucket == "available":
+        joined = TourParticipant.objects.filter(user=user).values("tour_id")
+        queryset = (
+            Tour.objects.filter(start_date__gte=today).exclude(pk__in=joined)
+            .annotate(bucket=Value(bucket, output_field=CharField()), tour_ref=F("id"), sort_date=F("start_date"))
+        )
+    else:
+        sort_date = F("tour__end_date") if bucket == "past" else F("tour__start_date")
+        queryset = (
+            participation_buckets(user, today).filter(bucket=bucket)
+            .annotate(tour_ref=F("tour_id"), sort_date=sort_date)
+        )
+    return queryset.values(*ROW_FIELDS)
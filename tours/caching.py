@@ -0,0 +1,199 @@
+# tours/caching.py
+"""
+Versioned response cache for the tour catalog.
+
+Cached TourViewSet.list responses are keyed on *audience* (who can see
+which tours) plus the normalized query string, never on the raw JWT:
+
+  - "public": anonymous users, tourists, guides and admins all see the
+    full catalog with identical payloads, so they share one cache
+  - "organizer:<id>": an organizer only sees their own tours
+
+Each audience has a version counter that is part of the key. Writes to
+Tour, Offer, TourParticipant and TourGuideAssignment (see tours.signals)
+bump the public version and the owning organizer's version, which makes
+every stale entry unreachable immediately; old entries just expire.
+
+Cached entries also store the ETag / Last-Modified computed for them
+(queryset_validators), so conditional requests that hit the cache are
+answered with a 304 without any database work.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.http import http_date
+
+TOUR_LIST_CACHE_TTL = 60 * 5  # 5 minutes
+PUBLIC_AUDIENCE = "public"
+
+
+def organizer_audience(organizer_id):
+    return f"organizer:{organizer_id}"
+
+
+def get_audience(request):
+    user = request.user
+    if user.is_authenticated and getattr(user, "role", None) == "organizer":
+        return organizer_audience(user.id)
+    return PUBLIC_AUDIENCE
+
+
+def _version_key(audience):
+    return f"tours:version:{audience}"
+
+
+def get_version(audience):
+    key = _version_key(audience)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_versions(*audiences):
+    for audience in audiences:
+        key = _version_key(audience)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read yet: any value differs from what no entry was built with
+            cache.set(key, 2, timeout=None)
+
+
+def bump_tour_versions(organizer_id):
+    """Invalidate every cached catalog view that may contain this organizer's tours."""
+    audiences = [PUBLIC_AUDIENCE]
+    if organizer_id is not None:
+        audiences.append(organizer_audience(organizer_id))
+    bump_versions(*audiences)
+
+
+def normalize_query_params(query_params, ignore=()):
+    """Stable representation of the query string (ordering and blanks ignored)."""
+    items = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        for value in values
+        if value != "" and key not in ignore
+    )
+    return urlencode(items)
+
+
+def _versioned_key(prefix, request, ignore=()):
+    audience = get_audience(request)
+    params = normalize_query_params(request.query_params, ignore)
+    digest = hashlib.md5(params.encode("utf-8")).hexdigest()
+    return f"tours:{prefix}:{audience}:v{get_version(audience)}:{digest}"
+
+
+def tour_list_cache_key(request):
+    return _versioned_key("list", request)
+
+
+# Params that page or shape the catalog without changing which tours match
+NON_FILTER_PARAMS = frozenset({
+    "page", "page_size", "pagination", "cursor", "count", "fields", "omit", "expand", "format",
+})
+
+
+def tour_facets_cache_key(request):
+    """Facets depend on the filter set only, so paging/shaping params share an entry."""
+    return _versioned_key("facets", request, ignore=NON_FILTER_PARAMS)
+
+
+# -------------------------
+# Conditional GET validators
+# -------------------------
+def queryset_validators(queryset, request):
+    """
+    Strong ETag and Last-Modified (epoch seconds) for a response rendered
+    from ``queryset``: one aggregate over Tour.updated_at, which tours.signals
+    bumps on every write to a tour or its dependent rows. The row count
+    catches deletions; audience and query params catch differing payloads.
+    """
+    state = queryset.order_by().aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+    last_modified = state["last_modified"]
+    fingerprint = "|".join([
+        get_audience(request),
+        request.path,
+        normalize_query_params(request.query_params),
+        str(state["count"]),
+        last_modified.isoformat() if last_modified else "",
+    ])
+    etag = '"%s"' % hashlib.md5(fingerprint.encode("utf-8")).hexdigest()
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+# -------------------------
+# "My tours" snapshots (TouristToursView)
+# -------------------------
+# The personal buckets of the tourist dashboard are cached per user. The
+# key carries the user's version, which tours.signals bumps when one of
+# their participations changes; the entry records the version of every
+# tour the user joined, bumped when that tour or its dependent rows
+# change. An edit therefore only invalidates the snapshots of its tour's
+# participants. The "available" bucket comes from one shared entry per
+# catalog version holding the next upcoming tours; each user only filters
+# out the ones they joined.
+MY_TOURS_CACHE_TTL = 60 * 10  # 10 minutes
+AVAILABLE_TOURS_CACHED = 50  # upcoming tours kept in the shared entry
+
+
+def user_audience(user_id):
+    return f"user:{user_id}"
+
+
+def tour_audience(tour_id):
+    return f"tour:{tour_id}"
+
+
+def get_tour_versions(tour_ids):
+    """``{tour id: version}`` in one round trip (missing versions start at 1)."""
+    keys = {tour_id: _version_key(tour_audience(tour_id)) for tour_id in tour_ids}
+    found = cache.get_many(list(keys.values()))
+    return {
+        tour_id: found[key] if key in found else get_version(tour_audience(tour_id))
+        for tour_id, key in keys.items()
+    }
+
+
+def my_tours_snapshot_key(user_id, query_params, today):
+    # Buckets move with the date (active -> past), so the day is part of the key
+    digest = hashlib.md5(normalize_query_params(query_params).encode("utf-8")).hexdigest()
+    version = get_version(user_audience(user_id))
+    return f"tours:my:{user_id}:v{version}:{today.isoformat()}:{digest}"
+
+
+def get_my_tours_snapshot(key):
+    """The cached snapshot, or None if missing or any of its tours changed since."""
+    snapshot = cache.get(key)
+    if snapshot is None:
+        return None
+    built_with = snapshot["tour_versions"]
+    current = cache.get_many([_version_key(tour_audience(tour_id)) for tour_id in built_with])
+    for tour_id, version in built_with.items():
+        if current.get(_version_key(tour_audience(tour_id))) != version:
+            return None
+    return snapshot
+
+
+def set_my_tours_snapshot(key, snapshot, tour_versions):
+    """
+    ``tour_versions`` must be read before the snapshot's tours were loaded,
+    so a concurrent edit leaves the entry behind its tour's version.
+    """
+    cache.set(key, {**snapshot, "tour_versions": tour_versions}, MY_TOURS_CACHE_TTL)
+
+
+def available_tours_cache_key(today):
+    return f"tours:my:available:v{get_version(PUBLIC_AUDIENCE)}:{today.isoformat()}"
@@ -0,0 +1,110 @@
+# tours/cards.py
+"""
+Precomputed "tour cards": each tour's TourListSerializer JSON, rendered once
+and kept in the cache as bytes.
+
+TourViewSet.list fetches the page's ids, reads the cards with one
+``get_many`` (MGET on django-redis) and stitches the bytes into the
+response without running the serializer. Cards that are missing are
+rebuilt in place with one batched query; ``tours.tasks.rebuild_tour_cards``
+warms them in bulk.
+
+Keys include ``Tour.updated_at``, which every write to a tour or its
+offers, participants, guide assignments and ratings bumps (tours.signals),
+so a card built from a pre-commit snapshot can never be served for the
+newer row. For changes that do not go through those models call
+``invalidate_tour_cards()``, as tours.signals does for guide profiles and
+for the user emails / usernames the cards embed.
+"""
+import json
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from tour_management.renderers import FastJSONRenderer
+
+from .caching import bump_tour_versions
+from .models import Tour
+from .querysets import with_tour_prefetches
+from .serializers import TourListSerializer
+
+CARD_CACHE_TTL = 60 * 60 * 24  # 24 hours; cards are replaced, not expired, on writes
+CARD_VERSION = 3  # bump when TourListSerializer's output changes
+CARD_FIELDS = ("id", "start_date", "updated_at")  # what the list needs before the cards
+
+
+def card_key(tour_id, updated_at):
+    return f"tours:card:v{CARD_VERSION}:{tour_id}:{updated_at.timestamp():.6f}"
+
+
+def build_cards(tour_ids):
+    """Render and cache the cards for ``tour_ids``; returns ``{id: bytes}``."""
+    renderer = FastJSONRenderer()
+    tours = with_tour_prefetches(Tour.objects.filter(pk__in=tour_ids), participants=False)
+    cards, entries = {}, {}
+    for tour in tours:
+        cards[tour.pk] = renderer.render(TourListSerializer(tour).data)
+        entries[card_key(tour.pk, tour.updated_at)] = cards[tour.pk]
+    cache.set_many(entries, CARD_CACHE_TTL)
+    return cards
+
+
+def get_cards(tours):
+    """
+    Card bytes for ``tours`` (instances with CARD_FIELDS loaded), in order.
+    Tours deleted since the page was read are skipped.
+    """
+    keys = {tour.pk: card_key(tour.pk, tour.updated_at) for tour in tours}
+    cached = cache.get_many(list(keys.values()))
+    cards = {pk: cached[key] for pk, key in keys.items() if key in cached}
+    missing = [pk for pk in keys if pk not in cards]
+    if missing:
+        cards.update(build_cards(missing))
+    return [cards[tour.pk] for tour in tours if tour.pk in cards]
+
+
+def stitch_json(envelope, results):
+    """
+    ``envelope`` (a paginated response body without "results", or None for
+    an unpaginated list) + pre-rendered ``results`` items -> JSON bytes.
+    """
+    body = b"[" + b",".join(results) + b"]"
+    if envelope is None:
+        return body
+    head = FastJSONRenderer().render(envelope)
+    separator = b"," if envelope else b""
+    return head[:-1] + separator + b'"results":' + body + b"}"
+
+
+class PreRenderedJSONResponse(Response):
+    """
+    Response whose JSON body is already rendered (stitched from cards).
+    ``data`` is decoded on demand for callers that inspect it.
+    """
+
+    def __init__(self, body, **kwargs):
+        self.body = body
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        return json.loads(self.body)
+
+    @data.setter
+    def data(self, value):
+        pass  # Response.__init__ assigns None
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = "application/json"
+        return self.body
+
+
+def invalidate_tour_cards(tour_ids):
+    """Retire the cards (and cached catalog pages) of ``tour_ids``."""
+    tours = Tour.objects.filter(pk__in=tour_ids)
+    organizer_ids = set(tours.values_list("organizer_id", flat=True))
+    tours.update(updated_at=timezone.now())
+    transaction.on_commit(lambda: [bump_tour_versions(organizer_id) for organizer_id in organizer_ids])
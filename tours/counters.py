@@ -0,0 +1,98 @@
+# tours/counters.py
+"""
+Denormalized participant / rating counters on Tour.
+
+The columns in COUNTER_FIELDS are kept in step by tours.signals with
+single-statement ``F()`` updates, so concurrent joins and approvals never
+lose increments. Tour.save() never writes them from an instance, and
+``recount_tour_counters`` rebuilds them from the source tables whenever
+they drift (bulk ``QuerySet.update()`` calls bypass the signals).
+"""
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+# TourParticipant.status -> Tour counter column
+STATUS_COUNTERS = {
+    "approved": "approved_count",
+    "pending": "pending_count",
+    "rejected": "rejected_count",
+    "completed": "completed_count",
+}
+COUNTER_FIELDS = (
+    *STATUS_COUNTERS.values(), "seats_remaining", "rating_count", "rating_sum",
+    "trending_score",  # same update path, see tours/trending.py
+)
+# Participants in these states hold one of the tour's seats (see tours/seats.py)
+HOLDING_STATUSES = ("pending", "approved")
+
+
+def seats_remaining_expression(approved=F("approved_count"), pending=F("pending_count")):
+    """Seats left after the held ones; NULL when max_participants is 0 (no cap)."""
+    return Case(
+        When(max_participants=0, then=Value(None)),
+        default=Greatest(F("max_participants") - approved - pending, Value(0)),
+        output_field=IntegerField(),
+    )
+
+
+def participant_counter_updates(old_status=None, new_status=None):
+    """
+    ``QuerySet.update()`` kwargs moving one participant from ``old_status``
+    to ``new_status`` (None for a create/delete). Empty when nothing counts.
+    """
+    deltas = {}
+    if old_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[old_status]] = -1
+    if new_status in STATUS_COUNTERS:
+        column = STATUS_COUNTERS[new_status]
+        deltas[column] = deltas.get(column, 0) + 1
+
+    updates = {column: F(column) + delta for column, delta in deltas.items() if delta}
+    if "approved_count" in updates or "pending_count" in updates:
+        # Same statement: reference the new counts, not the old column values
+        updates["seats_remaining"] = seats_remaining_expression(
+            updates.get("approved_count", F("approved_count")),
+            updates.get("pending_count", F("pending_count")),
+        )
+    return updates
+
+
+def rating_counter_updates(count_delta, sum_delta):
+    return {
+        "rating_count": F("rating_count") + count_delta,
+        "rating_sum": F("rating_sum") + sum_delta,
+    }
+
+
+def _subquery_aggregate(queryset, aggregate):
+    return Coalesce(
+        Subquery(
+            queryset.filter(tour=OuterRef("pk")).order_by()
+            .values("tour").annotate(value=aggregate).values("value")
+        ),
+        Value(0),
+    )
+
+
+def recount_updates(participant_model, rating_model):
+    """
+    ``QuerySet.update()`` kwargs recomputing every counter from the source
+    tables (seats_remaining needs a second pass, see recount_tour_counters).
+    """
+    updates = {
+        column: _subquery_aggregate(participant_model.objects.filter(status=status), Count("id"))
+        for status, column in STATUS_COUNTERS.items()
+    }
+    updates["rating_count"] = _subquery_aggregate(rating_model.objects.all(), Count("id"))
+    updates["rating_sum"] = _subquery_aggregate(rating_model.objects.all(), Sum("rating"))
+    return updates
+
+
+def recount_tour_counters(queryset, participant_model=None, rating_model=None):
+    """Repair the counters of every tour in ``queryset``; returns the row count."""
+    if participant_model is None or rating_model is None:
+        from .models import TourParticipant, TourRating
+        participant_model, rating_model = TourParticipant, TourRating
+    updated = queryset.update(**recount_updates(participant_model, rating_model))
+    queryset.update(seats_remaining=seats_remaining_expression())
+    return updated
@@ -0,0 +1,77 @@
+# tours/facets.py
+"""
+Facet counts for the tour catalog sidebar.
+
+All four facets (category, start_location, month of start_date and price
+band of cost_per_person) come from one ``GROUP BY GROUPING SETS`` query
+over the already-filtered catalog queryset, so the counts always reflect
+the current filter set. TourViewSet.facets caches the result per audience
+and normalized filter signature (tours/caching.py).
+"""
+from django.db import connections
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import TruncMonth
+
+FACET_LIMIT = 50  # values returned per facet, most frequent first
+# (label, lower bound inclusive, upper bound exclusive) of cost_per_person
+PRICE_BANDS = (
+    ("0-50", 0, 50),
+    ("50-100", 50, 100),
+    ("100-250", 100, 250),
+    ("250-500", 250, 500),
+    ("500+", 500, None),
+)
+FACET_COLUMNS = ("category", "start_location", "month", "price_band")
+
+
+def price_band_expression():
+    whens = [
+        When(cost_per_person__lt=upper, then=Value(label))
+        for label, _, upper in PRICE_BANDS if upper is not None
+    ]
+    return Case(*whens, default=Value(PRICE_BANDS[-1][0]), output_field=CharField())
+
+
+def tour_facets(queryset):
+    """``{"total": n, "category": [{"value", "count"}], ...}`` for ``queryset``."""
+    filtered = (
+        queryset.order_by().prefetch_related(None)
+        .annotate(month=TruncMonth("start_date"), price_band=price_band_expression())
+        .values(*FACET_COLUMNS)
+    )
+    inner_sql, params = filtered.query.sql_with_params()
+    columns = ", ".join(FACET_COLUMNS)
+    sql = (
+        f"SELECT {', '.join(f'GROUPING({c})' for c in FACET_COLUMNS)}, {columns}, COUNT(*) "
+        f"FROM ({inner_sql}) AS filtered "
+        f"GROUP BY GROUPING SETS ({', '.join(f'({c})' for c in FACET_COLUMNS)}, ())"
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    width = len(FACET_COLUMNS)
+    facets = {column: [] for column in FACET_COLUMNS}
+    total = 0
+    for row in rows:
+        grouping, values, count = row[:width], row[width:2 * width], row[-1]
+        grouped = [column for column, flag in zip(FACET_COLUMNS, grouping) if not flag]
+        if not grouped:
+            total = count
+            continue
+        column = grouped[0]
+        value = values[FACET_COLUMNS.index(column)]
+        if column == "month" and value is not None:
+            value = value.strftime("%Y-%m")
+        facets[column].append({"value": value, "count": count})
+
+    for column, buckets in facets.items():
+        if column == "price_band":
+            order = [label for label, _, _ in PRICE_BANDS]
+            buckets.sort(key=lambda bucket: order.index(bucket["value"]))
+        elif column == "month":
+            buckets.sort(key=lambda bucket: bucket["value"] or "")
+        else:
+            buckets.sort(key=lambda bucket: (-bucket["count"], bucket["value"] or ""))
+            del buckets[FACET_LIMIT:]
+    return {"total": total, **facets}
@@ -0,0 +1,104 @@
+# tours/geo.py
+"""
+"Tours near me" without PostGIS.
+
+Start/end points are stored as plain latitude/longitude columns. A proximity
+query first narrows the catalog to the radius' bounding box, which the
+(start_latitude, start_longitude) btree index answers as a range scan, and
+only computes the exact haversine distance for the rows inside the box:
+
+    ?near=23.81,90.41&radius_km=25   -> tours starting within 25 km, nearest first
+"""
+import math
+import re
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+from rest_framework.exceptions import ValidationError
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 50.0
+MAX_RADIUS_KM = 2000.0
+
+# "Dhaka (23.8103,90.4125)" -> 23.8103, 90.4125 (what seed_data writes)
+COORDINATES_RE = re.compile(r"\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\)")
+
+
+def _valid(lat, lng):
+    return -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def parse_coordinates(text):
+    """``(lat, lng)`` embedded in a location string, or None."""
+    match = COORDINATES_RE.search(text or "")
+    if not match:
+        return None
+    lat, lng = float(match.group(1)), float(match.group(2))
+    return (lat, lng) if _valid(lat, lng) else None
+
+
+def parse_near(value):
+    """``"lat,lng"`` -> ``(lat, lng)``; 400 on anything else."""
+    try:
+        lat, lng = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValidationError({"near": "Expected 'lat,lng'."})
+    if not _valid(lat, lng):
+        raise ValidationError({"near": "Latitude must be within ±90 and longitude within ±180."})
+    return lat, lng
+
+
+def parse_radius(value):
+    if value in (None, ""):
+        return DEFAULT_RADIUS_KM
+    try:
+        radius = float(value)
+    except ValueError:
+        raise ValidationError({"radius_km": "Expected a number of kilometres."})
+    if not 0 < radius <= MAX_RADIUS_KM:
+        raise ValidationError({"radius_km": f"Must be between 0 and {MAX_RADIUS_KM:g}."})
+    return radius
+
+
+def bounding_box_filter(lat, lng, radius_km, lat_field="start_latitude", lng_field="start_longitude"):
+    """Index-friendly pre-filter: every point within ``radius_km`` lies inside it."""
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    condition = Q(**{f"{lat_field}__gte": lat - delta_lat, f"{lat_field}__lte": lat + delta_lat})
+
+    cos_lat = math.cos(math.radians(lat))
+    if abs(lat) + delta_lat >= 90 or cos_lat <= 0:
+        return condition  # the box contains a pole: every longitude qualifies
+    delta_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    if delta_lng >= 180:
+        return condition
+
+    low, high = lng - delta_lng, lng + delta_lng
+    if low < -180:  # wraps across the antimeridian
+        lng_condition = Q(**{f"{lng_field}__gte": low + 360}) | Q(**{f"{lng_field}__lte": high})
+    elif high > 180:
+        lng_condition = Q(**{f"{lng_field}__gte": low}) | Q(**{f"{lng_field}__lte": high - 360})
+    else:
+        lng_condition = Q(**{f"{lng_field}__gte": low, f"{lng_field}__lte": high})
+    return condition & lng_condition
+
+
+def distance_expression(lat, lng, lat_field="start_latitude", lng_field="start_longitude"):
+    """Great-circle (haversine) distance in km from ``(lat, lng)``."""
+    half_dlat = Radians(F(lat_field) - Value(lat)) / 2
+    half_dlng = Radians(F(lng_field) - Value(lng)) / 2
+    a = (
+        Power(Sin(half_dlat), 2)
+        + Value(math.cos(math.radians(lat))) * Cos(Radians(F(lat_field))) * Power(Sin(half_dlng), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, Value(1.0))), output_field=FloatField())
+
+
+def near(queryset, lat, lng, radius_km):
+    """Tours starting within ``radius_km`` of ``(lat, lng)``, nearest first (``distance_km``)."""
+    return (
+        queryset
+        .filter(bounding_box_filter(lat, lng, radius_km))
+        .annotate(distance_km=distance_expression(lat, lng))
+        .filter(distance_km__lte=radius_km)
+        .order_by("distance_km", "id")
+    )
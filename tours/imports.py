@@ -0,0 +1,116 @@
+# tours/imports.py
+"""
+Bulk tour import from CSV or NDJSON uploads.
+
+Rows are parsed lazily from the file and handled ``chunk_size`` at a time:
+each chunk is validated with TourImportSerializer and its valid rows are
+written with ``bulk_create`` (``batch_size`` rows per INSERT) inside one
+transaction. Memory is bounded by the chunk size whatever the file length,
+and a bad row only costs its own entry in the error report.
+
+``bulk_create`` skips Tour.save() and the post_save signals, so each chunk
+does their work itself: seats_remaining, coordinates parsed from the
+location strings, search vectors, the catalog cache versions and the
+dashboard rollups (one ``tours`` delta per hour bucket, after commit).
+"""
+import codecs
+import csv
+import json
+import os
+from collections import Counter
+from itertools import islice
+
+from django.db import transaction
+
+from analytics.rollups import bucket_starts, record
+from .caching import bump_tour_versions
+from .models import Tour
+from .search import update_search_vectors
+from .serializers import TourImportSerializer
+
+CHUNK_SIZE = 1000  # rows validated and committed together
+BATCH_SIZE = 500  # rows per INSERT statement
+MAX_REPORTED_ERRORS = 1000  # further failures are only counted
+FORMAT_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename, requested=None):
+    """``requested`` if given, else the format implied by the file extension (or None)."""
+    if requested:
+        return requested if requested in FORMATS else None
+    return FORMAT_EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+
+def iter_csv_rows(stream):
+    """``(row number, dict)`` for each data row of a UTF-8 CSV file with a header."""
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    for number, row in enumerate(reader, start=1):
+        # Blank cells fall back to the model defaults
+        yield number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def iter_ndjson_rows(stream):
+    """``(line number, dict or error message)`` for each non-blank line."""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        yield number, row if isinstance(row, dict) else "Expected a JSON object."
+
+
+def iter_rows(stream, fmt):
+    return iter_csv_rows(stream) if fmt == "csv" else iter_ndjson_rows(stream)
+
+
+def _record_error(report, number, errors):
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"row": number, "errors": errors})
+
+
+def import_chunk(rows, organizer, report, batch_size=BATCH_SIZE):
+    """Validate ``rows`` and insert the valid ones in one transaction."""
+    tours = []
+    for number, row in rows:
+        if isinstance(row, str):
+            _record_error(report, number, {"non_field_errors": [row]})
+            continue
+        serializer = TourImportSerializer(data=row)
+        if not serializer.is_valid():
+            _record_error(report, number, serializer.errors)
+            continue
+        tour = Tour(organizer=organizer, **serializer.validated_data)
+        tour.seats_remaining = tour.max_participants or None
+        tour.fill_coordinates()
+        tours.append(tour)
+
+    if not tours:
+        return
+    with transaction.atomic():
+        created = Tour.objects.bulk_create(tours, batch_size=batch_size)
+        update_search_vectors(Tour.objects.filter(pk__in=[tour.pk for tour in created]))
+        transaction.on_commit(lambda: bump_tour_versions(organizer.pk))
+        per_hour = Counter(bucket_starts(tour.created_at)["hour"] for tour in created)
+        record({hour: {"tours": count} for hour, count in per_hour.items()}, organizer.pk)
+    report["created"] += len(created)
+
+
+def import_tours(stream, fmt, organizer, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE):
+    """
+    Import every row of ``stream`` (a binary file) as a tour of ``organizer``.
+    Returns ``{"created", "failed", "errors": [{"row", "errors"}], "errors_truncated"}``.
+    """
+    report = {"created": 0, "failed": 0, "errors": []}
+    rows = iter_rows(stream, fmt)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, organizer, report, batch_size=batch_size)
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    return report
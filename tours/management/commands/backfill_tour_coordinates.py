@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from tours.geo import parse_coordinates
+from tours.models import Tour
+
+COORDINATE_FIELDS = ("start_latitude", "start_longitude", "end_latitude", "end_longitude")
+
+
+class Command(BaseCommand):
+    help = "Fill missing tour start/end coordinates from 'Name (lat,lng)' location strings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of tours written per bulk UPDATE (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pending = (
+            Tour.objects.filter(Q(start_latitude__isnull=True) | Q(end_latitude__isnull=True))
+            .order_by("id")
+            .only("id", "start_location", "end_location", *COORDINATE_FIELDS)
+        )
+        total = pending.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tours without coordinates."))
+            return
+
+        updated, batch = 0, []
+        for tour in pending.iterator(chunk_size=batch_size):
+            changed = False
+            for prefix in ("start", "end"):
+                if getattr(tour, f"{prefix}_latitude") is not None:
+                    continue
+                coordinates = parse_coordinates(getattr(tour, f"{prefix}_location"))
+                if coordinates:
+                    setattr(tour, f"{prefix}_latitude", coordinates[0])
+                    setattr(tour, f"{prefix}_longitude", coordinates[1])
+                    changed = True
+            if changed:
+                batch.append(tour)
+            if len(batch) >= batch_size:
+                updated += Tour.objects.bulk_update(batch, COORDINATE_FIELDS)
+                batch = []
+                self.stdout.write(f"Backfilled {updated} tours...")
+        if batch:
+            updated += Tour.objects.bulk_update(batch, COORDINATE_FIELDS)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Coordinates backfilled for {updated} of {total} tours; "
+            f"{total - updated} have no parseable location."
+        ))
@@ -0,0 +1,113 @@
+import datetime
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from tour_management.renderers import FastJSONRenderer, orjson
+
+
+def _participant(i):
+    return {
+        "id": i,
+        "email": f"tourist{i}@example.com",
+        "role": "tourist",
+        "joined_at": "2030-01-01T10:15:30.123456Z",
+        "is_active": True,
+        "status": "approved" if i % 3 else "pending",
+    }
+
+
+def _tour(i, participants):
+    """Shape of TourSerializer output (strings/ints/bools, nested lists)."""
+    return {
+        "id": i,
+        "organizer": f"organizer{i % 7}@example.com",
+        "title": f"Sundarbans mangrove expedition #{i} — বাংলাদেশ",
+        "description": "Three days on the river with local guides. " * 4,
+        "start_date": "2030-01-01",
+        "end_date": "2030-01-04",
+        "organizer_email": f"organizer{i % 7}@example.com",
+        "start_location": "Khulna",
+        "end_location": "Mongla",
+        "is_custom_group": False,
+        "max_participants": 20,
+        "cost_per_person": "149.99",
+        "cover_image": f"https://res.cloudinary.com/demo/image/upload/tour{i}.jpg",
+        "category": "Adventure",
+        "guides": [{
+            "id": 1, "user_email": "guide@example.com", "user_name": "guide",
+            "bio": "Licensed river guide", "contact_number": "01700000000", "profile_picture": None,
+        }],
+        "participants": [_participant(p) for p in range(participants)],
+        "offers": [{
+            "id": 1, "title": "Early bird", "description": "", "discount_percent": 10,
+            "valid_from": "2029-10-01", "valid_until": "2029-12-01",
+        }],
+        "status": None,
+    }
+
+
+def _booking(i):
+    """BookingSerializer output: booking -> tour -> participants -> payments."""
+    return {
+        "id": i,
+        "tour": _tour(i, participants=10),
+        "participant_user": _participant(i),
+        "payments": [{
+            "id": p, "booking": i, "amount": "50.00", "method": "cash", "status": "success",
+            "created_at": "2030-01-01T10:15:30.123456Z",
+        } for p in range(3)],
+        "amount": "149.99",
+        "amount_paid": "149.99",
+        "payment_status": "paid",
+        "created_at": "2030-01-01T10:15:30.123456Z",
+        "participant": i,
+    }
+
+
+def _raw_rows(count):
+    """values()-style rows with native date/datetime/Decimal (dashboard-like)."""
+    now = datetime.datetime(2030, 1, 1, 10, 15, 30, 123456, tzinfo=datetime.timezone.utc)
+    return [
+        {"id": i, "title": f"Tour {i}", "start_date": datetime.date(2030, 1, 1),
+         "last_login": now, "cost": Decimal("149.99")}
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's JSONRenderer with FastJSONRenderer on representative payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tours", type=int, default=50, help="Tours/bookings per payload (default: 50)")
+        parser.add_argument("--number", type=int, default=50, help="Renders per timing run (default: 50)")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; FastJSONRenderer falls back to stdlib."))
+
+        count = options["tours"]
+        payloads = {
+            "tour list": {"count": count, "next": None, "previous": None,
+                          "results": [_tour(i, participants=20) for i in range(count)]},
+            "my-tours (4 buckets)": {bucket: [_tour(i, participants=20) for i in range(count // 4 or 1)]
+                                     for bucket in ("available_tours", "pending_tours", "active_tours", "past_tours")},
+            "bookings": [_booking(i) for i in range(count)],
+            "raw values rows": _raw_rows(count * 10),
+        }
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(f"{'payload':<22}{'bytes':>10}{'stdlib ms':>12}{'fast ms':>10}{'speedup':>9}  identical")
+        for name, data in payloads.items():
+            expected = stdlib.render(data)
+            identical = fast.render(data) == expected
+            timings = []
+            for renderer in (stdlib, fast):
+                best = min(timeit.repeat(lambda: renderer.render(data), number=options["number"], repeat=3))
+                timings.append(best / options["number"] * 1000)
+            self.stdout.write(
+                f"{name:<22}{len(expected):>10}{timings[0]:>12.3f}{timings[1]:>10.3f}"
+                f"{timings[0] / timings[1]:>8.1f}x  {'yes' if identical else 'NO'}"
+            )
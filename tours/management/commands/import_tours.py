@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from tours.imports import BATCH_SIZE, CHUNK_SIZE, FORMATS, detect_format, import_tours
+
+
+class Command(BaseCommand):
+    help = "Bulk-import tours for an organizer from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header) or NDJSON file")
+        parser.add_argument("--organizer", required=True, help="Email of the organizer who owns the tours")
+        parser.add_argument("--format", dest="import_format", choices=FORMATS,
+                            help="File format (default: from the file extension)")
+        parser.add_argument(
+            "--chunk-size", type=int, default=CHUNK_SIZE,
+            help=f"Rows validated and committed per transaction (default: {CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help=f"Rows per INSERT statement (default: {BATCH_SIZE})",
+        )
+        parser.add_argument("--report", help="Write the per-row error report to this JSON file")
+
+    def handle(self, *args, **options):
+        try:
+            organizer = User.objects.get(email=options["organizer"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['organizer']}.")
+        fmt = detect_format(options["path"], options["import_format"])
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the extension; pass --format.")
+
+        with open(options["path"], "rb") as stream:
+            report = import_tours(
+                stream, fmt, organizer,
+                chunk_size=options["chunk_size"], batch_size=options["batch_size"],
+            )
+
+        if options["report"]:
+            with open(options["report"], "w") as out:
+                json.dump(report, out, indent=2)
+        for entry in report["errors"][:10]:
+            self.stdout.write(self.style.WARNING(f"Row {entry['row']}: {json.dumps(entry['errors'])}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} tours; {report['failed']} rows failed."
+        ))
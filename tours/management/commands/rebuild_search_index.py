@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from tours.models import Tour
+from tours.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search vectors for every tour in the catalog"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of tours updated per UPDATE statement (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        tour_ids = list(Tour.objects.order_by("id").values_list("id", flat=True))
+
+        if not tour_ids:
+            self.stdout.write(self.style.WARNING("No tours to index."))
+            return
+
+        updated = 0
+        for start in range(0, len(tour_ids), batch_size):
+            batch = tour_ids[start:start + batch_size]
+            updated += update_search_vectors(Tour.objects.filter(id__in=batch))
+            self.stdout.write(f"Indexed {updated}/{len(tour_ids)} tours...")
+
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt for {updated} tours."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from tours.recommendations import TOP_K, rebuild_similar_tours
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed similar-tour lists (normally run by celery beat)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k", type=int, default=TOP_K,
+            help=f"Neighbours kept per tour (default: {TOP_K})",
+        )
+
+    def handle(self, *args, **options):
+        stored = rebuild_similar_tours(options["top_k"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {stored} similar-tour entries."))
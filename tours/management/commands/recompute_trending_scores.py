@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tours.trending import recompute_trending_scores
+
+
+class Command(BaseCommand):
+    help = "Rebuild every tour's trending score from participants and ratings (normally run by celery beat)"
+
+    def handle(self, *args, **options):
+        updated = recompute_trending_scores()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed trending scores for {updated} tours."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from tours.counters import recount_tour_counters
+from tours.models import Tour
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized participant and rating counters on every tour"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of tours updated per UPDATE statement (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        tour_ids = list(Tour.objects.order_by("id").values_list("id", flat=True))
+
+        if not tour_ids:
+            self.stdout.write(self.style.WARNING("No tours to recount."))
+            return
+
+        updated = 0
+        for start in range(0, len(tour_ids), batch_size):
+            batch = tour_ids[start:start + batch_size]
+            updated += recount_tour_counters(Tour.objects.filter(id__in=batch))
+            self.stdout.write(f"Recounted {updated}/{len(tour_ids)} tours...")
+
+        self.stdout.write(self.style.SUCCESS(f"Counters rebuilt for {updated} tours."))
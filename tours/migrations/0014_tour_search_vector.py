@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_search_vectors(apps, schema_editor):
+    # A frozen copy of tours.search.search_vector_expression as of this migration
+    Tour = apps.get_model('tours', 'Tour')
+    Offer = apps.get_model('tours', 'Offer')
+    offer_titles = (
+        Offer.objects
+        .filter(tour=OuterRef('pk'))
+        .order_by()
+        .values('tour')
+        .annotate(titles=StringAgg('title', delimiter=' '))
+        .values('titles')
+    )
+    Tour.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('category', 'start_location', 'end_location', weight='B', config='english')
+        + SearchVector(
+            Coalesce(Subquery(offer_titles), Value(''), output_field=TextField()),
+            weight='C',
+            config='english',
+        )
+        + SearchVector('description', weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0013_alter_tourparticipant_requested_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tour',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tour_search_vector_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
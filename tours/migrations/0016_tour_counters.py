@@ -0,0 +1,80 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:18
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+
+def populate_counters(apps, schema_editor):
+    # A frozen copy of tours.counters.recount_tour_counters as of this migration
+    Tour = apps.get_model('tours', 'Tour')
+    TourParticipant = apps.get_model('tours', 'TourParticipant')
+    TourRating = apps.get_model('tours', 'TourRating')
+
+    def per_tour(queryset, aggregate):
+        return Coalesce(
+            Subquery(
+                queryset.filter(tour=OuterRef('pk')).order_by()
+                .values('tour').annotate(value=aggregate).values('value')
+            ),
+            Value(0),
+        )
+
+    updates = {
+        f'{status}_count': per_tour(TourParticipant.objects.filter(status=status), Count('id'))
+        for status in ('approved', 'pending', 'rejected', 'completed')
+    }
+    updates['rating_count'] = per_tour(TourRating.objects.all(), Count('id'))
+    updates['rating_sum'] = per_tour(TourRating.objects.all(), Sum('rating'))
+    Tour.objects.update(**updates)
+    Tour.objects.update(seats_remaining=Case(
+        When(max_participants=0, then=Value(None)),
+        default=Greatest(F('max_participants') - F('approved_count'), Value(0)),
+        output_field=IntegerField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0015_tour_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tour',
+            name='seats_remaining',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
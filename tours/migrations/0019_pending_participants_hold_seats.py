@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+
+
+def recompute_seats_remaining(apps, schema_editor):
+    # Pending participants now hold a seat as well as approved ones
+    Tour = apps.get_model('tours', 'Tour')
+    Tour.objects.update(seats_remaining=Case(
+        When(max_participants=0, then=Value(None)),
+        default=Greatest(F('max_participants') - F('approved_count') - F('pending_count'), Value(0)),
+        output_field=IntegerField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0018_tour_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_seats_remaining, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0019_pending_participants_hold_seats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarTour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tours.tour')),
+                ('tour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='tours.tour')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['tour', 'rank'], name='similar_tour_rank')],
+                'constraints': [models.UniqueConstraint(fields=('tour', 'similar'), name='unique_similar_tour')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+# A frozen copy of tours.trending.RECOMPUTE_SQL with the weights, epoch and
+# tau (a 3-day half-life, in seconds) as of this migration
+POPULATE_TRENDING_SCORES_SQL = """
+WITH events AS (
+    SELECT tour_id, 1.0 AS weight, requested_at AS at FROM tours_tourparticipant
+    UNION ALL
+    SELECT tour_id, 2.0, COALESCE(approved_at, updated_at) FROM tours_tourparticipant
+        WHERE status IN ('approved', 'completed')
+    UNION ALL
+    SELECT tour_id, 1.0 * rating / 5.0, created_at FROM tours_tourrating WHERE rating > 0
+),
+exponents AS (
+    SELECT tour_id, LN(weight) + EXTRACT(EPOCH FROM at - TIMESTAMPTZ '2024-01-01 00:00:00+00') / (259200 / LN(2)) AS x
+    FROM events
+),
+peaks AS (
+    SELECT tour_id, MAX(x) AS peak FROM exponents GROUP BY tour_id
+),
+scores AS (
+    SELECT e.tour_id, p.peak + LN(SUM(EXP(GREATEST(e.x - p.peak, -50)))) AS score
+    FROM exponents e JOIN peaks p ON p.tour_id = e.tour_id
+    GROUP BY e.tour_id, p.peak
+)
+UPDATE tours_tour SET trending_score = COALESCE((SELECT score FROM scores WHERE scores.tour_id = tours_tour.id), 0)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0020_similar_tours'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='tour',
+            index=models.Index(fields=['-trending_score', 'id'], name='tour_trending'),
+        ),
+        migrations.RunSQL(POPULATE_TRENDING_SCORES_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0021_tour_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:14
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_overlapping_assignments(apps, schema_editor):
+    """
+    Refuse to add the exclusion constraint over existing double bookings:
+    which of a guide's overlapping tours they keep is an operator's call,
+    not the migration's. Decline (or reassign) the listed assignments, then
+    migrate again.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT a.guide_id, a.tour_id, b.tour_id
+            FROM tours_tourguideassignment a
+            JOIN tours_tourguideassignment b
+                ON b.guide_id = a.guide_id AND b.id > a.id AND b.period && a.period
+            WHERE a.status = 'accepted' AND b.status = 'accepted'
+            ORDER BY a.guide_id, a.tour_id, b.tour_id
+            """
+        )
+        conflicts = cursor.fetchall()
+    if conflicts:
+        raise RuntimeError(
+            "Guides have accepted assignments to tours with overlapping dates; resolve these before "
+            "adding guide_assignment_no_overlap:\n"
+            + "\n".join(f"  guide {guide_id}: tours {tour_id} and {other_id}" for guide_id, tour_id, other_id in conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0022_tour_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='tourguideassignment',
+            name='period',
+            field=django.contrib.postgres.fields.ranges.DateRangeField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE tours_tourguideassignment a SET period = daterange(t.start_date, GREATEST(t.end_date, t.start_date + 1), '[)')
+            FROM tours_tour t WHERE t.id = a.tour_id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(check_overlapping_assignments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tourguideassignment',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'accepted')), expressions=[('period', '&&'), ('guide', '=')], name='guide_assignment_no_overlap'),
+        ),
+    ]
@@ -1,8 +1,18 @@
 # tours/models.py
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 from django.utils import timezone
 
+from .counters import COUNTER_FIELDS
+from .geo import parse_coordinates
+from .availability import NO_OVERLAP_CONSTRAINT, tour_period
+
 User = settings.AUTH_USER_MODEL
 
 
@@ -33,11 +43,34 @@ class Tour(models.Model):
     end_date = models.DateField()
     start_location = models.CharField(max_length=255)
     end_location = models.CharField(max_length=255)
+    # Structured start/end points for proximity search (tours/geo.py);
+    # filled from "Name (lat,lng)" location strings when not given
+    start_latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    start_longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    end_latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    end_longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
     is_custom_group = models.BooleanField(default=False)
     max_participants = models.PositiveIntegerField(default=0)
     cost_per_person = models.DecimalField(max_digits=10, decimal_places=2)
     cover_image = models.CharField(max_length=200, blank=True)
     category = models.CharField(max_length=50, default="Adventure")
+    # Weighted full-text document, maintained by tours.signals (see tours/search.py)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    # Denormalized counters, maintained by tours.signals (see tours/counters.py)
+    approved_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_count = models.PositiveIntegerField(default=0, editable=False)
+    seats_remaining = models.PositiveIntegerField(null=True, blank=True, editable=False)  # NULL = no cap
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    # Time-decayed popularity in log space, maintained alongside the counters (tours/trending.py)
+    trending_score = models.FloatField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write to the tour or its offers/participants/guides/ratings
+    # (tours.signals); drives ETag / Last-Modified on the catalog endpoints
+    updated_at = models.DateTimeField(auto_now=True)
 
     # Tourists (ManyToMany through model)
     participants = models.ManyToManyField(
@@ -55,9 +88,53 @@ class Tour(models.Model):
         blank=True
     )
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='tour_search_vector_gin'),
+            # Trigram indexes on the fuzzy-matched columns (tours/search.py::FUZZY_FIELDS)
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='tour_title_trgm'),
+            GinIndex(fields=['start_location'], opclasses=['gin_trgm_ops'], name='tour_start_location_trgm'),
+            GinIndex(fields=['end_location'], opclasses=['gin_trgm_ops'], name='tour_end_location_trgm'),
+            # Case-insensitive exact location filter (start_location__iexact)
+            models.Index(Upper('start_location'), name='tour_start_location_upper'),
+            # Bounding-box range scans for ?near= (tours/geo.py::near)
+            models.Index(fields=['start_latitude', 'start_longitude'], name='tour_start_coords'),
+            # ?ordering=trending (TourViewSet.get_queryset)
+            models.Index(fields=['-trending_score', 'id'], name='tour_trending'),
+        ]
+
     def __str__(self):
         return self.title
 
+    def fill_coordinates(self):
+        """Parse missing start/end coordinates out of the location strings."""
+        loaded = self.__dict__
+        for prefix in ("start", "end"):
+            lat_field, lng_field = f"{prefix}_latitude", f"{prefix}_longitude"
+            if loaded.get(lat_field, 0) is None and loaded.get(lng_field, 0) is None:
+                coordinates = parse_coordinates(loaded.get(f"{prefix}_location"))
+                if coordinates:
+                    setattr(self, lat_field, coordinates[0])
+                    setattr(self, lng_field, coordinates[1])
+
+    def save(self, *args, **kwargs):
+        self.fill_coordinates()
+        if self._state.adding:
+            self.seats_remaining = self.max_participants or None
+        # Counters only change through F() updates; never write them back from
+        # an instance that may have been loaded before a concurrent join.
+        elif kwargs.get("update_fields") is None:
+            skip = set(COUNTER_FIELDS) | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skip
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
 
 class TourParticipant(models.Model):
     STATUS_CHOICES = [
@@ -82,6 +159,7 @@ class TourParticipant(models.Model):
     approved_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -141,9 +219,28 @@ class TourGuideAssignment(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     assigned_at = models.DateTimeField(auto_now_add=True)
     responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # The tour's dates, kept in sync by save() and tours.signals (tours/availability.py)
+    period = DateRangeField(null=True, editable=False)
 
     class Meta:
         unique_together = ('tour', 'guide')  # Prevent duplicate assignments
+        constraints = [
+            # A guide can't accept two tours with overlapping dates; the GiST
+            # index behind it also serves availability lookups
+            ExclusionConstraint(
+                name=NO_OVERLAP_CONSTRAINT,
+                expressions=[('period', RangeOperators.OVERLAPS), ('guide', RangeOperators.EQUAL)],
+                condition=models.Q(status='accepted'),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.period = tour_period(self.tour.start_date, self.tour.end_date)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'period'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.tour.title} - {self.guide.email} ({self.status})"
@@ -156,6 +253,7 @@ class Offer(models.Model):
     discount_percent = models.PositiveIntegerField()
     valid_from = models.DateField()
     valid_until = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.title} ({self.discount_percent}%)"
@@ -183,3 +281,22 @@ class TourRating(models.Model):
 
     def __str__(self):
         return f"{self.rating} stars by {self.user.username} for {self.tour.title}"
+
+
+class SimilarTour(models.Model):
+    """Precomputed top-K neighbours of a tour (tours/recommendations.py)."""
+    tour = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name='similar_entries')
+    similar = models.ForeignKey(Tour, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()  # 1 = most similar
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tour', 'similar'], name='unique_similar_tour'),
+        ]
+        indexes = [
+            models.Index(fields=['tour', 'rank'], name='similar_tour_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.similar_id} similar to {self.tour_id} ({self.score:.3f})"
@@ -0,0 +1,68 @@
+# tours/querysets.py
+"""
+Prefetch bundles matching what TourSerializer reads.
+
+TourSerializer's method fields look for the ``to_attr`` lists below and only
+fall back to a per-tour query when they are missing, so any view that
+serializes a page of tours should build its queryset with
+``with_tour_prefetches`` to keep the page at a constant number of queries.
+Pass ``prefix`` when the tours are reached through a relation
+(e.g. ``"participant__tour__"`` from a Booking).
+"""
+from django.db.models import Prefetch
+
+from .models import TourGuideAssignment, TourParticipant
+
+ACCEPTED_GUIDES_ATTR = "accepted_guide_assignments"
+VIEWER_PARTICIPATIONS_ATTR = "viewer_participations"
+
+
+def accepted_guides_prefetch(prefix=""):
+    return Prefetch(
+        f"{prefix}guide_assignments",
+        queryset=TourGuideAssignment.objects.filter(status="accepted").select_related("guide__guide"),
+        to_attr=ACCEPTED_GUIDES_ATTR,
+    )
+
+
+def participants_prefetch(prefix=""):
+    return Prefetch(
+        f"{prefix}tour_participants",
+        queryset=TourParticipant.objects.select_related("user"),
+    )
+
+
+def viewer_participations_prefetch(user, prefix=""):
+    return Prefetch(
+        f"{prefix}tour_participants",
+        queryset=TourParticipant.objects.filter(user=user).only("id", "tour_id", "status"),
+        to_attr=VIEWER_PARTICIPATIONS_ATTR,
+    )
+
+
+def tour_prefetches(prefix="", user=None, participants=True, fields=None):
+    """
+    Prefetch lookups for serializing tours with TourSerializer. ``fields``
+    limits them to the serializer fields actually requested (None = all).
+    """
+    def wanted(name):
+        return fields is None or name in fields
+
+    lookups = []
+    if wanted("offers"):
+        lookups.append(f"{prefix}offers")
+    if wanted("guides"):
+        lookups.append(accepted_guides_prefetch(prefix))
+    if participants and wanted("participants"):
+        lookups.append(participants_prefetch(prefix))
+    if user is not None and user.is_authenticated and wanted("status"):
+        lookups.append(viewer_participations_prefetch(user, prefix))
+    return lookups
+
+
+def with_tour_prefetches(queryset, user=None, participants=True, fields=None):
+    if fields is None or {"organizer", "organizer_email"} & set(fields):
+        queryset = queryset.select_related("organizer")
+    return queryset.prefetch_related(
+        *tour_prefetches(user=user, participants=participants, fields=fields)
+    )
@@ -0,0 +1,135 @@
+# tours/recommendations.py
+"""
+"Similar tours" and "recommended for you" from co-participation data.
+
+``rebuild_similar_tours`` (run periodically by the ``rebuild_similar_tours``
+Celery task) treats TourParticipant as a sparse tour x user matrix and
+computes, in one set-based statement, the item-item cosine similarity of
+every pair of tours that share a participant:
+
+    cosine(a, b) = shared_users(a, b) / sqrt(users(a) * users(b))
+
+blended with content similarity (same category, same start location) so
+tours nobody has joined yet still get neighbours; only upcoming tours, at
+most TOP_K per tour, are considered as content neighbours. Each tour keeps its
+TOP_K best upcoming neighbours in SimilarTour; the API endpoints only read
+those rows, so a request costs O(K) regardless of catalog or user count.
+"""
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import SimilarTour, Tour, TourParticipant
+
+TOP_K = 20
+# Statuses that count as a user-tour interaction
+INTERACTION_STATUSES = ("pending", "approved", "completed")
+CO_PARTICIPATION_WEIGHT = 0.8
+CATEGORY_WEIGHT = 0.1
+LOCATION_WEIGHT = 0.1
+
+SIMILARITY_SQL = """
+WITH interactions AS (
+    SELECT DISTINCT tour_id, user_id FROM {participant} WHERE status = ANY(%(statuses)s)
+),
+sizes AS (
+    SELECT tour_id, COUNT(*) AS users FROM interactions GROUP BY tour_id
+),
+co AS (
+    SELECT a.tour_id, b.tour_id AS similar_id, COUNT(*) AS shared
+    FROM interactions a JOIN interactions b ON a.user_id = b.user_id AND a.tour_id <> b.tour_id
+    GROUP BY a.tour_id, b.tour_id
+),
+pairs AS (
+    SELECT tour_id, similar_id FROM co
+    UNION
+    -- Content-only neighbours all score the same, so the first TOP_K upcoming ones by id (the final
+    -- tie-break) are the only ones that can be kept; probe tour_start_location_upper for just those
+    SELECT a.id, b.id FROM {tour} a CROSS JOIN LATERAL (
+        SELECT b.id FROM {tour} b
+        WHERE UPPER(b.start_location) = UPPER(a.start_location) AND b.category = a.category
+            AND b.id <> a.id AND b.start_date >= %(today)s
+        ORDER BY b.id
+        LIMIT %(top_k)s
+    ) b
+),
+scored AS (
+    SELECT p.tour_id, p.similar_id,
+        %(co_weight)s * COALESCE(co.shared / SQRT(sa.users * sb.users), 0)
+        + %(category_weight)s * (a.category = b.category)::int
+        + %(location_weight)s * (UPPER(a.start_location) = UPPER(b.start_location))::int AS score
+    FROM pairs p
+    JOIN {tour} a ON a.id = p.tour_id
+    JOIN {tour} b ON b.id = p.similar_id
+    LEFT JOIN co ON co.tour_id = p.tour_id AND co.similar_id = p.similar_id
+    LEFT JOIN sizes sa ON sa.tour_id = p.tour_id
+    LEFT JOIN sizes sb ON sb.tour_id = p.similar_id
+    WHERE b.start_date >= %(today)s
+),
+ranked AS (
+    SELECT tour_id, similar_id, score,
+        ROW_NUMBER() OVER (PARTITION BY tour_id ORDER BY score DESC, similar_id) AS rank
+    FROM scored
+)
+INSERT INTO {similar} (tour_id, similar_id, score, rank)
+SELECT tour_id, similar_id, score, rank FROM ranked WHERE rank <= %(top_k)s
+"""
+
+
+def rebuild_similar_tours(top_k=TOP_K):
+    """Recompute every tour's neighbour list; returns the number of rows stored."""
+    sql = SIMILARITY_SQL.format(
+        participant=TourParticipant._meta.db_table,
+        tour=Tour._meta.db_table,
+        similar=SimilarTour._meta.db_table,
+    )
+    params = {
+        "statuses": list(INTERACTION_STATUSES),
+        "co_weight": CO_PARTICIPATION_WEIGHT,
+        "category_weight": CATEGORY_WEIGHT,
+        "location_weight": LOCATION_WEIGHT,
+        "today": timezone.localdate(),
+        "top_k": top_k,
+    }
+    # Readers keep seeing the previous lists until the new ones commit
+    with transaction.atomic():
+        SimilarTour.objects.all().delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+
+def similar_tour_ids(tour_id, limit=TOP_K):
+    """Ids of ``tour_id``'s precomputed neighbours that are still upcoming, best first."""
+    return list(
+        SimilarTour.objects
+        .filter(tour_id=tour_id, similar__start_date__gte=timezone.localdate())
+        .order_by("rank")
+        .values_list("similar_id", flat=True)[:limit]
+    )
+
+
+def recommended_tour_ids(user, limit=TOP_K):
+    """
+    Upcoming tours similar to the ones ``user`` joined (scores summed across
+    them), excluding those already joined. Users without history get the
+    most-joined upcoming tours.
+    """
+    today = timezone.localdate()
+    joined = TourParticipant.objects.filter(user=user).values("tour_id")
+    ids = list(
+        SimilarTour.objects
+        .filter(tour__in=joined, similar__start_date__gte=today)
+        .exclude(similar__in=joined)
+        .values("similar_id")
+        .annotate(total=Sum("score"))
+        .order_by("-total", "similar_id")
+        .values_list("similar_id", flat=True)[:limit]
+    )
+    if ids:
+        return ids
+    return list(
+        Tour.objects.filter(start_date__gte=today).exclude(pk__in=joined)
+        .order_by("-approved_count", "start_date", "id")
+        .values_list("id", flat=True)[:limit]
+    )
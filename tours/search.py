@@ -0,0 +1,178 @@
+# tours/search.py
+"""
+Full-text search for the tour catalog.
+
+Each Tour keeps a weighted ``search_vector`` (tsvector) document that is
+refreshed whenever the tour or one of its offers changes:
+
+  - A: title
+  - B: category, start_location, end_location
+  - C: offer titles
+  - D: description
+
+``?search=`` on TourViewSet is turned into a prefix tsquery and matched
+against the GIN-indexed vector, then ordered by ``ts_rank``.
+
+With ``?fuzzy=true`` the catalog switches to typo-tolerant matching instead:
+title/start_location/end_location are compared with pg_trgm word similarity
+(``%>``), which is served by the GIN trigram indexes on those columns, and
+results are ordered by similarity. ``%>`` compares against the
+``pg_trgm.word_similarity_threshold`` setting, so fuzzy querysets are
+evaluated inside ``word_similarity_threshold()``, which sets it for one
+transaction only (nothing leaks to later queries on a pooled connection).
+"""
+import re
+from contextlib import contextmanager
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+SEARCH_CONFIG = "english"
+
+# Tour fields that feed the search document; saves touching none of them
+# can skip the refresh.
+SEARCHABLE_FIELDS = {"title", "description", "category", "start_location", "end_location"}
+
+# Columns covered by a gin_trgm_ops index (see Tour.Meta.indexes)
+FUZZY_FIELDS = ("title", "start_location", "end_location")
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.4
+MIN_SIMILARITY_THRESHOLD = 0.1
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_vector_expression(offer_model):
+    """
+    Build the weighted tsvector expression for a Tour queryset, with
+    ``offer_model``'s titles as the C-weight part.
+    """
+    offer_titles = (
+        offer_model.objects
+        .filter(tour=OuterRef("pk"))
+        .order_by()
+        .values("tour")
+        .annotate(titles=StringAgg("title", delimiter=" "))
+        .values("titles")
+    )
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("category", "start_location", "end_location", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(
+            Coalesce(Subquery(offer_titles), Value(""), output_field=TextField()),
+            weight="C",
+            config=SEARCH_CONFIG,
+        )
+        + SearchVector("description", weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """
+    Recompute ``search_vector`` for every tour in ``queryset`` with a single UPDATE.
+    Returns the number of rows updated.
+    """
+    from .models import Offer
+
+    return queryset.order_by().update(search_vector=search_vector_expression(Offer))
+
+
+def build_search_query(text):
+    """
+    Turn free text into a prefix-matching tsquery ("kyo tem" -> kyo:* & tem:*).
+    Returns None when the text has no searchable tokens.
+    """
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    raw = " & ".join(f"{token}:*" for token in tokens)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+# Unique orderings of ranked results, also used as their keyset (?pagination=cursor).
+# The scores are cast from real to double precision so cursor values round-trip exactly.
+SEARCH_ORDERING = ("-search_rank", "-start_date", "id")
+FUZZY_ORDERING = ("-similarity", "-start_date", "id")
+
+
+def search_tours(queryset, text):
+    """
+    Filter ``queryset`` to tours matching ``text`` and order them by relevance.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    return (
+        queryset
+        .filter(search_vector=query)
+        .annotate(search_rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+        .order_by(*SEARCH_ORDERING)
+    )
+
+
+# -------------------------
+# Trigram (fuzzy) matching
+# -------------------------
+def parse_similarity_threshold(value):
+    """
+    Parse the ``similarity`` query param, clamped to
+    [MIN_SIMILARITY_THRESHOLD, 1].
+    """
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_SIMILARITY_THRESHOLD
+    return min(max(threshold, MIN_SIMILARITY_THRESHOLD), 1.0)
+
+
+@contextmanager
+def word_similarity_threshold(threshold, using=DEFAULT_DB_ALIAS):
+    """
+    Run the block in a transaction on ``using`` (the alias the fuzzy queryset
+    reads from) with pg_trgm's word similarity threshold, the one ``%>``
+    filters on, set to ``threshold``.
+    """
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(threshold)])
+        yield
+        # Inside an enclosing transaction the local value would outlive the block
+        with connections[using].cursor() as cursor:
+            cursor.execute("SET LOCAL pg_trgm.word_similarity_threshold TO DEFAULT")
+
+
+def fuzzy_match(queryset, terms):
+    """
+    Typo-tolerant filtering ordered by similarity; evaluate the result inside
+    ``word_similarity_threshold()``.
+
+    ``terms`` is a list of ``(text, fields)`` pairs; every pair must match at
+    least one of its fields. The per-pair best word similarity is summed into
+    a ``similarity`` annotation used for ordering.
+    """
+    terms = [(text, fields) for text, fields in terms if text]
+    if not terms:
+        return queryset
+
+    scores = []
+    for text, fields in terms:
+        match = Q()
+        for field in fields:
+            match |= Q(**{f"{field}__trigram_word_similar": text})
+        queryset = queryset.filter(match)
+
+        similarities = [TrigramWordSimilarity(text, field) for field in fields]
+        scores.append(Greatest(*similarities) if len(similarities) > 1 else similarities[0])
+
+    similarity = scores[0]
+    for score in scores[1:]:
+        similarity = similarity + score
+
+    return (
+        queryset
+        .annotate(similarity=Cast(similarity, FloatField()))
+        .order_by(*FUZZY_ORDERING)
+    )
@@ -0,0 +1,77 @@
+# tours/seats.py
+"""
+Seat allocation for tour joins.
+
+Pending and approved participants each hold one of the tour's
+``max_participants`` seats (0 = no cap); ``Tour.seats_remaining`` is what
+is still free (tours/counters.py). ``claim_seat`` is the gate: a
+conditional UPDATE that only matches the tour row while a seat is free.
+The row lock it takes is held until the transaction commits, and Postgres
+re-checks the condition for every claimer that was waiting on it, so the
+counter updates tours.signals makes in the same transaction can never
+push a tour past its cap.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .counters import HOLDING_STATUSES
+from .models import Tour, TourParticipant
+
+
+class TourSoldOut(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This tour is sold out."
+    default_code = "sold_out"
+
+
+def claim_seat(tour_id):
+    """
+    Lock ``tour_id``'s row if it still has a free seat, or raise TourSoldOut.
+    Call inside ``transaction.atomic()`` before saving the holding participant.
+    """
+    claimed = (
+        Tour.objects.filter(pk=tour_id)
+        .filter(Q(seats_remaining__isnull=True) | Q(seats_remaining__gt=0))
+        .update(updated_at=timezone.now())
+    )
+    if not claimed:
+        raise TourSoldOut()
+
+
+def join_tour(tour, user):
+    """
+    Idempotent join: ``(participant, created)``. A repeated or concurrent
+    join by the same user returns the existing participation.
+    """
+    existing = TourParticipant.objects.filter(tour=tour, user=user).first()
+    if existing is not None:
+        return existing, False
+    try:
+        with transaction.atomic():
+            claim_seat(tour.pk)
+            return TourParticipant.objects.create(tour=tour, user=user, status="pending"), True
+    except (IntegrityError, TourSoldOut):
+        # A concurrent request by the same user may have taken the seat first
+        existing = TourParticipant.objects.filter(tour=tour, user=user).first()
+        if existing is None:
+            raise
+        return existing, False
+
+
+def set_participant_status(participant, new_status):
+    """
+    Move ``participant`` to ``new_status``, claiming a seat when it did not
+    hold one (e.g. approving a rejected request). Returns the saved row.
+    """
+    with transaction.atomic():
+        participant = TourParticipant.objects.select_for_update().get(pk=participant.pk)
+        if new_status in HOLDING_STATUSES and participant.status not in HOLDING_STATUSES:
+            claim_seat(participant.tour_id)
+        if new_status == "approved" and participant.status != "approved":
+            participant.approved_at = timezone.now()
+        participant.status = new_status
+        participant.save()
+    return participant
@@ -1,38 +1,54 @@
 # tours/serializers.py
 from djoser.serializers import UserSerializer
 from rest_framework import serializers
+from tour_management.serializers import DynamicFieldsMixin
 from .models import (
     Guide, Tour, Offer, TourParticipant,
     TourChatMessage, TourRating, TourGuideAssignment, Booking
 )
+from .querysets import ACCEPTED_GUIDES_ATTR, VIEWER_PARTICIPATIONS_ATTR
 
 
 # ------------------------------
 # Basic Serializers
 # ------------------------------
+class StorageURLImageField(serializers.ImageField):
+    """
+    The storage's URL as-is, with or without a request in the context, so
+    pre-rendered tour cards (tours/cards.py) match the live serializer.
+    """
+    def to_representation(self, value):
+        if not value:
+            return None
+        return value.url
+
+
 class GuideSerializer(serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     user_name = serializers.CharField(source='user.username', read_only=True)
+    profile_picture = StorageURLImageField(required=False, allow_null=True)
 
     class Meta:
         model = Guide
         fields = ['id', 'user_email', 'user_name', 'bio', 'contact_number', 'profile_picture']
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Offer
         fields = ['id', 'title', 'description', 'discount_percent', 'valid_from', 'valid_until']
 
 
-class ParticipantSerializer(serializers.ModelSerializer):
+class ParticipantSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
     role = serializers.CharField(source='user.role', read_only=True)
 
     class Meta:
         model = TourParticipant
         fields = ['id', 'email', 'role', 'joined_at', 'is_active', 'status']
-        read_only_fields = ['joined_at', 'approved_at']
+        # Status moves only through the approve/reject actions, which claim
+        # seats (tours/seats.py::set_participant_status)
+        read_only_fields = ['joined_at', 'approved_at', 'status']
 
 
 class MyTourSerializer(serializers.ModelSerializer):
@@ -58,7 +74,8 @@ class MyTourSerializer(serializers.ModelSerializer):
         ]
 
     def get_participants_count(self, obj):
-        return obj.participants.count()
+        # Denormalized counters (tours/counters.py) instead of a COUNT per tour
+        return obj.approved_count + obj.pending_count + obj.rejected_count + obj.completed_count
 
     # def get_guides(self, obj):
     #     # Return a list of assigned guides
@@ -91,7 +108,7 @@ class TourGuideAssignmentSerializer(serializers.ModelSerializer):
 # ------------------------------
 # Tour Serializer (Full Data)
 # ------------------------------
-class TourSerializer(serializers.ModelSerializer):
+class TourSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     organizer_email = serializers.EmailField(source='organizer.email', read_only=True)
     organizer = serializers.StringRelatedField(read_only=True)
     # guides = GuideSerializer(many=True)
@@ -105,32 +122,39 @@ class TourSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'organizer', 'title', 'description', 'start_date', 'end_date',
             'organizer_email',  # for consistent access in frontend
-            'start_location', 'end_location', 'is_custom_group', 'max_participants',
-            'cost_per_person', 'cover_image', 'category',
+            'start_location', 'end_location',
+            'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude',
+            'is_custom_group', 'max_participants', 'cost_per_person', 'cover_image', 'category',
             'guides', 'participants', 'offers', 'status'
         ]
 
     def get_participants(self, obj):
-        # Include all participants for the tour
-        participants = obj.tour_participants.select_related('user').all()
+        # Include all participants for the tour; reuse the view's prefetch when present
+        participants = obj.tour_participants.all()
+        if 'tour_participants' not in getattr(obj, '_prefetched_objects_cache', {}):
+            participants = participants.select_related('user')
         return ParticipantSerializer(participants, many=True).data
 
     def get_status(self, tour):
         user = self.context.get("user")
         if not user:
             return None
-        try:
-            participant = tour.tour_participants.filter(user=user).first()
-            return participant.status if participant else None
-        except TourParticipant.DoesNotExist:
-            return None
+        # Prefer the view's prefetches (tours/querysets.py) over a query per tour
+        participations = getattr(tour, VIEWER_PARTICIPATIONS_ATTR, None)
+        if participations is None and 'tour_participants' in getattr(tour, '_prefetched_objects_cache', {}):
+            participations = [p for p in tour.tour_participants.all() if p.user_id == user.pk]
+        if participations is None:
+            participations = tour.tour_participants.filter(user=user)[:1]
+        participant = next(iter(participations), None)
+        return participant.status if participant else None
 
     def get_guides(self, obj):
         # Only accepted guides show up
-        # Only accepted guides show up
-        assignments = obj.guide_assignments.filter(
-            status="accepted"
-        ).select_related("guide__guide")  # ✅ loads User and its Guide profile in one query
+        assignments = getattr(obj, ACCEPTED_GUIDES_ATTR, None)
+        if assignments is None:
+            assignments = obj.guide_assignments.filter(
+                status="accepted"
+            ).select_related("guide__guide")  # ✅ loads User and its Guide profile in one query
 
         return [
             GuideSerializer(assignment.guide.guide, context=self.context).data
@@ -139,6 +163,38 @@ class TourSerializer(serializers.ModelSerializer):
         ]
 
 
+class TourListSerializer(TourSerializer):
+    """
+    Lean catalog representation: participant counts instead of the roster.
+    The counts are denormalized columns on Tour (see tours/counters.py);
+    the full roster is on the detail endpoint, the `participants` action,
+    or `?expand=participants`.
+    """
+    expandable_fields = {
+        'participants': (ParticipantSerializer, {'many': True, 'source': 'tour_participants'}),
+    }
+    only_dependencies = {'average_rating': ['rating_sum', 'rating_count']}
+    average_rating = serializers.FloatField(read_only=True)
+
+    class Meta(TourSerializer.Meta):
+        fields = [
+            field for field in TourSerializer.Meta.fields if field != 'participants'
+        ] + ['approved_count', 'pending_count', 'seats_remaining', 'rating_count', 'average_rating']
+
+
+class TourImportSerializer(serializers.ModelSerializer):
+    """One row of a bulk tour import (tours/imports.py); organizer is the uploader."""
+
+    class Meta:
+        model = Tour
+        fields = [
+            'title', 'description', 'start_date', 'end_date',
+            'start_location', 'end_location',
+            'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude',
+            'is_custom_group', 'max_participants', 'cost_per_person', 'cover_image', 'category',
+        ]
+
+
 class BookingSerializer(serializers.ModelSerializer):
     tour = TourSerializer(source='participant.tour', read_only=True)
     participant_user = ParticipantSerializer(source='participant', read_only=True)  # nested user info
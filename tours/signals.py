@@ -0,0 +1,230 @@
+# tours/signals.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_tour_versions, bump_versions, tour_audience, user_audience
+from .availability import sync_assignment_periods
+from .cards import invalidate_tour_cards
+from .counters import (
+    participant_counter_updates, rating_counter_updates, seats_remaining_expression,
+)
+from .models import Guide, Offer, Tour, TourGuideAssignment, TourParticipant, TourRating
+from .search import SEARCHABLE_FIELDS, update_search_vectors
+from .trending import APPROVAL_STATUSES, APPROVAL_WEIGHT, JOIN_WEIGHT, RATING_WEIGHT, trending_updates
+
+
+# -------------------------
+# Search index maintenance
+# -------------------------
+@receiver(post_save, sender=Tour)
+def refresh_tour_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors(Tour.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def refresh_offer_tour_search_vector(sender, instance, **kwargs):
+    # Offer titles are part of the tour's search document
+    update_search_vectors(Tour.objects.filter(pk=instance.tour_id))
+
+
+# -------------------------
+# Denormalized counters (tours/counters.py) and trending score (tours/trending.py)
+# -------------------------
+@receiver(post_init, sender=TourParticipant)
+@receiver(post_init, sender=TourRating)
+def remember_counted_state(sender, instance, **kwargs):
+    # What the counters currently reflect for this row, so a later save can
+    # apply the difference
+    instance._counted_tour_id = instance.__dict__.get("tour_id")
+    instance._counted_status = instance.__dict__.get("status")
+    instance._counted_rating = instance.__dict__.get("rating")
+
+
+def _apply_counter_updates(tour_id, updates):
+    if tour_id is not None and updates:
+        Tour.objects.filter(pk=tour_id).update(**updates)
+
+
+def _participant_trending_updates(status, joined=False):
+    # Joins and approvals feed the trending score (tours/trending.py)
+    weight = (JOIN_WEIGHT if joined else 0) + (APPROVAL_WEIGHT if status in APPROVAL_STATUSES else 0)
+    return trending_updates(weight) if weight else {}
+
+
+@receiver(post_save, sender=TourParticipant)
+def update_participant_counters(sender, instance, created, **kwargs):
+    old_tour_id, old_status = instance._counted_tour_id, instance._counted_status
+    if created:
+        updates = participant_counter_updates(new_status=instance.status)
+        updates.update(_participant_trending_updates(instance.status, joined=True))
+        _apply_counter_updates(instance.tour_id, updates)
+    elif old_tour_id is None or old_status is None:
+        pass  # loaded with deferred fields, which a save leaves untouched
+    elif old_tour_id != instance.tour_id:
+        _apply_counter_updates(old_tour_id, participant_counter_updates(old_status=old_status))
+        _apply_counter_updates(instance.tour_id, participant_counter_updates(new_status=instance.status))
+    elif old_status != instance.status:
+        updates = participant_counter_updates(old_status, instance.status)
+        if old_status not in APPROVAL_STATUSES:
+            updates.update(_participant_trending_updates(instance.status))
+        _apply_counter_updates(instance.tour_id, updates)
+    instance._counted_tour_id, instance._counted_status = instance.tour_id, instance.status
+
+
+@receiver(post_delete, sender=TourParticipant)
+def release_participant_counters(sender, instance, **kwargs):
+    _apply_counter_updates(instance.tour_id, participant_counter_updates(old_status=instance._counted_status))
+
+
+@receiver(post_save, sender=TourRating)
+def update_rating_counters(sender, instance, created, **kwargs):
+    old_tour_id, old_rating = instance._counted_tour_id, instance._counted_rating
+    if created:
+        updates = rating_counter_updates(1, instance.rating)
+        if instance.rating:
+            updates.update(trending_updates(RATING_WEIGHT * instance.rating / 5))
+        _apply_counter_updates(instance.tour_id, updates)
+    elif old_tour_id is None or old_rating is None:
+        pass  # loaded with deferred fields, which a save leaves untouched
+    elif old_tour_id != instance.tour_id:
+        _apply_counter_updates(old_tour_id, rating_counter_updates(-1, -old_rating))
+        _apply_counter_updates(instance.tour_id, rating_counter_updates(1, instance.rating))
+    elif old_rating != instance.rating:
+        _apply_counter_updates(instance.tour_id, rating_counter_updates(0, instance.rating - old_rating))
+    instance._counted_tour_id, instance._counted_rating = instance.tour_id, instance.rating
+
+
+@receiver(post_delete, sender=TourRating)
+def release_rating_counters(sender, instance, **kwargs):
+    if instance._counted_rating is not None:
+        _apply_counter_updates(instance.tour_id, rating_counter_updates(-1, -instance._counted_rating))
+
+
+@receiver(post_save, sender=Tour)
+def sync_guide_assignment_periods(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not {"start_date", "end_date"}.intersection(update_fields)):
+        return
+    sync_assignment_periods(instance)
+
+
+@receiver(post_save, sender=Tour)
+def refresh_tour_seats_remaining(sender, instance, created, update_fields=None, **kwargs):
+    # Tour.save() sets seats for new tours; recompute when the cap changes
+    if created or (update_fields is not None and "max_participants" not in update_fields):
+        return
+    Tour.objects.filter(pk=instance.pk).update(seats_remaining=seats_remaining_expression())
+    instance.refresh_from_db(fields=["seats_remaining"])
+
+
+# -------------------------
+# Modification tracking (Tour.updated_at drives ETags and tour card keys)
+# -------------------------
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=TourParticipant)
+@receiver(post_delete, sender=TourParticipant)
+@receiver(post_save, sender=TourGuideAssignment)
+@receiver(post_delete, sender=TourGuideAssignment)
+@receiver(post_save, sender=TourRating)
+@receiver(post_delete, sender=TourRating)
+def touch_tour(sender, instance, **kwargs):
+    Tour.objects.filter(pk=instance.tour_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Guide)
+def invalidate_guide_tour_cards(sender, instance, created, **kwargs):
+    # Guide profiles are embedded in the cards of the tours they lead
+    if created:
+        return
+    tour_ids = list(TourGuideAssignment.objects.filter(
+        guide_id=instance.user_id, status="accepted"
+    ).values_list("tour_id", flat=True))
+    invalidate_tour_cards(tour_ids)
+    _bump_snapshots_after_commit(*(tour_audience(tour_id) for tour_id in tour_ids))
+
+
+# User fields the cards embed: the organizer's email, guides' email and username
+CARD_USER_FIELDS = ("email", "username")
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_card_user_fields(sender, instance, **kwargs):
+    instance._card_user_fields = tuple(instance.__dict__.get(field) for field in CARD_USER_FIELDS)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tour_cards(sender, instance, created, **kwargs):
+    current = tuple(instance.__dict__.get(field) for field in CARD_USER_FIELDS)
+    changed, instance._card_user_fields = current != instance._card_user_fields, current
+    if created or not changed:
+        return
+    tour_ids = set(Tour.objects.filter(organizer_id=instance.pk).values_list("id", flat=True))
+    tour_ids.update(TourGuideAssignment.objects.filter(
+        guide_id=instance.pk, status="accepted"
+    ).values_list("tour_id", flat=True))
+    invalidate_tour_cards(tour_ids)
+    _bump_snapshots_after_commit(*(tour_audience(tour_id) for tour_id in tour_ids))
+
+
+# -------------------------
+# Catalog cache invalidation
+# -------------------------
+def _invalidate_after_commit(organizer_id):
+    # Bump after commit so a concurrent reader can't cache pre-commit data
+    # under the new version.
+    transaction.on_commit(lambda: bump_tour_versions(organizer_id))
+
+
+@receiver(post_save, sender=Tour)
+@receiver(post_delete, sender=Tour)
+def invalidate_tour_cache(sender, instance, **kwargs):
+    _invalidate_after_commit(instance.organizer_id)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=TourParticipant)
+@receiver(post_delete, sender=TourParticipant)
+@receiver(post_save, sender=TourGuideAssignment)
+@receiver(post_delete, sender=TourGuideAssignment)
+def invalidate_tour_related_cache(sender, instance, **kwargs):
+    organizer_id = (
+        Tour.objects.filter(pk=instance.tour_id)
+        .values_list("organizer_id", flat=True)
+        .first()
+    )
+    _invalidate_after_commit(organizer_id)
+
+
+# -------------------------
+# "My tours" snapshot invalidation (tours/caching.py)
+# -------------------------
+def _bump_snapshots_after_commit(*audiences):
+    transaction.on_commit(lambda: bump_versions(*audiences))
+
+
+@receiver(post_save, sender=Tour)
+@receiver(post_delete, sender=Tour)
+def invalidate_tour_snapshots(sender, instance, **kwargs):
+    _bump_snapshots_after_commit(tour_audience(instance.pk))
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=TourGuideAssignment)
+@receiver(post_delete, sender=TourGuideAssignment)
+def invalidate_related_tour_snapshots(sender, instance, **kwargs):
+    _bump_snapshots_after_commit(tour_audience(instance.tour_id))
+
+
+@receiver(post_save, sender=TourParticipant)
+@receiver(post_delete, sender=TourParticipant)
+def invalidate_participant_snapshots(sender, instance, **kwargs):
+    # The user's buckets change, and the roster shown to the tour's other participants
+    _bump_snapshots_after_commit(user_audience(instance.user_id), tour_audience(instance.tour_id))
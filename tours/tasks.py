@@ -4,4 +4,31 @@ from celery import shared_task
 @shared_task
 def test_hello(name):
     print(f"Hello, {name}!")
-    return f"Hello, {name}!"
\ No newline at end of file
+    return f"Hello, {name}!"
+
+@shared_task
+def rebuild_tour_cards(tour_ids=None, batch_size=500):
+    """Warm the tour card cache (tours/cards.py) for ``tour_ids`` or the whole catalog."""
+    from .cards import build_cards
+    from .models import Tour
+
+    if tour_ids is None:
+        tour_ids = list(Tour.objects.order_by("id").values_list("id", flat=True))
+    built = 0
+    for start in range(0, len(tour_ids), batch_size):
+        built += len(build_cards(tour_ids[start:start + batch_size]))
+    return built
+
+@shared_task
+def rebuild_similar_tours(top_k=None):
+    """Refresh the precomputed similar-tour lists (tours/recommendations.py)."""
+    from .recommendations import TOP_K, rebuild_similar_tours as rebuild
+
+    return rebuild(top_k or TOP_K)
+
+@shared_task
+def recompute_trending_scores():
+    """Rebuild every tour's trending_score from its source rows (tours/trending.py)."""
+    from .trending import recompute_trending_scores as recompute
+
+    return recompute()
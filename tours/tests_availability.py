@@ -0,0 +1,114 @@
+# tours/tests_availability.py
+from datetime import date
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.availability import is_double_booking
+from tours.models import Guide, Tour, TourGuideAssignment
+
+
+class GuideAvailabilityTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.busy, self.pending, self.free = [
+            User.objects.create_user(email=f"{name}@example.com", role="guide") for name in ("busy", "pending", "free")
+        ]
+        for user in (self.busy, self.pending, self.free):
+            Guide.objects.create(user=user)
+        self.tour = self._create_tour(date(2030, 1, 1), date(2030, 1, 5))
+        self.assignment = TourGuideAssignment.objects.create(tour=self.tour, guide=self.busy, status="accepted")
+        TourGuideAssignment.objects.create(tour=self.tour, guide=self.pending)
+
+    def _create_tour(self, start_date, end_date):
+        return Tour.objects.create(
+            organizer=self.organizer,
+            title="Srimangal",
+            start_date=start_date,
+            end_date=end_date,
+            start_location="Dhaka",
+            end_location="Srimangal",
+            cost_per_person="80.00",
+        )
+
+    def _available(self, start, end):
+        response = self.client.get(reverse("guide-available"), {"start": start, "end": end})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [guide["user_email"] for guide in response.data]
+
+    def test_available_between_dates(self):
+        self.client.force_authenticate(self.organizer)
+        self.assertEqual(self._available("2030-01-03", "2030-01-04"), ["pending@example.com", "free@example.com"])
+        # Periods are half-open: the last day of a tour is free for the next one
+        self.assertEqual(
+            self._available("2030-01-05", "2030-01-07"),
+            ["busy@example.com", "pending@example.com", "free@example.com"],
+        )
+
+    def test_day_trips_occupy_their_day(self):
+        self.client.force_authenticate(self.organizer)
+        self.assertEqual(self._available("2030-01-03", "2030-01-03"), ["pending@example.com", "free@example.com"])
+        day_trip = self._create_tour(date(2030, 1, 3), date(2030, 1, 3))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TourGuideAssignment.objects.create(tour=day_trip, guide=self.busy, status="accepted")
+
+    def test_available_rejects_bad_dates(self):
+        self.client.force_authenticate(self.organizer)
+        url = reverse("guide-available")
+        for params in ({}, {"start": "2030-01-03"}, {"start": "2030-01-05", "end": "2030-01-01"}, {"start": "x", "end": "y"}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_double_booking_is_rejected_by_the_database(self):
+        overlapping = self._create_tour(date(2030, 1, 4), date(2030, 1, 8))
+        with self.assertRaises(IntegrityError) as caught, transaction.atomic():
+            TourGuideAssignment.objects.create(tour=overlapping, guide=self.busy, status="accepted")
+        self.assertTrue(is_double_booking(caught.exception))
+        # Other integrity errors are not mistaken for a double booking
+        with self.assertRaises(IntegrityError) as caught, transaction.atomic():
+            TourGuideAssignment.objects.create(tour=self.tour, guide=self.busy)
+        self.assertFalse(is_double_booking(caught.exception))
+
+        assignment = TourGuideAssignment.objects.create(tour=overlapping, guide=self.busy)
+        self.client.force_authenticate(self.busy)
+        url = reverse("tour-guide-assignment-respond", args=[assignment.pk])
+        response = self.client.post(url, {"status": "accepted"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, "pending")
+
+    def test_admin_override_cannot_double_book(self):
+        overlapping = self._create_tour(date(2030, 1, 4), date(2030, 1, 8))
+        assignment = TourGuideAssignment.objects.create(tour=overlapping, guide=self.busy)
+        admin = User.objects.create_user(email="admin@example.com", role="admin", is_staff=True)
+        self.client.force_authenticate(admin)
+        url = reverse("tour-guide-assignment-detail", args=[assignment.pk])
+        response = self.client.patch(url, {"status": "accepted"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_tour_date_changes_move_assignment_periods(self):
+        later = self._create_tour(date(2030, 2, 1), date(2030, 2, 3))
+        TourGuideAssignment.objects.create(tour=later, guide=self.busy, status="accepted")
+        self.client.force_authenticate(self.organizer)
+        url = reverse("tour-detail", args=[later.pk])
+
+        response = self.client.patch(url, {"start_date": "2030-01-02", "end_date": "2030-01-03"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, {"start_date": "2030-03-01", "end_date": "2030-03-04"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._available("2030-03-02", "2030-03-03"), ["pending@example.com", "free@example.com"])
+
+    def test_tour_id_filter_lists_free_guides(self):
+        other = self._create_tour(date(2030, 1, 2), date(2030, 1, 3))
+        self.client.force_authenticate(self.organizer)
+        response = self.client.get(reverse("guide-list"), {"tour_id": other.pk})
+        self.assertEqual(
+            sorted(guide["user_email"] for guide in response.data),
+            ["free@example.com", "pending@example.com"],
+        )
@@ -0,0 +1,100 @@
+# tours/tests_buckets.py
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant
+
+
+class TouristToursBucketsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        self.client.force_authenticate(self.tourist)
+        today = timezone.localdate()
+        self.upcoming = today + timedelta(days=30)
+        self.finished = today - timedelta(days=30)
+
+    def _create_tour(self, title, start_date, participation=None):
+        tour = Tour.objects.create(
+            organizer=self.organizer,
+            title=title,
+            start_date=start_date,
+            end_date=start_date + timedelta(days=3),
+            start_location="Dhaka",
+            end_location="Sylhet",
+            cost_per_person="100.00",
+        )
+        if participation:
+            TourParticipant.objects.create(tour=tour, user=self.tourist, status=participation)
+        return tour
+
+    def _get(self, **params):
+        response = self.client.get(reverse("my-tours"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_tours_are_classified_into_buckets(self):
+        self._create_tour("Open", self.upcoming)
+        self._create_tour("Waiting", self.upcoming, "pending")
+        self._create_tour("Going", self.upcoming, "approved")
+        self._create_tour("Done", self.finished, "approved")
+        self._create_tour("Completed", self.finished, "completed")
+        self._create_tour("Rejected", self.upcoming, "rejected")
+        self._create_tour("Missed", self.finished)
+
+        data = self._get()
+        titles = {key: [tour["title"] for tour in data[key]] for key in
+                  ("available_tours", "pending_tours", "active_tours", "past_tours")}
+        self.assertEqual(titles, {
+            "available_tours": ["Open"],
+            "pending_tours": ["Waiting"],
+            "active_tours": ["Going"],
+            "past_tours": ["Completed", "Done"],  # same end date: newest first
+        })
+        self.assertEqual(data["pending_tours"][0]["status"], "pending")
+        self.assertEqual(data["next"], dict.fromkeys(titles))
+
+    def test_each_bucket_pages_with_its_own_cursor(self):
+        for day in range(7):
+            self._create_tour(f"Pending {day}", self.upcoming + timedelta(days=day), "pending")
+            self._create_tour(f"Open {day}", self.upcoming + timedelta(days=day))
+
+        data = self._get(page_size=3)
+        self.assertEqual([tour["title"] for tour in data["pending_tours"]], ["Pending 0", "Pending 1", "Pending 2"])
+        self.assertEqual(len(data["available_tours"]), 3)
+        self.assertIsNone(data["next"]["past_tours"])
+
+        seen, url = [], data["next"]["pending_tours"]
+        while url:
+            page = self.client.get(url).data
+            self.assertEqual(set(page), {"next", "previous", "results"})
+            seen += [tour["title"] for tour in page["results"]]
+            url = page["next"]
+        self.assertEqual(seen, [f"Pending {day}" for day in range(3, 7)])
+
+    def test_query_count_does_not_grow_with_buckets(self):
+        self._create_tour("Waiting", self.upcoming, "pending")
+        with self.assertNumQueries(6):  # bucket page, tours, offers, guides, participants, viewer status
+            self._get(bucket="pending")
+        self._create_tour("Open", self.upcoming)
+        self._create_tour("Going", self.upcoming, "approved")
+        self._create_tour("Done", self.finished, "completed")
+        # Uncached: joined ids, one UNION ALL for the personal pages and the
+        # same tour loads, then the shared upcoming tours and their prefetches
+        with self.assertNumQueries(11):
+            self._get()
+        with self.assertNumQueries(0):
+            self._get()
+
+    def test_invalid_bucket_requests_are_rejected(self):
+        url = reverse("my-tours")
+        self.assertEqual(self.client.get(url, {"bucket": "all"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {"cursor": "abc"}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,127 @@
+# tours/tests_caching.py
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant
+
+
+class TourListCacheTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.other_organizer = User.objects.create_user(email="other@example.com", role="organizer")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        self.tour = self._create_tour(self.organizer, "Old title")
+        self._create_tour(self.other_organizer, "Someone else's tour")
+
+    def _create_tour(self, organizer, title):
+        return Tour.objects.create(
+            organizer=organizer,
+            title=title,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            start_location="Dhaka",
+            end_location="Bandarban",
+            cost_per_person="75.00",
+        )
+
+    def _titles(self, user=None, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse("tour-list"), params)
+        return sorted(tour["title"] for tour in response.data["results"])
+
+    def test_anonymous_and_tourists_share_one_entry(self):
+        self._titles()
+        # Changed behind the cache's back: no signal, so a shared hit keeps the old title
+        Tour.objects.filter(pk=self.tour.pk).update(title="Changed")
+        self.assertIn("Old title", self._titles(self.tourist))
+
+    def test_query_param_order_does_not_matter(self):
+        self._titles(category="adventure", start_date="2029-01-01")
+        Tour.objects.filter(pk=self.tour.pk).update(title="Changed")
+        self.assertIn("Old title", self._titles(start_date="2029-01-01", category="adventure"))
+
+    def test_organizer_sees_only_own_tours(self):
+        self._titles()
+        self.assertEqual(self._titles(self.organizer), ["Old title"])
+
+    def test_writes_invalidate_immediately(self):
+        self.assertIn("Old title", self._titles())
+        self.assertEqual(self._titles(self.organizer), ["Old title"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tour.title = "New title"
+            self.tour.save()
+
+        self.assertIn("New title", self._titles())
+        self.assertEqual(self._titles(self.organizer), ["New title"])
+
+
+class MyToursSnapshotTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        self.other = User.objects.create_user(email="other@example.com", role="tourist")
+        self.joined = self._create_tour("Joined")
+        self.unrelated = self._create_tour("Unrelated")
+        self.open = self._create_tour("Open")
+        with self.captureOnCommitCallbacks(execute=True):
+            TourParticipant.objects.create(tour=self.joined, user=self.tourist, status="approved")
+            TourParticipant.objects.create(tour=self.unrelated, user=self.other, status="approved")
+
+    def _create_tour(self, title):
+        return Tour.objects.create(
+            organizer=self.organizer,
+            title=title,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            start_location="Dhaka",
+            end_location="Bandarban",
+            cost_per_person="75.00",
+        )
+
+    def _dashboard(self, user=None):
+        self.client.force_authenticate(user or self.tourist)
+        return self.client.get(reverse("my-tours")).data
+
+    def test_other_users_changes_keep_the_snapshot(self):
+        self._dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.title = "Renamed"
+            self.unrelated.save()
+            TourParticipant.objects.create(tour=self.open, user=self.other)
+        # Only the shared available tours (and their prefetches) are rebuilt after the catalog writes
+        with self.assertNumQueries(4):
+            data = self._dashboard()
+        self.assertEqual([tour["title"] for tour in data["active_tours"]], ["Joined"])
+
+    def test_editing_a_joined_tour_invalidates_the_snapshot(self):
+        self._dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.joined.title = "Renamed"
+            self.joined.save()
+        self.assertEqual([tour["title"] for tour in self._dashboard()["active_tours"]], ["Renamed"])
+
+    def test_joining_moves_the_tour_between_buckets(self):
+        data = self._dashboard()
+        self.assertEqual(sorted(tour["title"] for tour in data["available_tours"]), ["Open", "Unrelated"])
+        with self.captureOnCommitCallbacks(execute=True):
+            TourParticipant.objects.create(tour=self.open, user=self.tourist)
+        data = self._dashboard()
+        self.assertEqual([tour["title"] for tour in data["available_tours"]], ["Unrelated"])
+        self.assertEqual([tour["title"] for tour in data["pending_tours"]], ["Open"])
+        self.assertEqual(data["pending_tours"][0]["status"], "pending")
+
+    def test_available_tours_are_shared_between_users(self):
+        self._dashboard()
+        Tour.objects.filter(pk=self.open.pk).update(title="Changed")  # no signal
+        data = self._dashboard(self.other)
+        self.assertIn("Open", [tour["title"] for tour in data["available_tours"]])
+        self.assertNotIn("Unrelated", [tour["title"] for tour in data["available_tours"]])
@@ -0,0 +1,107 @@
+# tours/tests_cards.py
+import json
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.cards import card_key
+from tours.models import Guide, Tour, TourGuideAssignment
+from tours.serializers import TourListSerializer
+from tours.tasks import rebuild_tour_cards
+
+
+class TourCardTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tours = [
+            Tour.objects.create(
+                organizer=organizer,
+                title=f"Card {i}",
+                start_date=date(2030, 1, 1 + i),
+                end_date=date(2030, 2, 1),
+                start_location="Dhaka",
+                end_location="Sylhet",
+                cost_per_person="30.00",
+                max_participants=10,
+            )
+            for i in range(3)
+        ]
+
+    def _list(self, **params):
+        response = self.client.get(reverse("tour-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def _card_cached(self, tour):
+        tour.refresh_from_db()
+        return cache.get(card_key(tour.pk, tour.updated_at)) is not None
+
+    def test_stitched_page_matches_serializer_output(self):
+        data = self._list()
+        self.assertEqual(data["count"], 3)
+        expected = json.loads(json.dumps(
+            TourListSerializer(Tour.objects.order_by("-start_date"), many=True).data
+        ))
+        self.assertEqual(data["results"], expected)
+        self.assertTrue(all(self._card_cached(tour) for tour in self.tours))
+
+    def test_cursor_page_keeps_envelope(self):
+        data = self._list(pagination="cursor", page_size=2)
+        self.assertEqual([t["id"] for t in data["results"]], [self.tours[2].id, self.tours[1].id])
+        self.assertIsNotNone(data["next"])
+
+    def test_guide_profile_change_retires_cards(self):
+        guide = User.objects.create_user(email="guide@example.com", role="guide")
+        profile = Guide.objects.create(user=guide, bio="Old bio")
+        with self.captureOnCommitCallbacks(execute=True):
+            TourGuideAssignment.objects.create(tour=self.tours[0], guide=guide, status="accepted")
+        self._list()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.bio = "New bio"
+            profile.save()
+        card = next(t for t in self._list()["results"] if t["id"] == self.tours[0].id)
+        self.assertEqual(card["guides"][0]["bio"], "New bio")
+
+    def test_user_email_change_retires_cards(self):
+        guide = User.objects.create_user(email="guide@example.com", role="guide")
+        Guide.objects.create(user=guide)
+        with self.captureOnCommitCallbacks(execute=True):
+            TourGuideAssignment.objects.create(tour=self.tours[0], guide=guide, status="accepted")
+        self._list()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for user, email in ((self.tours[1].organizer, "renamed@example.com"), (guide, "new-guide@example.com")):
+                user.email = email
+                user.save()
+        cards = {t["id"]: t for t in self._list()["results"]}
+        self.assertEqual(cards[self.tours[1].id]["organizer_email"], "renamed@example.com")
+        self.assertEqual(cards[self.tours[0].id]["guides"][0]["user_email"], "new-guide@example.com")
+
+        # Saves that leave the embedded fields alone keep the cards
+        with self.captureOnCommitCallbacks(execute=True):
+            guide.save(update_fields=["last_login"])
+        self.assertTrue(self._card_cached(self.tours[0]))
+
+    def test_cards_and_shaped_responses_render_media_urls_alike(self):
+        guide = User.objects.create_user(email="guide@example.com", role="guide")
+        Guide.objects.create(user=guide, profile_picture="guides/rahim.jpg")
+        TourGuideAssignment.objects.create(tour=self.tours[0], guide=guide, status="accepted")
+
+        def picture(data):
+            tour = next(t for t in data["results"] if t["id"] == self.tours[0].id)
+            return tour["guides"][0]["profile_picture"]
+
+        from_card = picture(self._list())
+        self.assertTrue(from_card.endswith("guides/rahim.jpg"))
+        self.assertEqual(picture(self._list(fields="id,guides")), from_card)
+
+    def test_rebuild_task_warms_cards(self):
+        self.assertEqual(rebuild_tour_cards(), 3)
+        self.assertTrue(all(self._card_cached(tour) for tour in self.tours))
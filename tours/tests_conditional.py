@@ -0,0 +1,66 @@
+# tours/tests_conditional.py
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant
+
+
+class TourConditionalGetTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = Tour.objects.create(
+            organizer=self.organizer,
+            title="Rangamati Lake",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 3),
+            start_location="Chittagong",
+            end_location="Rangamati",
+            cost_per_person="55.00",
+        )
+
+    def _get(self, url, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(url, **headers)
+
+    def test_list_returns_304_until_something_changes(self):
+        url = reverse("tour-list")
+        first = self._get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", first)
+
+        # Cache hit and cache miss both honour the validator
+        self.assertEqual(self._get(url, first["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+        cache.clear()
+        self.assertEqual(self._get(url, first["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        with self.captureOnCommitCallbacks(execute=True):
+            TourParticipant.objects.create(tour=self.tour, user=tourist)
+        changed = self._get(url, first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_query_params_change_the_etag(self):
+        url = reverse("tour-list")
+        self.assertNotEqual(self._get(url)["ETag"], self._get(url + "?fields=id")["ETag"])
+
+    def test_detail_returns_304(self):
+        url = reverse("tour-detail", args=[self.tour.pk])
+        etag = self._get(url)["ETag"]
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.tour.title = "Kaptai Lake"
+        self.tour.save()
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_missing_tour_is_still_404(self):
+        response = self._get(reverse("tour-detail", args=[self.tour.pk + 1000]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
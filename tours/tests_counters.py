@@ -0,0 +1,86 @@
+# tours/tests_counters.py
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant, TourRating
+
+
+class TourCounterTestCase(TestCase):
+
+    def setUp(self):
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = Tour.objects.create(
+            organizer=organizer,
+            title="Saint Martin",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 4),
+            start_location="Teknaf",
+            end_location="Saint Martin",
+            cost_per_person="80.00",
+            max_participants=3,
+        )
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+        ]
+
+    def _counters(self):
+        return Tour.objects.values(
+            "approved_count", "pending_count", "rejected_count", "seats_remaining",
+            "rating_count", "rating_sum",
+        ).get(pk=self.tour.pk)
+
+    def test_participant_lifecycle(self):
+        first = TourParticipant.objects.create(tour=self.tour, user=self.tourists[0])
+        second = TourParticipant.objects.create(tour=self.tour, user=self.tourists[1])
+        first.status = "approved"
+        first.save()
+        second.status = "rejected"
+        second.save()
+        second.save()  # saving again must not double count
+
+        counters = self._counters()
+        self.assertEqual(
+            (counters["approved_count"], counters["pending_count"], counters["rejected_count"]), (1, 0, 1)
+        )
+        self.assertEqual(counters["seats_remaining"], 2)
+
+        first.delete()
+        self.assertEqual(self._counters()["approved_count"], 0)
+        self.assertEqual(self._counters()["seats_remaining"], 3)
+
+    def test_ratings(self):
+        rating = TourRating.objects.create(tour=self.tour, user=self.tourists[0], rating=4)
+        TourRating.objects.create(tour=self.tour, user=self.tourists[1], rating=2)
+        rating.rating = 5
+        rating.save()
+
+        tour = Tour.objects.get(pk=self.tour.pk)
+        self.assertEqual((tour.rating_count, tour.rating_sum), (2, 7))
+        self.assertEqual(tour.average_rating, 3.5)
+
+    def test_stale_tour_save_keeps_counters_and_updates_seats(self):
+        stale = Tour.objects.get(pk=self.tour.pk)
+        TourParticipant.objects.create(tour=self.tour, user=self.tourists[0], status="approved")
+
+        stale.max_participants = 0  # no cap
+        stale.save()
+        counters = self._counters()
+        self.assertEqual(counters["approved_count"], 1)
+        self.assertIsNone(counters["seats_remaining"])
+
+    def test_recount_command_repairs_drift(self):
+        TourParticipant.objects.create(tour=self.tour, user=self.tourists[0], status="approved")
+        TourRating.objects.create(tour=self.tour, user=self.tourists[0], rating=5)
+        # Bulk updates bypass the signals
+        TourParticipant.objects.update(status="pending")
+        Tour.objects.update(rating_count=0, rating_sum=0)
+
+        call_command("recount_tour_counters", stdout=StringIO())
+        counters = self._counters()
+        self.assertEqual((counters["approved_count"], counters["pending_count"]), (0, 1))
+        self.assertEqual((counters["rating_count"], counters["rating_sum"]), (1, 5))
+        self.assertEqual(counters["seats_remaining"], 2)  # the pending participant holds a seat
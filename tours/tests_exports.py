@@ -0,0 +1,70 @@
+# tours/tests_exports.py
+import csv
+import io
+import json
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant
+
+
+class TourExportTestCase(APITestCase):
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        other = User.objects.create_user(email="other@example.com", role="organizer")
+        self.tour = self._create_tour(self.organizer, "Kuakata")
+        self._create_tour(other, "Rangamati")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        TourParticipant.objects.create(tour=self.tour, user=self.tourist, status="approved")
+
+    def _create_tour(self, organizer, title):
+        return Tour.objects.create(
+            organizer=organizer,
+            title=title,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 3),
+            start_location="Dhaka",
+            end_location=title,
+            cost_per_person="60.00",
+            max_participants=10,
+        )
+
+    def _get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv_export_is_role_scoped(self):
+        self.client.force_authenticate(user=self.organizer)
+        rows = list(csv.DictReader(io.StringIO(self._get(reverse("tour-export")))))
+        self.assertEqual([row["title"] for row in rows], ["Kuakata"])
+        self.assertEqual(rows[0]["approved_count"], "1")
+        self.assertEqual(rows[0]["seats_remaining"], "9")
+
+        self.client.force_authenticate(user=self.tourist)
+        rows = list(csv.DictReader(io.StringIO(self._get(reverse("tour-export")))))
+        self.assertEqual(len(rows), 2)
+
+    def test_ndjson_export_honours_filters(self):
+        body = self._get(reverse("tour-export"), export_format="ndjson", search="rangamati")
+        [row] = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual((row["title"], row["cost_per_person"]), ("Rangamati", "60.00"))
+
+    def test_participants_export(self):
+        url = reverse("tour-export-participants", args=[self.tour.pk])
+        self.client.force_authenticate(user=self.organizer)
+        [row] = list(csv.DictReader(io.StringIO(self._get(url))))
+        self.assertEqual((row["email"], row["status"]), ("tourist@example.com", "approved"))
+
+        self.client.force_authenticate(user=self.tourist)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse("tour-export"), {"export_format": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
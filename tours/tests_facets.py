@@ -0,0 +1,66 @@
+# tours/tests_facets.py
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour
+
+
+class TourFacetsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        for category, location, start, cost in [
+            ("Adventure", "Dhaka", date(2030, 1, 5), "40.00"),
+            ("Adventure", "Sylhet", date(2030, 1, 20), "120.00"),
+            ("Beach", "Dhaka", date(2030, 2, 1), "600.00"),
+        ]:
+            self._create_tour(category, location, start, cost)
+
+    def _create_tour(self, category, location, start, cost):
+        return Tour.objects.create(
+            organizer=self.organizer,
+            title=f"{category} from {location}",
+            category=category,
+            start_date=start,
+            end_date=date(2030, 3, 1),
+            start_location=location,
+            end_location="Cox's Bazar",
+            cost_per_person=cost,
+        )
+
+    def _facets(self, **params):
+        response = self.client.get(reverse("tour-facets"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_counts_per_facet(self):
+        with self.assertNumQueries(1):
+            data = self._facets()
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["category"], [{"value": "Adventure", "count": 2}, {"value": "Beach", "count": 1}])
+        self.assertEqual(data["start_location"], [{"value": "Dhaka", "count": 2}, {"value": "Sylhet", "count": 1}])
+        self.assertEqual(data["month"], [{"value": "2030-01", "count": 2}, {"value": "2030-02", "count": 1}])
+        self.assertEqual(
+            data["price_band"],
+            [{"value": "0-50", "count": 1}, {"value": "100-250", "count": 1}, {"value": "500+", "count": 1}],
+        )
+
+    def test_counts_follow_filters(self):
+        data = self._facets(category="adventure", search="sylhet")
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["start_location"], [{"value": "Sylhet", "count": 1}])
+
+    def test_cached_until_a_tour_changes(self):
+        self._facets()
+        with self.assertNumQueries(0):
+            self._facets(page=2)  # paging params share the entry
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_tour("Beach", "Khulna", date(2030, 2, 10), "80.00")
+        self.assertEqual(self._facets()["total"], 4)
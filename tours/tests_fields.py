@@ -0,0 +1,61 @@
+# tours/tests_fields.py
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Offer, Tour, TourParticipant
+
+
+class TourSparseFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = Tour.objects.create(
+            organizer=organizer,
+            title="Sundarbans",
+            description="Mangrove forest",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            start_location="Khulna",
+            end_location="Khulna",
+            cost_per_person="90.00",
+            max_participants=4,
+        )
+        Offer.objects.create(
+            tour=self.tour, title="Early bird", discount_percent=10,
+            valid_from=date(2029, 1, 1), valid_until=date(2029, 6, 1),
+        )
+        tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        TourParticipant.objects.create(tour=self.tour, user=tourist, status="approved")
+
+    def _list(self, **params):
+        response = self.client.get(reverse("tour-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_fields_keeps_only_requested_fields(self):
+        [tour] = self._list(fields="id,title,seats_remaining")
+        self.assertEqual(tour, {"id": self.tour.id, "title": "Sundarbans", "seats_remaining": 3})
+
+    def test_omit_supports_nested_paths(self):
+        [tour] = self._list(omit="description,offers.description")
+        self.assertNotIn("description", tour)
+        self.assertEqual(set(tour["offers"][0]), {"id", "title", "discount_percent", "valid_from", "valid_until"})
+
+    def test_expand_participants(self):
+        [tour] = self._list(fields="id,participants", expand="participants")
+        self.assertEqual([p["email"] for p in tour["participants"]], ["tourist@example.com"])
+
+    def test_sparse_request_skips_columns_and_prefetches(self):
+        with CaptureQueriesContext(connection) as queries:
+            self._list(fields="id,title")
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("tours_offer", sql)
@@ -0,0 +1,80 @@
+# tours/tests_geo.py
+from datetime import date
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour
+
+
+class TourNearTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        # Distances from Dhaka (23.8103, 90.4125): Gazipur ~21 km, Narayanganj ~23 km, Sylhet ~191 km
+        self.gazipur = self._create_tour("Gazipur (23.9999,90.4203)")
+        self.narayanganj = self._create_tour("Narayanganj (23.6238,90.5000)")
+        self.sylhet = self._create_tour("Sylhet (24.8949,91.8687)")
+        self._create_tour("Somewhere")  # no coordinates
+
+    def _create_tour(self, start_location, start_date=date(2030, 1, 1)):
+        return Tour.objects.create(
+            organizer=self.organizer,
+            title=f"From {start_location}",
+            start_date=start_date,
+            end_date=date(2030, 2, 1),
+            start_location=start_location,
+            end_location="Cox's Bazar (21.4272,92.0058)",
+            cost_per_person="100.00",
+        )
+
+    def _ids(self, **params):
+        response = self.client.get(reverse("tour-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tour["id"] for tour in response.data["results"]]
+
+    def test_coordinates_parsed_on_create(self):
+        self.assertEqual((self.sylhet.start_latitude, self.sylhet.start_longitude), (24.8949, 91.8687))
+        self.assertEqual((self.sylhet.end_latitude, self.sylhet.end_longitude), (21.4272, 92.0058))
+
+    def test_near_filters_by_radius_and_sorts_by_distance(self):
+        self.assertEqual(
+            self._ids(near="23.8103,90.4125", radius_km="50"),
+            [self.gazipur.id, self.narayanganj.id],
+        )
+        self.assertEqual(
+            self._ids(near="23.8103,90.4125", radius_km="250"),
+            [self.gazipur.id, self.narayanganj.id, self.sylhet.id],
+        )
+
+    def test_near_cursor_pagination_walks_distance_order(self):
+        seen, params = [], {"near": "23.8103,90.4125", "radius_km": "250", "pagination": "cursor", "page_size": 1}
+        url = reverse("tour-list")
+        while url:
+            response = self.client.get(url, params)
+            seen += [tour["id"] for tour in response.data["results"]]
+            url, params = response.data["next"], None
+        self.assertEqual(seen, [self.gazipur.id, self.narayanganj.id, self.sylhet.id])
+
+    def test_near_across_antimeridian(self):
+        fiji = self._create_tour("Suva (-18.1416,178.4419)")
+        taveuni = self._create_tour("Taveuni (-16.8500,-179.9500)")
+        self.assertEqual(self._ids(near="-17.0,179.9", radius_km="300"), [taveuni.id, fiji.id])
+
+    def test_invalid_near_is_rejected(self):
+        for params in ({"near": "dhaka"}, {"near": "95,10"}, {"near": "23,90", "radius_km": "-1"}):
+            response = self.client.get(reverse("tour-list"), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_backfill_command(self):
+        Tour.objects.update(start_latitude=None, start_longitude=None, end_latitude=None, end_longitude=None)
+        call_command("backfill_tour_coordinates", "--batch-size", "2", stdout=StringIO())
+        self.sylhet.refresh_from_db()
+        self.assertEqual((self.sylhet.start_latitude, self.sylhet.start_longitude), (24.8949, 91.8687))
+        self.assertEqual(Tour.objects.filter(start_latitude__isnull=True).count(), 1)
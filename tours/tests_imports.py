@@ -0,0 +1,84 @@
+# tours/tests_imports.py
+import json
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from analytics.rollups import rollup_totals
+from tours.imports import import_tours
+from tours.models import Tour
+from tours.search import search_tours
+
+CSV = (
+    "title,start_date,end_date,start_location,end_location,cost_per_person,max_participants,description\n"
+    "Sajek Valley,2030-01-01,2030-01-03,\"Dhaka (23.8103,90.4125)\",Sajek,95.00,10,\n"
+    "Broken,not-a-date,2030-01-03,Dhaka,Sajek,95.00,10,\n"
+    "Lalakhal,2030-02-01,2030-02-02,Sylhet,Lalakhal,40.00,,Boat ride on the blue river\n"
+)
+
+
+class TourImportTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.client.force_authenticate(user=self.organizer)
+
+    def _upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"))
+        return self.client.post(reverse("tour-bulk-import"), {"file": upload, **data}, format="multipart")
+
+    def test_csv_import_reports_bad_rows(self):
+        response = self._upload("tours.csv", CSV)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["failed"]), (2, 1))
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertIn("start_date", response.data["errors"][0]["errors"])
+
+        sajek = Tour.objects.get(title="Sajek Valley")
+        self.assertEqual(sajek.organizer, self.organizer)
+        self.assertEqual(sajek.seats_remaining, 10)
+        self.assertEqual((sajek.start_latitude, sajek.start_longitude), (23.8103, 90.4125))
+        lalakhal = Tour.objects.get(title="Lalakhal")
+        self.assertIsNone(lalakhal.seats_remaining)  # blank max_participants -> no cap
+        self.assertEqual(list(search_tours(Tour.objects.all(), "blue river")), [lalakhal])
+
+    def test_ndjson_import_in_small_chunks(self):
+        rows = [
+            {"title": f"Tour {i}", "start_date": "2030-03-01", "end_date": "2030-03-02",
+             "start_location": "Dhaka", "end_location": "Khulna", "cost_per_person": 20}
+            for i in range(7)
+        ]
+        lines = [json.dumps(row) for row in rows] + ["", "[1, 2]", "{not json"]
+        with self.captureOnCommitCallbacks(execute=True):
+            report = import_tours(
+                BytesIO("\n".join(lines).encode()), "ndjson", self.organizer, chunk_size=3, batch_size=2,
+            )
+        self.assertEqual((report["created"], report["failed"]), (7, 2))
+        # bulk_create skips the rollup signals; each chunk records its own deltas
+        self.assertEqual(rollup_totals(self.organizer.pk)["tours"], 7)
+        self.assertEqual(rollup_totals()["tours"], 7)
+        self.assertEqual([entry["row"] for entry in report["errors"]], [9, 10])
+        self.assertEqual(Tour.objects.filter(organizer=self.organizer).count(), 7)
+
+    def test_tourists_cannot_import_and_format_is_required(self):
+        response = self._upload("tours.txt", CSV)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._upload("tours.txt", CSV, import_format="csv").status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(user=User.objects.create_user(email="t@example.com", role="tourist"))
+        self.assertEqual(self._upload("tours.csv", CSV).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as source:
+            source.write(CSV)
+            source.flush()
+            call_command("import_tours", source.name, organizer=self.organizer.email, stdout=StringIO())
+        self.assertEqual(Tour.objects.count(), 2)
@@ -0,0 +1,115 @@
+# tours/tests_list.py
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Guide, Tour, TourGuideAssignment, TourParticipant
+
+
+class TourListRepresentationTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = Tour.objects.create(
+            organizer=self.organizer,
+            title="Hill Tracks",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            start_location="Dhaka",
+            end_location="Bandarban",
+            cost_per_person="75.00",
+            max_participants=5,
+        )
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+        ]
+        for tourist, state in zip(self.tourists, ["approved", "approved", "pending"]):
+            TourParticipant.objects.create(tour=self.tour, user=tourist, status=state)
+
+    def _list(self):
+        cache.clear()
+        response = self.client.get(reverse("tour-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_list_returns_counts_instead_of_roster(self):
+        [tour] = self._list()
+        self.assertNotIn("participants", tour)
+        self.assertEqual(tour["approved_count"], 2)
+        self.assertEqual(tour["pending_count"], 1)
+        self.assertEqual(tour["seats_remaining"], 2)
+
+    def test_detail_keeps_full_roster(self):
+        response = self.client.get(reverse("tour-detail", args=[self.tour.pk]))
+        self.assertEqual(len(response.data["participants"]), 3)
+
+    def test_query_count_does_not_grow_with_participants(self):
+        with CaptureQueriesContext(connection) as before:
+            self._list()
+        for i in range(3, 8):
+            tourist = User.objects.create_user(email=f"tourist{i}@example.com", role="tourist")
+            TourParticipant.objects.create(tour=self.tour, user=tourist)
+        with CaptureQueriesContext(connection) as after:
+            self._list()
+        self.assertEqual(len(after), len(before))
+
+
+class TouristToursQueryCountTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        self.client.force_authenticate(self.tourist)
+
+    def _add_tours(self, count):
+        for _ in range(count):
+            # One guide per tour: a guide can't accept overlapping tours
+            guide = User.objects.create_user(email=f"guide{Guide.objects.count()}@example.com", role="guide")
+            Guide.objects.create(user=guide)
+            tour = Tour.objects.create(
+                organizer=self.organizer,
+                title="Tea Gardens",
+                start_date=date(2030, 1, 1),
+                end_date=date(2030, 1, 5),
+                start_location="Dhaka",
+                end_location="Sylhet",
+                cost_per_person="60.00",
+            )
+            TourGuideAssignment.objects.create(tour=tour, guide=guide, status="accepted")
+            TourParticipant.objects.create(tour=tour, user=self.tourist, status="pending")
+            # An unrelated tour in the "available" bucket
+            Tour.objects.create(
+                organizer=self.organizer,
+                title="River Cruise",
+                start_date=date(2030, 2, 1),
+                end_date=date(2030, 2, 3),
+                start_location="Dhaka",
+                end_location="Barisal",
+                cost_per_person="40.00",
+            )
+
+    def _my_tours(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("my-tours"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, len(queries)
+
+    def test_query_count_stays_flat_as_tours_grow(self):
+        self._add_tours(2)
+        data, small = self._my_tours()
+        self.assertEqual(data["pending_tours"][0]["status"], "pending")
+        self.assertEqual(len(data["pending_tours"][0]["guides"]), 1)
+
+        self._add_tours(3)
+        data, large = self._my_tours()
+        self.assertEqual(len(data["pending_tours"]), 5)
+        self.assertEqual(large, small)
@@ -0,0 +1,82 @@
+# tours/tests_pagination.py
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour
+
+
+class TourCursorPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        # Several tours share a start_date so the id tie-breaker is exercised
+        self.tours = [
+            Tour.objects.create(
+                organizer=organizer,
+                title=f"Tour {i}",
+                start_date=date(2030, 1, 1 + i // 3),
+                end_date=date(2030, 2, 1),
+                start_location="Dhaka",
+                end_location="Sylhet",
+                cost_per_person="50.00",
+            )
+            for i in range(7)
+        ]
+        self.expected = [
+            t.id for t in sorted(self.tours, key=lambda t: (-t.start_date.toordinal(), t.id))
+        ]
+
+    def _get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_walks_catalog_forward_and_back(self):
+        data = self._get(reverse("tour-list"), {"pagination": "cursor", "page_size": 3})
+        self.assertNotIn("count", data)
+        self.assertIsNone(data["previous"])
+
+        seen = [t["id"] for t in data["results"]]
+        pages = [data]
+        while data["next"]:
+            data = self._get(data["next"])
+            seen += [t["id"] for t in data["results"]]
+            pages.append(data)
+        self.assertEqual(seen, self.expected)
+
+        previous = self._get(pages[-1]["previous"])
+        self.assertEqual(previous["results"], pages[-2]["results"])
+
+    def test_cursor_pages_keep_search_relevance_order(self):
+        for tour in self.tours[::3]:
+            tour.title = "Sylhet tea gardens"
+            tour.save()
+        for params in ({"search": "sylhet"}, {"search": "sylhet", "fuzzy": "1"}):
+            ranked = [t["id"] for t in self._get(reverse("tour-list"), {**params, "page_size": 50})["results"]]
+            data = self._get(reverse("tour-list"), {**params, "pagination": "cursor", "page_size": 2})
+            seen = [t["id"] for t in data["results"]]
+            while data["next"]:
+                data = self._get(data["next"])
+                seen += [t["id"] for t in data["results"]]
+            self.assertEqual(seen, ranked)
+            if "fuzzy" not in params:
+                # Title matches outrank the rest, unlike the default ordering
+                self.assertEqual(set(ranked[:3]), {tour.id for tour in self.tours[::3]})
+
+    def test_page_number_pagination_is_still_the_default(self):
+        data = self._get(reverse("tour-list"))
+        self.assertEqual(data["count"], 7)
+
+    def test_approximate_count_is_opt_in(self):
+        data = self._get(reverse("tour-list"), {"pagination": "cursor", "count": "approx"})
+        self.assertIsInstance(data["count"], int)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("tour-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
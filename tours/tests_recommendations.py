@@ -0,0 +1,78 @@
+# tours/tests_recommendations.py
+from datetime import date
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import SimilarTour, Tour, TourParticipant
+from tours.recommendations import rebuild_similar_tours
+
+
+class SimilarToursTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tours = {
+            name: Tour.objects.create(
+                organizer=organizer,
+                title=name,
+                category="Hiking",
+                start_date=start,
+                end_date=date(2031, 1, 1),
+                start_location="Dhaka",
+                end_location=name,
+                cost_per_person="50.00",
+            )
+            for name, start in [
+                ("A", date(2030, 1, 1)), ("B", date(2030, 2, 1)), ("C", date(2030, 3, 1)),
+                ("D", date(2030, 4, 1)), ("Past", date(2020, 1, 1)),
+            ]
+        }
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(4)
+        ]
+        # A-B share two tourists, A-C one; D only matches on category/location
+        for tourist, names in zip(self.tourists, [("A", "B"), ("A", "B"), ("A", "C"), ("B",)]):
+            for name in names:
+                TourParticipant.objects.create(tour=self.tours[name], user=tourist)
+        TourParticipant.objects.create(tour=self.tours["Past"], user=self.tourists[0])
+
+    def _titles(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tour["title"] for tour in response.data]
+
+    def test_similar_ranks_by_blended_cosine(self):
+        rebuild_similar_tours(top_k=3)
+        self.assertEqual(self._titles(reverse("tour-similar", args=[self.tours["A"].pk])), ["B", "C", "D"])
+        # Past tours are never recommended
+        self.assertFalse(SimilarTour.objects.filter(similar=self.tours["Past"]).exists())
+
+    def test_content_candidates_are_capped_per_tour(self):
+        rebuild_similar_tours(top_k=1)
+        # Co-participation still outranks content-only neighbours cut by the cap
+        self.assertEqual(self._titles(reverse("tour-similar", args=[self.tours["A"].pk])), ["B"])
+        self.assertEqual(self._titles(reverse("tour-similar", args=[self.tours["D"].pk])), ["A"])
+        self.assertEqual(SimilarTour.objects.count(), len(self.tours))
+
+    def test_similar_reads_only_precomputed_rows(self):
+        rebuild_similar_tours()
+        url = reverse("tour-similar", args=[self.tours["A"].pk])
+        self._titles(url)  # warm the tour cards
+        with self.assertNumQueries(3):  # tour exists, neighbour ids, their card keys
+            self._titles(url)
+
+    def test_recommended_excludes_joined_tours(self):
+        rebuild_similar_tours()
+        self.client.force_authenticate(user=self.tourists[3])  # joined B only
+        self.assertEqual(self._titles(reverse("tour-recommended"))[0], "A")
+        self.assertNotIn("B", self._titles(reverse("tour-recommended")))
+
+    def test_recommended_falls_back_to_popular_tours(self):
+        newcomer = User.objects.create_user(email="new@example.com", role="tourist")
+        self.client.force_authenticate(user=newcomer)
+        self.assertEqual(self._titles(reverse("tour-recommended")), ["A", "B", "C", "D"])
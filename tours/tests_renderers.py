@@ -0,0 +1,47 @@
+# tours/tests_renderers.py
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tour_management.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+
+    def assertSameBytes(self, data, **kwargs):
+        self.assertEqual(FastJSONRenderer().render(data, **kwargs), JSONRenderer().render(data, **kwargs))
+
+    def test_native_types_match_drf_output(self):
+        self.assertSameBytes({
+            "date": datetime.date(2030, 1, 2),
+            "utc": datetime.datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            "naive": datetime.datetime(2030, 1, 2, 3, 4, 5),
+            "time": datetime.time(10, 30),
+            "decimal": Decimal("149.99"),
+            "uuid": uuid.UUID(int=1),
+            "lazy": gettext_lazy("Adventure"),
+            "nested": [{"float": 0.1 + 0.2, "none": None, "bool": True}],
+            1: "non-string key",
+        })
+
+    def test_unicode_and_js_separators(self):
+        self.assertSameBytes({"title": "বাংলাদেশ \u2028 line \u2029 para"})
+
+    def test_indent_and_huge_ints_fall_back(self):
+        self.assertSameBytes({"a": [1, 2]}, accepted_media_type="application/json; indent=2")
+        self.assertSameBytes({"big": 2 ** 70})
+
+    def test_parser_matches_drf(self):
+        body = '{"title": "Sundarbans", "cost": 149.99, "tags": ["river", null]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body))
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
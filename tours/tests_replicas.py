@@ -0,0 +1,77 @@
+# tours/tests_replicas.py
+from datetime import date
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from tour_management.db_router import PRIMARY, ReplicaRouter
+from tours.models import Tour
+
+REPLICAS = list(settings.DATABASE_REPLICAS)
+
+
+@skipUnless(REPLICAS, "set DB_REPLICA_HOSTS (e.g. to the primary's host) to run the replica tests")
+class ReplicaRoutingTestCase(TransactionTestCase):
+    databases = {PRIMARY, *REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = Tour.objects.create(
+            organizer=self.organizer,
+            title="Bandarban",
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 3),
+            start_location="Dhaka",
+            end_location="Bandarban",
+            cost_per_person="90.00",
+        )
+
+    def _get(self, url):
+        with CaptureQueriesContext(connections[PRIMARY]) as primary, \
+                CaptureQueriesContext(connections[REPLICAS[0]]) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(primary), len(replica)
+
+    def test_reads_default_to_primary_outside_replica_views(self):
+        self.assertEqual(ReplicaRouter().db_for_read(Tour), PRIMARY)
+
+    def test_catalog_reads_use_replica(self):
+        primary, replica = self._get(reverse("tour-detail", args=[self.tour.pk]))
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_version_keyed_caches_are_filled_from_the_primary(self):
+        # A miss may follow a version bump the replica hasn't replayed yet
+        primary, replica = self._get(reverse("tour-list"))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.assertEqual(self._get(reverse("tour-list")), (0, 0))
+
+        tourist = User.objects.create_user(email="tourist@example.com", role="tourist")
+        self.client.force_authenticate(user=tourist)
+        self.assertEqual(self._get(reverse("my-tours"))[1], 0)
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.patch(
+            reverse("tour-detail", args=[self.tour.pk]), {"title": "Nilgiri"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        primary, replica = self._get(reverse("tour-detail", args=[self.tour.pk]))
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        cache.delete(f"db:recent-write:{self.organizer.pk}")  # sticky window over
+        self.assertEqual(self._get(reverse("tour-detail", args=[self.tour.pk]))[0], 0)
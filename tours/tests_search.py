@@ -0,0 +1,117 @@
+# tours/tests_search.py
+import json
+from datetime import date
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Offer, Tour
+
+
+class TourSearchTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.beach = self._create_tour(title="Beach Escape", description="Sun and sand")
+        self.mountain = self._create_tour(title="Mountain Trek", description="Ends with a beach picnic")
+        self.city = self._create_tour(title="City Lights", description="Museums and food")
+
+    def _create_tour(self, **kwargs):
+        defaults = {
+            "organizer": self.organizer,
+            "start_date": date(2030, 1, 1),
+            "end_date": date(2030, 1, 5),
+            "start_location": "Dhaka",
+            "end_location": "Cox's Bazar",
+            "cost_per_person": "100.00",
+        }
+        defaults.update(kwargs)
+        return Tour.objects.create(**defaults)
+
+    def _search(self, text):
+        response = self.client.get(reverse("tour-list"), {"search": text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tour["id"] for tour in response.data["results"]]
+
+    def test_title_match_ranks_above_description_match(self):
+        self.assertEqual(self._search("beach"), [self.beach.id, self.mountain.id])
+
+    def test_prefix_matching(self):
+        self.assertEqual(self._search("mount"), [self.mountain.id])
+
+    def test_offer_titles_are_searchable(self):
+        Offer.objects.create(
+            tour=self.city, title="Halloween special", discount_percent=10,
+            valid_from=date(2030, 1, 1), valid_until=date(2030, 1, 2),
+        )
+        self.assertEqual(self._search("halloween"), [self.city.id])
+
+    def test_rebuild_search_index_command(self):
+        Tour.objects.update(search_vector=None)
+        self.assertEqual(self._search("lights"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+        cache.clear()
+        self.assertEqual(self._search("lights"), [self.city.id])
+
+
+class TourFuzzySearchTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        common = {
+            "organizer": organizer,
+            "start_date": date(2030, 1, 1),
+            "end_date": date(2030, 1, 5),
+            "cost_per_person": "100.00",
+        }
+        self.kyoto = Tour.objects.create(
+            title="Temples and Tea", start_location="Kyoto, Japan", end_location="Osaka, Japan", **common
+        )
+        self.santorini = Tour.objects.create(
+            title="Island Hopping", start_location="Athens, Greece", end_location="Santorini, Greece", **common
+        )
+
+    def _list(self, **params):
+        response = self.client.get(reverse("tour-list"), {"fuzzy": "true", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tour["id"] for tour in response.data["results"]]
+
+    def test_start_location_tolerates_typos(self):
+        self.assertEqual(self._list(start_location="Kyotto"), [self.kyoto.id])
+
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self._list(search="Santorni"), [self.santorini.id])
+
+    def test_similarity_threshold(self):
+        self.assertEqual(self._list(search="Santorni", similarity="1.0"), [])
+        # Below pg_trgm's own default (0.6) as well as the catalog's (0.4)
+        self.assertEqual(self._list(search="Sntrini"), [])
+        self.assertEqual(self._list(search="Sntrini", similarity="0.3"), [self.santorini.id])
+
+    def test_fuzzy_filters_use_the_indexable_operator(self):
+        with CaptureQueriesContext(connection) as queries:
+            self._list(start_location="Kyotto")
+        self.assertTrue(any('%> ' in query["sql"] and "start_location" in query["sql"] for query in queries))
+
+    def test_export_applies_the_threshold(self):
+        response = self.client.get(
+            reverse("tour-export"), {"fuzzy": "true", "search": "Sntrini", "similarity": "0.3", "export_format": "ndjson"},
+        )
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertEqual([json.loads(line)["title"] for line in body.splitlines()], ["Island Hopping"])
+
+    def test_threshold_does_not_leak_into_the_session(self):
+        self._list(search="Santorni", similarity="0.2")
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+            self.assertEqual(cursor.fetchone()[0], "0.6")
@@ -0,0 +1,113 @@
+# tours/tests_seats.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant
+
+
+def create_tour(organizer, max_participants):
+    return Tour.objects.create(
+        organizer=organizer,
+        title="Ratargul",
+        start_date=date(2030, 1, 1),
+        end_date=date(2030, 1, 2),
+        start_location="Sylhet",
+        end_location="Ratargul",
+        cost_per_person="30.00",
+        max_participants=max_participants,
+    )
+
+
+class TourJoinTestCase(APITestCase):
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = create_tour(self.organizer, max_participants=1)
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(2)
+        ]
+
+    def _join(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("participant-list"), {"tour": self.tour.pk}, format="json")
+
+    def test_join_is_idempotent(self):
+        first = self._join(self.tourists[0])
+        again = self._join(self.tourists[0])
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data["id"], first.data["id"])
+        self.assertEqual(TourParticipant.objects.filter(tour=self.tour).count(), 1)
+
+    def test_sold_out_and_seat_released_on_reject(self):
+        participant_id = self._join(self.tourists[0]).data["id"]
+        response = self._join(self.tourists[1])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["detail"].code, "sold_out")
+
+        self.client.force_authenticate(user=self.organizer)
+        self.client.patch(reverse("participant-reject-participant", args=[participant_id]))
+        self.assertEqual(self._join(self.tourists[1]).status_code, status.HTTP_201_CREATED)
+
+        # Re-approving the rejected participant needs a free seat again
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.patch(reverse("participant-approve-participant", args=[participant_id]))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(TourParticipant.objects.get(pk=participant_id).status, "rejected")
+
+    def test_status_cannot_be_patched_past_the_seat_check(self):
+        participant_id = self._join(self.tourists[0]).data["id"]
+        self.client.force_authenticate(user=self.organizer)
+        self.client.patch(reverse("participant-reject-participant", args=[participant_id]))
+        self._join(self.tourists[1])
+
+        self.client.force_authenticate(user=self.tourists[0])
+        self.client.patch(reverse("participant-detail", args=[participant_id]), {"status": "pending"}, format="json")
+        self.assertEqual(TourParticipant.objects.get(pk=participant_id).status, "rejected")
+
+    def test_no_cap_when_max_participants_is_zero(self):
+        Tour.objects.filter(pk=self.tour.pk).update(max_participants=0, seats_remaining=None)
+        for tourist in self.tourists:
+            self.assertEqual(self._join(tourist).status_code, status.HTTP_201_CREATED)
+
+
+class ConcurrentTourJoinTestCase(TransactionTestCase):
+    SEATS = 25
+    JOINS = 200
+
+    def setUp(self):
+        organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.tour = create_tour(organizer, max_participants=self.SEATS)
+        User.objects.bulk_create([
+            User(email=f"tourist{i}@example.com", role="tourist") for i in range(self.JOINS)
+        ])
+        self.tourists = list(User.objects.filter(role="tourist"))
+
+    def _join(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            return client.post(reverse("participant-list"), {"tour": self.tour.pk}, format="json").status_code
+        finally:
+            connection.close()
+
+    def test_simultaneous_joins_never_oversell(self):
+        # Every tourist joins twice, all at once
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            codes = list(pool.map(self._join, self.tourists + self.tourists))
+
+        self.assertNotIn(status.HTTP_500_INTERNAL_SERVER_ERROR, codes)
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), self.SEATS)
+        self.assertEqual(TourParticipant.objects.filter(tour=self.tour).count(), self.SEATS)
+        tour = Tour.objects.get(pk=self.tour.pk)
+        self.assertEqual((tour.pending_count, tour.seats_remaining), (self.SEATS, 0))
+        self.assertEqual(
+            codes.count(status.HTTP_409_CONFLICT) + codes.count(status.HTTP_200_OK), 2 * self.JOINS - self.SEATS
+        )
@@ -0,0 +1,102 @@
+# tours/tests_trending.py
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from tours.models import Tour, TourParticipant, TourRating
+from tours.trending import APPROVAL_WEIGHT, JOIN_WEIGHT, event_score, recompute_trending_scores
+
+
+class TrendingScoreTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(email="organizer@example.com", role="organizer")
+        self.quiet = self._create_tour("Quiet")
+        self.busy = self._create_tour("Busy")
+        self.tourists = [
+            User.objects.create_user(email=f"tourist{i}@example.com", role="tourist") for i in range(3)
+        ]
+
+    def _create_tour(self, title):
+        return Tour.objects.create(
+            organizer=self.organizer,
+            title=title,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 2, 1),
+            start_location="Dhaka",
+            end_location="Sylhet",
+            cost_per_person="100.00",
+        )
+
+    def _score(self, tour):
+        tour.refresh_from_db(fields=["trending_score"])
+        return tour.trending_score
+
+    def _titles(self, **params):
+        response = self.client.get(reverse("tour-list"), {"ordering": "trending", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tour["title"] for tour in response.data["results"]]
+
+    def test_join_approval_and_rating_raise_the_score(self):
+        participant = TourParticipant.objects.create(tour=self.busy, user=self.tourists[0])
+        joined = self._score(self.busy)
+        self.assertAlmostEqual(joined, event_score(JOIN_WEIGHT), delta=0.01)
+
+        participant.status = "approved"
+        participant.save()
+        approved = self._score(self.busy)
+        self.assertAlmostEqual(approved, event_score(JOIN_WEIGHT + APPROVAL_WEIGHT), delta=0.01)
+
+        TourRating.objects.create(tour=self.busy, user=self.tourists[0], rating=5)
+        self.assertGreater(self._score(self.busy), approved)
+        self.assertEqual(self._score(self.quiet), 0)
+
+    def test_stale_save_keeps_the_score(self):
+        stale = Tour.objects.get(pk=self.busy.pk)
+        TourParticipant.objects.create(tour=self.busy, user=self.tourists[0])
+        stale.title = "Busy tour"
+        stale.save()
+        self.assertGreater(self._score(self.busy), 0)
+
+    def test_recent_events_outweigh_older_ones(self):
+        old = TourParticipant.objects.create(tour=self.quiet, user=self.tourists[0])
+        TourParticipant.objects.filter(pk=old.pk).update(requested_at=timezone.now() - timedelta(days=30))
+        TourParticipant.objects.create(tour=self.busy, user=self.tourists[1])
+        recompute_trending_scores()
+        # One join 30 days (10 half-lives) ago is worth ~1/1000 of one today
+        self.assertAlmostEqual(self._score(self.busy) - self._score(self.quiet), 10 * 0.6931, delta=0.01)
+
+    def test_recompute_matches_incremental_updates(self):
+        for tourist in self.tourists:
+            TourParticipant.objects.create(tour=self.busy, user=tourist, status="approved")
+        TourRating.objects.create(tour=self.busy, user=self.tourists[0], rating=4)
+        incremental = self._score(self.busy)
+        out = StringIO()
+        call_command("recompute_trending_scores", stdout=out)
+        self.assertIn("Recomputed trending scores for 2 tours", out.getvalue())
+        self.assertAlmostEqual(self._score(self.busy), incremental, delta=0.01)
+        self.assertEqual(self._score(self.quiet), 0)
+
+    def test_ordering_trending_ranks_active_tours_first(self):
+        third = self._create_tour("Third")
+        for tourist in self.tourists:
+            TourParticipant.objects.create(tour=self.busy, user=tourist)
+        TourParticipant.objects.create(tour=third, user=self.tourists[0])
+
+        self.assertEqual(self._titles(), ["Busy", "Third", "Quiet"])
+
+        seen, params = [], {"ordering": "trending", "pagination": "cursor", "page_size": 1}
+        url = reverse("tour-list")
+        while url:
+            response = self.client.get(url, params)
+            seen += [tour["title"] for tour in response.data["results"]]
+            url, params = response.data["next"], None
+        self.assertEqual(seen, ["Busy", "Third", "Quiet"])
@@ -0,0 +1,98 @@
+# tours/trending.py
+"""
+Time-decayed popularity ("trending") score on Tour.
+
+Every join, approval and rating adds ``weight * exp(-age / TAU)`` to a
+tour's popularity. Rather than decaying every row as time passes, the
+score is kept against a fixed epoch and in log space:
+
+    trending_score = log(sum(weight_i * exp((t_i - EPOCH) / TAU)))
+
+Relative order is then time-invariant (an older event is worth exactly
+what its age says it should, compared to a newer one), so an index on
+``trending_score`` serves ``?ordering=trending`` directly. Log space keeps
+the value linear in time (no overflow) and makes an event a single
+``log-add-exp`` F() update, folded into the counter UPDATE the signals
+already run (tours.signals). Deletions and rejections are not subtracted;
+``recompute_trending_scores`` (scheduled daily) rebuilds every score from
+the source rows, which also applies changed weights.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Exp, Greatest, Least, Ln
+from django.utils import timezone
+
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+HALF_LIFE = timedelta(days=3)
+TAU_SECONDS = HALF_LIFE.total_seconds() / math.log(2)
+JOIN_WEIGHT = 1.0
+APPROVAL_WEIGHT = 2.0
+RATING_WEIGHT = 1.0  # scaled by stars / 5
+# Participant states that earned the approval weight
+APPROVAL_STATUSES = ("approved", "completed")
+# exp() of anything below this is negligible (and Postgres raises on underflow)
+MIN_EXPONENT = -50
+
+
+def event_score(weight, at=None):
+    """log(weight * exp((at - EPOCH) / TAU))"""
+    at = at or timezone.now()
+    return math.log(weight) + (at - TRENDING_EPOCH).total_seconds() / TAU_SECONDS
+
+
+def trending_updates(weight, at=None):
+    """``QuerySet.update()`` kwargs adding one event of ``weight`` to trending_score."""
+    event = Value(event_score(weight, at))
+    high = Greatest(F("trending_score"), event)
+    low = Least(F("trending_score"), event)
+    return {"trending_score": high + Ln(Value(1.0) + Exp(Greatest(low - high, Value(float(MIN_EXPONENT)))))}
+
+
+RECOMPUTE_SQL = """
+WITH events AS (
+    SELECT tour_id, %(join)s AS weight, requested_at AS at FROM {participant}
+    UNION ALL
+    SELECT tour_id, %(approval)s, COALESCE(approved_at, updated_at) FROM {participant}
+        WHERE status = ANY(%(approval_statuses)s)
+    UNION ALL
+    SELECT tour_id, %(rating)s * rating / 5.0, created_at FROM {rating} WHERE rating > 0
+),
+exponents AS (
+    SELECT tour_id, LN(weight) + EXTRACT(EPOCH FROM at - %(epoch)s) / %(tau)s AS x FROM events
+),
+peaks AS (
+    SELECT tour_id, MAX(x) AS peak FROM exponents GROUP BY tour_id
+),
+scores AS (
+    SELECT e.tour_id, p.peak + LN(SUM(EXP(GREATEST(e.x - p.peak, %(min_exponent)s)))) AS score
+    FROM exponents e JOIN peaks p ON p.tour_id = e.tour_id
+    GROUP BY e.tour_id, p.peak
+)
+UPDATE {tour} SET trending_score = COALESCE((SELECT score FROM scores WHERE scores.tour_id = {tour}.id), 0)
+"""
+
+
+def recompute_trending_scores():
+    """Rebuild every tour's trending_score from its participants and ratings."""
+    from .models import Tour, TourParticipant, TourRating
+
+    sql = RECOMPUTE_SQL.format(
+        tour=Tour._meta.db_table,
+        participant=TourParticipant._meta.db_table,
+        rating=TourRating._meta.db_table,
+    )
+    params = {
+        "join": JOIN_WEIGHT,
+        "approval": APPROVAL_WEIGHT,
+        "approval_statuses": list(APPROVAL_STATUSES),
+        "rating": RATING_WEIGHT,
+        "epoch": TRENDING_EPOCH,
+        "tau": TAU_SECONDS,
+        "min_exponent": MIN_EXPONENT,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
@@ -207,31 +207,56 @@
 #         return Response({"detail": "Participant rejected."}, status=status.HTTP_200_OK)
 
 # tours/views.py
-from django.db.models import Prefetch
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from rest_framework import viewsets, mixins, permissions, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.decorators import action, api_view, permission_classes, authentication_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
-from django.db import IntegrityError, transaction
+from contextlib import nullcontext
+from django.db import IntegrityError, router, transaction
 from django.utils import timezone
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
 from rest_framework import serializers
 from .models import Guide, Tour, Offer, TourParticipant, TourGuideAssignment, Booking
 from accounts.models import User
+from accounts.presence import active_count, online_count
+from analytics.rollups import rollup_totals
 from .permissions import IsAdminOrOrganizerOwnerOrReadOnly, IsOrganizerOrAdmin, IsGuideSelf
+from .cards import CARD_FIELDS, PreRenderedJSONResponse, get_cards, stitch_json
+from .buckets import BUCKET_ORDERING, BUCKETS, PERSONAL_BUCKETS, bucket_queryset
+from .caching import (
+    AVAILABLE_TOURS_CACHED, MY_TOURS_CACHE_TTL, TOUR_LIST_CACHE_TTL, available_tours_cache_key,
+    get_my_tours_snapshot, get_tour_versions, my_tours_snapshot_key, queryset_validators,
+    set_my_tours_snapshot, set_validators, tour_facets_cache_key, tour_list_cache_key,
+)
+from .facets import tour_facets
+from .imports import detect_format, import_tours
+from .querysets import with_tour_prefetches
+from .recommendations import recommended_tour_ids, similar_tour_ids
+from .availability import GuideDoubleBooked, available_guides, is_double_booking, parse_period, tour_period
+from .geo import near, parse_near, parse_radius
+from .seats import join_tour, set_participant_status
+from .search import (
+    FUZZY_FIELDS, FUZZY_ORDERING, SEARCH_ORDERING, fuzzy_match, parse_similarity_threshold, search_tours,
+    word_similarity_threshold,
+)
 from .serializers import GuideSerializer, TourSerializer, OfferSerializer, ParticipantSerializer, \
-    TourGuideAssignmentSerializer, MyTourSerializer, BookingSerializer
+    TourGuideAssignmentSerializer, MyTourSerializer, BookingSerializer, TourListSerializer
 from django.utils.timezone import now
 from django.core.cache import cache
-from django.contrib.sessions.models import Session
+from tour_management.db_router import ReplicaReadMixin, read_from_primary
+from tour_management.exports import ExportContentNegotiation, export_format, stream_export
+from tour_management.pagination import KeysetOrPageNumberPagination, KeysetPagination
+from tour_management.serializers import SHAPE_PARAMS, is_shaped
 
 
 # -------------------------
@@ -251,18 +276,21 @@ class GuideViewSet(viewsets.ModelViewSet):
             except Tour.DoesNotExist:
                 return qs.none()
 
-            # Users who are already assigned to conflicting tours
-            conflicting_user_ids = TourGuideAssignment.objects.filter(
-                status="accepted",
-                tour__start_date__lt=tour.end_date,
-                tour__end_date__gt=tour.start_date,
-            ).values_list("guide_id", flat=True)
-
-            # Exclude Guides whose user is in conflicting_user_ids
-            qs = qs.exclude(user__id__in=conflicting_user_ids)
+            # Exclude guides already booked on tours overlapping this one
+            qs = available_guides(qs, tour_period(tour.start_date, tour.end_date))
 
         return qs
 
+    @action(detail=False, methods=['get'], url_path='available')
+    def available(self, request):
+        """Guides free between ?start= and ?end= (tours/availability.py)."""
+        period = parse_period(request.query_params.get("start"), request.query_params.get("end"))
+        queryset = available_guides(Guide.objects.select_related("user").order_by("id"), period)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
 
 # -------------------------
 # Tour viewset
@@ -360,24 +388,59 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 50
 
 
-class SmallPagination(PageNumberPagination):
+class MyToursPagination(KeysetPagination):
+    # One instance per bucket; TouristToursView sets ``ordering``
     page_size = 5
-    page_size_query_param = "page_size"
     max_page_size = 10
 
 
-class TourViewSet(viewsets.ModelViewSet):
+class TourCursorPagination(KeysetPagination):
+    # Keyset on (-start_date, id): constant cost at any depth, no COUNT(*)
+    ordering = ("-start_date", "id")
+    page_size = 12
+    max_page_size = 50
+
+    def get_ordering(self, request, queryset, view):
+        # ?near= / ?ordering=trending pick their own keyset (TourViewSet.get_queryset)
+        return getattr(view, "keyset_ordering", None) or self.ordering
+
+
+class TourPagination(KeysetOrPageNumberPagination):
+    # ?pagination=cursor (or ?cursor=...) opts into keyset pagination
+    page_pagination_class = StandardResultsSetPagination
+    cursor_pagination_class = TourCursorPagination
+
+
+TOUR_EXPORT_COLUMNS = [
+    ('id', 'id'), ('title', 'title'), ('category', 'category'), ('organizer', 'organizer__email'),
+    ('start_date', 'start_date'), ('end_date', 'end_date'),
+    ('start_location', 'start_location'), ('end_location', 'end_location'),
+    ('max_participants', 'max_participants'), ('cost_per_person', 'cost_per_person'),
+    ('approved_count', 'approved_count'), ('pending_count', 'pending_count'),
+    ('seats_remaining', 'seats_remaining'),
+]
+PARTICIPANT_EXPORT_COLUMNS = [
+    ('id', 'id'), ('user_id', 'user_id'), ('email', 'user__email'), ('status', 'status'),
+    ('joined_at', 'joined_at'), ('approved_at', 'approved_at'), ('is_active', 'is_active'),
+]
+
+
+class TourViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     TourViewSet provides CRUD operations for Tour model with role-based access control:
     - Admins: full CRUD access to all tours
     - Organizers: full CRUD on tours they own
     - Tourists and unauthenticated users: read-only access to all tours
+    Catalog reads (list, detail, facets) are served from a read replica.
     """
 
     authentication_classes = [JWTAuthentication]
     serializer_class = TourSerializer
     permission_classes = [IsAdminOrOrganizerOwnerOrReadOnly]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = TourPagination
+    replica_actions = ("list", "retrieve", "facets", "similar", "recommended")
+    keyset_ordering = None  # set by get_queryset when ?near= / ?ordering= override the date order
+    similarity_threshold = None  # set by get_queryset for ?fuzzy=true, see fuzzy_context
 
     # def get_queryset(self):
     #     """
@@ -433,23 +496,31 @@ class TourViewSet(viewsets.ModelViewSet):
         Shared base queryset with safe, targeted prefetches.
         NOTE: Avoid .only()/ .defer() unless you’ve verified serializer fields,
         because restricting columns can break serialization.
+
+        The list action uses TourListSerializer, which only needs participant
+        counts (denormalized on Tour), so the roster is not prefetched there.
         """
-        return (
-            Tour.objects
-            .select_related("organizer")
-            .prefetch_related(
-                # Guides: prefetch the related Guide objects (lightweight)
-                "guides",
-                # Participants with their user in one go
-                Prefetch(
-                    "tour_participants",
-                    queryset=TourParticipant.objects.select_related("user")
-                ),
-                # Offers related to tour
-                "offers",
-            )
-            .order_by("-start_date")
-        )
+        # Offers, accepted guides and (outside list) participants with their user;
+        # see tours/querysets.py for the bundle TourSerializer consumes
+        listing = self.action == "list"
+        qs = Tour.objects.all()
+        fields = None
+        if self.action in ("list", "retrieve"):
+            # Only fetch what ?fields= / ?omit= / ?expand= leave in the response
+            serializer = self.get_serializer()
+            fields = set(serializer.fields)
+            if is_shaped(self.request):
+                # start_date is the catalog ordering and keyset cursor column
+                qs = qs.only(*serializer.get_only_fields(), "start_date")
+        qs = with_tour_prefetches(
+            qs, participants=not listing or "participants" in fields, fields=fields
+        ).order_by("-start_date")
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TourListSerializer
+        return TourSerializer
 
     def get_queryset(self):
         user = self.request.user
@@ -469,28 +540,65 @@ class TourViewSet(viewsets.ModelViewSet):
         # ---- Server-side query filters ----
         category = self.request.query_params.get('category')
         location = self.request.query_params.get('start_location')
+        end_location = self.request.query_params.get('end_location')
         start_date = self.request.query_params.get('start_date')
         end_date = self.request.query_params.get('end_date')
         search = self.request.query_params.get('search')
+        fuzzy = self.request.query_params.get('fuzzy', '').lower() in ('1', 'true', 'yes')
 
         if category:
             qs = qs.filter(category__iexact=category)
-        if location:
-            qs = qs.filter(start_location__iexact=location)
         if start_date:
             qs = qs.filter(start_date__gte=start_date)
         if end_date:
             qs = qs.filter(end_date__lte=end_date)
-        if search:
-            qs = qs.filter(
-                Q(title__icontains=search) |
-                Q(category__icontains=search) |
-                Q(start_location__icontains=search) |
-                Q(end_location__icontains=search)
-            )
+
+        if fuzzy:
+            # Typo-tolerant trigram matching, ordered by similarity
+            self.similarity_threshold = parse_similarity_threshold(self.request.query_params.get('similarity'))
+            qs = fuzzy_match(qs, [
+                (location, ['start_location']),
+                (end_location, ['end_location']),
+                (search, list(FUZZY_FIELDS)),
+            ])
+        else:
+            if location:
+                qs = qs.filter(start_location__iexact=location)
+            if end_location:
+                qs = qs.filter(end_location__iexact=end_location)
+            if search:
+                # Ranked full-text search over the GIN-indexed search_vector
+                qs = search_tours(qs, search)
+
+        # Cursor pages keep the relevance order (unless ?near/?ordering override it)
+        if "search_rank" in qs.query.annotations:
+            self.keyset_ordering = SEARCH_ORDERING
+        elif "similarity" in qs.query.annotations:
+            self.keyset_ordering = FUZZY_ORDERING
+
+        near_point = self.request.query_params.get('near')
+        if near_point:
+            # Tours starting within radius_km (default 50), nearest first
+            lat, lng = parse_near(near_point)
+            qs = near(qs, lat, lng, parse_radius(self.request.query_params.get('radius_km')))
+            self.keyset_ordering = ("distance_km", "id")
+
+        if self.request.query_params.get('ordering') == 'trending':
+            # Index scan on tour_trending (see tours/trending.py)
+            self.keyset_ordering = ("-trending_score", "id")
+            qs = qs.order_by(*self.keyset_ordering)
 
         return qs
 
+    def fuzzy_context(self):
+        """
+        What the filtered queryset is evaluated in: with ?fuzzy=true, the
+        request's similarity threshold for the ``%>`` filters (tours/search.py).
+        """
+        if self.similarity_threshold is None:
+            return nullcontext()
+        return word_similarity_threshold(self.similarity_threshold, using=router.db_for_read(Tour))
+
     def perform_create(self, serializer):
         """
         Allow only admins or organizers to create tours.
@@ -500,17 +608,176 @@ class TourViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only organizers or admins can create tours.")
         serializer.save(organizer=self.request.user)
 
-    # ---------- Cached LIST for readonly audiences ----------
-    # Vary on Authorization so authenticated and anonymous caches don't collide.
-    @method_decorator(vary_on_headers("Authorization"))
-    @method_decorator(cache_page(60 * 5))  # 5 minutes
+    def perform_update(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError as exc:
+            if not is_double_booking(exc):
+                raise
+            # New dates overlap another tour of an accepted guide (tours/availability.py)
+            raise serializers.ValidationError(
+                {"detail": "A guide assigned to this tour has another tour on the new dates."}
+            )
+
+    # ---------- Cached LIST ----------
     def list(self, request, *args, **kwargs):
         """
-        Cached list endpoint. Because we paginate and vary on Authorization,
-        admin/organizer/guide see their own fresh caches, while
-        anonymous/tourist traffic benefits most from caching.
+        Cached list endpoint. Entries are keyed on audience (the shared public
+        catalog vs. an organizer's own tours) and normalized query params, not
+        on the token, so anonymous/tourist traffic shares one cache. Writes bump
+        the audience versions (tours.signals), so edits show up immediately.
+
+        Responses carry ETag / Last-Modified; a matching If-None-Match or
+        If-Modified-Since gets a 304 before anything is serialized (and, on a
+        cache hit, without touching the database). Default-shape JSON pages
+        are stitched from pre-rendered tour cards (tours/cards.py).
+        """
+        cache_key = tour_list_cache_key(request)
+        entry = cache.get(cache_key)
+        if entry is None:
+            # Filled from the primary: the key's version may be newer than a replica
+            with read_from_primary():
+                queryset = self.filter_queryset(self.get_queryset())
+                with self.fuzzy_context():
+                    etag, last_modified = queryset_validators(queryset, request)
+                    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                    if response is None:
+                        entry = {"etag": etag, "last_modified": last_modified}
+                        if self._uses_cards(request):
+                            response = self._card_list_response()
+                            entry["body"] = response.body
+                        else:
+                            response = super().list(request, *args, **kwargs)
+                            entry["data"] = response.data
+                        cache.set(cache_key, entry, TOUR_LIST_CACHE_TTL)
+        else:
+            etag, last_modified = entry["etag"], entry["last_modified"]
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                if "body" in entry:
+                    response = PreRenderedJSONResponse(entry["body"])
+                else:
+                    response = Response(entry["data"])
+        # Organizers get a different payload than everyone else
+        patch_vary_headers(response, ["Authorization"])
+        return set_validators(response, etag, last_modified)
+
+    @action(detail=False, methods=['get'], url_path='facets')
+    def facets(self, request):
+        """
+        Sidebar facet counts (category, start_location, month, price band) for
+        the current filter set, from a single GROUPING SETS query
+        (tours/facets.py). Cached per audience and filter signature; tour
+        writes bump the audience versions like the list cache.
+        """
+        cache_key = tour_facets_cache_key(request)
+        data = cache.get(cache_key)
+        if data is None:
+            with read_from_primary():
+                queryset = self.filter_queryset(self.get_queryset())
+                with self.fuzzy_context():
+                    data = tour_facets(queryset)
+            cache.set(cache_key, data, TOUR_LIST_CACHE_TTL)
+        response = Response(data)
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Create many tours from an uploaded CSV or NDJSON ``file`` (columns as in
+        TourImportSerializer), streamed and committed in chunks (tours/imports.py).
+        The format follows the file extension unless ``import_format`` is given.
+        Returns the created/failed counts and a per-row error report.
+        """
+        if request.user.role not in ['organizer', 'admin']:
+            raise PermissionDenied("Only organizers or admins can create tours.")
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise serializers.ValidationError({"file": "Upload a CSV or NDJSON file."})
+        fmt = detect_format(upload.name, request.data.get('import_format'))
+        if fmt is None:
+            raise serializers.ValidationError({"import_format": "Expected 'csv' or 'ndjson'."})
+
+        report = import_tours(upload, fmt, request.user)
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'], url_path='export', content_negotiation_class=ExportContentNegotiation)
+    def export(self, request):
+        """
+        Stream the catalog (same role scoping and filters as the list) as
+        CSV or NDJSON; see tour_management/exports.py.
+        """
+        return stream_export(
+            self.filter_queryset(self.get_queryset()), TOUR_EXPORT_COLUMNS, "tours", export_format(request),
+            context=self.fuzzy_context,
+        )
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Precomputed "similar tours" (tours/recommendations.py), best first."""
+        get_object_or_404(Tour, pk=pk)
+        return self._tours_response(similar_tour_ids(pk))
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def recommended(self, request):
+        """Personalized picks from the precomputed neighbours of the user's tours."""
+        return self._tours_response(recommended_tour_ids(request.user))
+
+    def _tours_response(self, tour_ids):
+        """Catalog representation of ``tour_ids`` in that order, from the tour cards when possible."""
+        tours = Tour.objects.filter(pk__in=tour_ids)
+        if self._uses_cards(self.request):
+            by_id = {tour.pk: tour for tour in tours.only(*CARD_FIELDS)}
+            cards = get_cards([by_id[pk] for pk in tour_ids if pk in by_id])
+            return PreRenderedJSONResponse(stitch_json(None, cards))
+        by_id = {tour.pk: tour for tour in with_tour_prefetches(tours, participants=False)}
+        serializer = TourListSerializer(
+            [by_id[pk] for pk in tour_ids if pk in by_id], many=True, context=self.get_serializer_context(),
+        )
+        return Response(serializer.data)
+
+    def _uses_cards(self, request):
+        # Cards hold the default list shape rendered as plain JSON
+        return (
+            request.accepted_renderer.format == "json"
+            and not any(request.query_params.get(param) for param in SHAPE_PARAMS)
+        )
+
+    def _card_list_response(self):
+        """
+        Paginate over ids only, then stitch the page's pre-rendered tour cards
+        (tours/cards.py) into the body without running the serializer.
         """
-        return super().list(request, *args, **kwargs)
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None).select_related(None)
+            .only(*CARD_FIELDS)
+        )
+        page = self.paginate_queryset(queryset)
+        cards = get_cards(page if page is not None else list(queryset))
+        envelope = None
+        if page is not None:
+            envelope = dict(self.get_paginated_response([]).data)
+            envelope.pop("results")
+        return PreRenderedJSONResponse(stitch_json(envelope, cards))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Detail with ETag / Last-Modified; 304 before the tour is loaded and serialized."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        tour = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        etag, last_modified = queryset_validators(tour, request)
+        if last_modified is None:
+            # Missing or not visible to this user: let get_object() raise the 404
+            return super().retrieve(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        patch_vary_headers(response, ["Authorization"])
+        return set_validators(response, etag, last_modified)
 
     # @action(detail=True, methods=['get'], url_path='guides', permission_classes=[IsAuthenticated],
     #         authentication_classes=[JWTAuthentication])
@@ -573,6 +840,19 @@ class TourViewSet(viewsets.ModelViewSet):
         serializer = ParticipantSerializer(participants, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='participants/export', permission_classes=[IsAuthenticated],
+            content_negotiation_class=ExportContentNegotiation)
+    def export_participants(self, request, pk=None):
+        """Stream the tour's roster as CSV/NDJSON (tour organizer or admin only)."""
+        tour = get_object_or_404(Tour, pk=pk)
+        if not (request.user.role == 'admin' or (request.user.role == 'organizer' and tour.organizer == request.user)):
+            return Response({'detail': 'Not authorized to view participants for this tour.'},
+                            status=status.HTTP_403_FORBIDDEN)
+        return stream_export(
+            TourParticipant.objects.filter(tour=tour).order_by('id'), PARTICIPANT_EXPORT_COLUMNS,
+            f"tour-{tour.pk}-participants", export_format(request),
+        )
+
     @action(detail=True, methods=['get', 'post'])
     def offers(self, request, pk=None):
         """
@@ -625,6 +905,15 @@ class TourGuideAssignmentViewSet(viewsets.GenericViewSet,
 
         return TourGuideAssignment.objects.none()
 
+    def perform_update(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError as exc:
+            if not is_double_booking(exc):
+                raise
+            raise GuideDoubleBooked()
+
     def get_permissions(self):
         # Map actions to permissions
         if self.action == 'assign_guide':
@@ -716,7 +1005,17 @@ class TourGuideAssignmentViewSet(viewsets.GenericViewSet,
         # Update responded_at timestamp
         assignment.status = new_status
         assignment.responded_at = timezone.now()
-        assignment.save()
+        try:
+            with transaction.atomic():
+                assignment.save()
+        except IntegrityError as exc:
+            if not is_double_booking(exc):
+                raise
+            # Already on a tour with overlapping dates (tours/availability.py)
+            return Response(
+                {'detail': 'You are already assigned to a tour with overlapping dates.'},
+                status=status.HTTP_409_CONFLICT
+            )
 
         # If accepted → add guide to Tour.guides (Guide model, not User)
         if new_status == 'accepted':
@@ -838,19 +1137,23 @@ class TourParticipantViewSet(viewsets.ModelViewSet):
     #         raise PermissionDenied("Only tourists can join tours.")
     #     # Initial status set to pending
     #     serializer.save(user=user, status='pending')
-    def perform_create(self, serializer):
-        user = self.request.user
+    def create(self, request, *args, **kwargs):
+        """
+        Join a tour (pending). Takes a seat atomically (tours/seats.py): 409 when
+        the tour is sold out, 200 with the existing participation on a repeat.
+        """
+        user = request.user
         if not user.is_authenticated or user.role != 'tourist':
             raise PermissionDenied("Only tourists can join tours.")
 
-        tour_id = self.request.data.get("tour")  # Make sure the tour ID comes in the request
+        tour_id = request.data.get("tour")  # Make sure the tour ID comes in the request
+        if not str(tour_id or "").isdigit():
+            raise serializers.ValidationError({"tour": "A valid tour id is required."})
         tour = get_object_or_404(Tour, pk=tour_id)
 
-        # Check if the user already joined
-        if TourParticipant.objects.filter(user=user, tour=tour).exists():
-            raise PermissionDenied("You have already joined this tour.")
-
-        serializer.save(user=user, tour=tour, status='pending')
+        participant, created = join_tour(tour, user)
+        serializer = self.get_serializer(participant)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
     @action(detail=True, methods=['patch'], url_path='approve')
     def approve_participant(self, request, pk=None):
@@ -859,8 +1162,7 @@ class TourParticipantViewSet(viewsets.ModelViewSet):
         if request.user.role not in ['admin', 'organizer'] or (
                 request.user.role == 'organizer' and participant.tour.organizer != request.user):
             return Response({"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
-        participant.status = 'approved'
-        participant.save()
+        set_participant_status(participant, 'approved')
         return Response({"detail": "Participant approved."}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['patch'], url_path='reject')
@@ -869,8 +1171,7 @@ class TourParticipantViewSet(viewsets.ModelViewSet):
         if request.user.role not in ['admin', 'organizer'] or (
                 request.user.role == 'organizer' and participant.tour.organizer != request.user):
             return Response({"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
-        participant.status = 'rejected'
-        participant.save()
+        set_participant_status(participant, 'rejected')
         return Response({"detail": "Participant rejected."}, status=status.HTTP_200_OK)
 
 
@@ -963,166 +1264,153 @@ class TourParticipantViewSet(viewsets.ModelViewSet):
 #             return Response({"detail": "Payment already completed or failed."}, status=400)
 
 
-class TouristToursView(APIView):
-    permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
-    pagination_class = SmallPagination
+class TouristToursView(ReplicaReadMixin, APIView):
+    """
+    The tourist dashboard: available, pending, active and past tours.
 
-    def get_queryset_for_status(self, tour_ids, now_date):
-        """
-        Helper to return Tour queryset with safe prefetches
-        """
-        return (
-            Tour.objects.filter(id__in=tour_ids)
-            .select_related("organizer")
-            .prefetch_related(
-                "offers",
-                "tour_participants__user",
-                "guide_assignments__guide__guide",
-            )
-        )
+    Without ``?bucket=`` the first page of each bucket comes back under
+    ``<bucket>_tours`` with its ``next`` link in ``next``; with
+    ``?bucket=<name>`` (and that link's ``cursor``) a single bucket is
+    paged as ``{"next", "previous", "results"}``. Pages are cut in one
+    query (tours/buckets.py) and their tours loaded once.
 
-    def paginate_queryset(self, queryset, request):
-        paginator = self.pagination_class()
-        return paginator.paginate_queryset(queryset, request), paginator
+    The dashboard itself is served from cache (tours/caching.py): a
+    per-user snapshot of the personal buckets plus the shared window of
+    upcoming tours the "available" bucket is filtered from.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+    pagination_class = MyToursPagination
 
     def get(self, request):
+        bucket = request.query_params.get("bucket")
+        if bucket is not None and bucket not in BUCKETS:
+            raise serializers.ValidationError({"bucket": f"Expected one of: {', '.join(BUCKETS)}."})
+        if bucket is None and self.pagination_class.cursor_query_param in request.query_params:
+            raise serializers.ValidationError({"bucket": "Required when paging with a cursor."})
+
+        today = timezone.localdate()
+        if bucket:
+            paginators, ids_by_bucket = self._pages(request, [bucket], today)
+            tours = self._serialize(ids_by_bucket, request.user)
+            return paginators[bucket].get_paginated_response(tours[bucket])
+
+        snapshot = self._personal_snapshot(request, today)
+        available, available_next = self._available_page(request, today, set(snapshot["joined"]))
+        data = {"available_tours": available, **snapshot["tours"]}
+        data["next"] = {"available_tours": available_next, **snapshot["next"]}
+        return Response(data, status=200)
+
+    def _paginator(self, request, name, today):
+        paginator = self.pagination_class()
+        paginator.ordering = BUCKET_ORDERING[name]
+        page = paginator.page_queryset(bucket_queryset(name, request.user, today), request, view=self)
+        # Links page this bucket alone
+        paginator.base_url = replace_query_param(paginator.base_url, "bucket", name)
+        return paginator, page
+
+    def _pages(self, request, names, today):
+        """Keyset pages of the ``names`` buckets in one query: ``(paginators, {bucket: tour ids})``."""
+        paginators, pages = {}, []
+        for name in names:
+            paginators[name], page = self._paginator(request, name, today)
+            pages.append(page)
+
+        rows_by_bucket = {name: [] for name in names}
+        for row in pages[0].union(*pages[1:], all=True):
+            rows_by_bucket[row["bucket"]].append(row)
+        ids_by_bucket = {
+            name: [row["tour_ref"] for row in paginators[name].set_page(rows)]
+            for name, rows in rows_by_bucket.items()
+        }
+        return paginators, ids_by_bucket
+
+    def _serialize(self, ids_by_bucket, user):
+        """``{bucket: serialized tours}``, loading the tours of every bucket at once."""
+        tour_ids = [pk for ids in ids_by_bucket.values() for pk in ids]
+        tours = with_tour_prefetches(Tour.objects.filter(pk__in=tour_ids), user=user)
+        by_id = {tour.pk: tour for tour in tours} if tour_ids else {}
+        return {
+            name: list(TourSerializer([by_id[pk] for pk in ids if pk in by_id], many=True, context={"user": user}).data)
+            for name, ids in ids_by_bucket.items()
+        }
+
+    def _personal_snapshot(self, request, today):
         user = request.user
-        if not user or not user.is_authenticated:
-            return Response(
-                {"detail": "Authentication credentials were not provided."},
-                status=401,
-            )
-
-        now_date = now()
-
-        try:
-            # Fetch all participations for user
-            user_participations = (
-                TourParticipant.objects.filter(user=user)
-                .select_related("tour")
-                .only("id", "status", "tour_id", "tour__organizer_id")
-            )
-
-            participations_by_status = {}
-            joined_tour_ids = []
-            for part in user_participations:
-                participations_by_status.setdefault(part.status, []).append(part.tour_id)
-                joined_tour_ids.append(part.tour_id)
-
-            # ---------------------
-            # Available tours (not joined, future)
-            # ---------------------
-            available_qs = (
-                Tour.objects.exclude(id__in=joined_tour_ids)
-                .filter(start_date__gte=now_date)
-                .select_related("organizer")
-                .prefetch_related(
-                    "offers",
-                    "tour_participants__user",
-                    "guide_assignments__guide__guide",
-                )
-            )
-            available, paginator_avail = self.paginate_queryset(available_qs, request)
-
-            # ---------------------
-            # Pending tours
-            # ---------------------
-            pending_ids = participations_by_status.get("pending", [])
-            pending_qs = self.get_queryset_for_status(pending_ids, now_date)
-            pending, paginator_pending = self.paginate_queryset(pending_qs, request)
-
-            # ---------------------
-            # Active tours
-            # ---------------------
-            active_ids = participations_by_status.get("approved", [])
-            active_qs = (
-                self.get_queryset_for_status(active_ids, now_date)
-                .filter(end_date__gte=now_date)
-            )
-            active, paginator_active = self.paginate_queryset(active_qs, request)
-
-            # ---------------------
-            # Past tours
-            # ---------------------
-            past_ids = active_ids + participations_by_status.get("completed", [])
-            past_qs = (
-                self.get_queryset_for_status(past_ids, now_date)
-                .filter(end_date__lt=now_date)
-            )
-            past, paginator_past = self.paginate_queryset(past_qs, request)
-
-            context = {"user": user}
-            data = {
-                "available_tours": TourSerializer(available, many=True, context=context).data,
-                "pending_tours": TourSerializer(pending, many=True, context=context).data,
-                "active_tours": TourSerializer(active, many=True, context=context).data,
-                "past_tours": TourSerializer(past, many=True, context=context).data,
+        key = my_tours_snapshot_key(user.pk, request.query_params, today)
+        snapshot = get_my_tours_snapshot(key)
+        if snapshot is None:
+            # Filled from the primary so it never caches a replica's older state
+            # under the current versions (tour_management/db_router.py)
+            with read_from_primary():
+                joined = list(TourParticipant.objects.filter(user=user).values_list("tour_id", flat=True))
+                tour_versions = get_tour_versions(joined)
+                paginators, ids_by_bucket = self._pages(request, PERSONAL_BUCKETS, today)
+                tours = self._serialize(ids_by_bucket, user)
+            snapshot = {
+                "tours": {f"{name}_tours": tours[name] for name in PERSONAL_BUCKETS},
+                "next": {f"{name}_tours": paginators[name].get_next_link() for name in PERSONAL_BUCKETS},
+                "joined": joined,
             }
-
-            return Response(data, status=200)
-
-        except Exception as e:
-            import traceback
-            print("❌ TouristToursView crashed:", traceback.format_exc())
-            return Response(
-                {"error": "Unexpected error: " + str(e)},
-                status=500,
-            )
-
-
-class DashboardStatsView(APIView):
+            set_my_tours_snapshot(key, snapshot, tour_versions)
+        return snapshot
+
+    def _shared_available_rows(self, today):
+        # The next upcoming tours, serialized once for every user
+        key = available_tours_cache_key(today)
+        rows = cache.get(key)
+        if rows is None:
+            with read_from_primary():
+                tours = list(with_tour_prefetches(
+                    Tour.objects.filter(start_date__gte=today).order_by("start_date", "id")[:AVAILABLE_TOURS_CACHED]
+                ))
+                rows = [
+                    {"tour_ref": tour.pk, "sort_date": tour.start_date, "tour": data}
+                    for tour, data in zip(tours, TourSerializer(tours, many=True, context={"user": None}).data)
+                ]
+            cache.set(key, rows, MY_TOURS_CACHE_TTL)
+        return rows
+
+    def _available_page(self, request, today, joined):
+        shared = self._shared_available_rows(today)
+        paginator, _ = self._paginator(request, "available", today)
+        rows = [row for row in shared if row["tour_ref"] not in joined][:paginator.page_size + 1]
+        if len(rows) <= paginator.page_size and len(shared) == AVAILABLE_TOURS_CACHED:
+            # The user joined most of the shared window: page from the database
+            paginators, ids_by_bucket = self._pages(request, ["available"], today)
+            return self._serialize(ids_by_bucket, request.user)["available"], paginators["available"].get_next_link()
+        page = paginator.set_page(rows)
+        return [row["tour"] for row in page], paginator.get_next_link()
+
+
+class DashboardStatsView(ReplicaReadMixin, APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, IsOrganizerOrAdmin]
 
     def get(self, request):
         user = request.user
-        cache_key = f'dashboard_stats_{user.role}_{user.id}'
-        stats = cache.get(cache_key)
-
-        if not stats:
-            # Admin stats
-            if user.role == 'admin':
-                total_users = User.objects.count()
-                active_users = User.objects.filter(
-                    last_login__gte=timezone.now() - timezone.timedelta(days=30)
-                ).count()
-                sessions = Session.objects.filter(expire_date__gte=timezone.now())
-                session_user_ids = [
-                    s.get_decoded().get('_auth_user_id')
-                    for s in sessions
-                    if s.get_decoded().get('_auth_user_id')
-                ]
-                currently_logged_in = len(set(session_user_ids))
-                total_tours = Tour.objects.count()
-                approved_bookings = TourParticipant.objects.filter(status__iexact="approved").count()
-                pending_requests = TourParticipant.objects.filter(status__iexact="pending").count()
-                total_guides = Guide.objects.count()
-                user_tours = Tour.objects.all()
-            # Organizer stats
-            elif user.role == 'organizer':
-                total_users = active_users = currently_logged_in = total_guides = None
-                user_tours = Tour.objects.filter(organizer=user)
-                total_tours = user_tours.count()
-                approved_bookings = TourParticipant.objects.filter(
-                    tour__organizer=user, status__iexact="approved"
-                ).count()
-                pending_requests = TourParticipant.objects.filter(
-                    tour__organizer=user, status__iexact="pending"
-                ).count()
-            else:
-                return Response({"detail": "Forbidden"}, status=403)
-
+        # Pre-aggregated totals (analytics/rollups.py): one row per dashboard
+        if user.role == 'admin':
+            totals = rollup_totals()
             stats = {
-                "total_users": total_users,
-                "active_users": active_users,
-                "currently_logged_in": currently_logged_in,
-                "total_tours": total_tours,
-                "approved_bookings": approved_bookings,
-                "pending_requests": pending_requests,
-                "total_guides": total_guides,
+                "total_users": totals["users"],
+                # Heartbeat counts (accounts/presence.py): seen in 30 days / in the last minutes
+                "active_users": active_count(),
+                "currently_logged_in": online_count(),
+                "total_guides": Guide.objects.count(),
             }
-            cache.set(cache_key, stats, 60 * 5)  # cache per role+user for 5 min
+        elif user.role == 'organizer':
+            totals = rollup_totals(user.pk)
+            stats = {"total_users": None, "active_users": None, "currently_logged_in": None, "total_guides": None}
+        else:
+            return Response({"detail": "Forbidden"}, status=403)
+        stats.update({
+            "total_tours": totals["tours"],
+            "approved_bookings": totals["approved"],
+            "pending_requests": totals["pending"],
+            "total_bookings": totals["bookings"],
+            "revenue": totals["revenue"],
+        })
 
         # Recent activity
         recent_users = []